@@ -1,3 +1,15 @@
 from .advance_selenium_chrome import AdvanceSeleniumChrome
+from .pool import ChromePool
+from .retry import RetryPolicy, deadline
+from .instrumentation import Instrumentation, SamplingProfiler
+from .async_chrome import AsyncAdvanceSeleniumChrome, AsyncTab
+from .crawl import CrawlEngine, CrawlResult
+from .network import BlockingRules
+from .response_cache import CacheRule, ResponseCache
+from .watchdog import MemoryWatchdog
+from .profiles import LAUNCH_PRESETS, ProfileTemplate
+from .downloads import Download, DownloadManager
+from .session_state import SessionSnapshot
+from .launcher import DebugRegistry, allocate_free_ports, find_chrome_binary, launch_debugging_chrome
 
-__all__ = ["AdvanceSeleniumChrome"]
+__all__ = ["AdvanceSeleniumChrome", "AsyncAdvanceSeleniumChrome", "AsyncTab", "BlockingRules", "CacheRule", "ChromePool", "CrawlEngine", "CrawlResult", "DebugRegistry", "Download", "DownloadManager", "allocate_free_ports", "find_chrome_binary", "launch_debugging_chrome", "MemoryWatchdog", "LAUNCH_PRESETS", "ProfileTemplate", "ResponseCache", "SessionSnapshot", "RetryPolicy", "deadline", "Instrumentation", "SamplingProfiler"]
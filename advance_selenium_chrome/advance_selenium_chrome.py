@@ -1,5 +1,9 @@
-from time import sleep
-from subprocess import Popen
+from time import sleep, perf_counter
+_import_started = perf_counter()
+import os
+import re
+import shutil
+from uuid import uuid4
 from pathlib import Path
 from psutil import process_iter, Process
 from selenium import webdriver
@@ -9,13 +13,35 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.chrome import ChromeDriverManager
-from typing import Callable, Literal, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Union
 from selenium.webdriver.remote.webelement import WebElement
-from win32process import GetWindowThreadProcessId
-from pygetwindow import getAllWindows
-import requests
-from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+try:
+    # Window activation is only available on Windows
+    from win32process import GetWindowThreadProcessId
+    from pygetwindow import getAllWindows
+except (ImportError, NotImplementedError):
+    GetWindowThreadProcessId = getAllWindows = None
+from threading import Lock
+from .cdp import CDPConnection, CrashMonitor
+from .tab_index import TabIndex, compile_matcher
+from . import scripts
+from .retry import RetryPolicy, budget, deadline, remaining
+from .instrumentation import Instrumentation, SamplingProfiler, instrumented
+from .driver_resolver import resolve_chrome_driver_path, resolution_timings
+from .network import BlockingRules, NetworkBlocker, RequestInterceptor, resolve_rules
+from .response_cache import ResponseCache
+from .watchdog import MemoryWatchdog
+from .profiles import ProfileTemplate, default_launch_flags
+from .downloads import DownloadManager
+from .session_state import SessionSnapshot
+from .launcher import CHROME_PROCESS_NAMES, DebugRegistry, allocate_free_ports, default_user_data_dir, launch_debugging_chrome
+
+# Time spent importing this module and its dependencies, in seconds.
+IMPORT_TIME = perf_counter() - _import_started
+
+# Trailing "::text", "::html", "::attr(name)" or "::prop(name)" of an extraction field
+_FIELD_SUFFIX = re.compile(r"^(.*?)::(text|html|attr\(([^)]+)\)|prop\(([^)]+)\))$")
 
 
 class AdvanceSeleniumChrome(webdriver.Chrome):
@@ -25,15 +51,29 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
 
     Args:
         driver (Optional[webdriver.Chrome]): An existing Chrome WebDriver instance to use.
-        remote_debugging_port (Optional[int]): Port for remote debugging.
+        remote_debugging_port (Optional[int]): Port for remote debugging. Pass 0 to launch a new debugging Chrome on a free port.
         headless (bool): Whether to run Chrome in headless mode.
         download_directory (Optional[Path]): Directory to save downloaded files.
         proxy_url (Optional[str]): Proxy server URL.
         extension_path (Optional[Path]): Path to a Chrome extension to load.
         chrome_options (Options): Chrome options to configure the browser.
         user_data_dir (Optional[Path]): Directory for user data.
-        chrome_driver_path (Path): Path to the ChromeDriver executable.
+        chrome_driver_path (Optional[Path]): Path to the ChromeDriver executable. Resolved lazily (and cached on disk)
+            only when a new driver has to be spawned.
         debug (bool): Whether to enable debug logging.
+        retry_policy (Optional[RetryPolicy]): Backoff between retries of the element helpers (default is RetryPolicy()).
+        in_page_waits (bool): Whether to resolve element waits inside the page with a MutationObserver instead of
+            polling from WebDriverWait.
+        block_resources (Union[BlockingRules, str, None]): Requests to block in every tab, as BlockingRules or the
+            name of a preset ("media", "trackers" or "lean").
+        response_cache (Optional[ResponseCache]): Disk-backed cache to serve matching requests from (see ResponseCache
+            for its "cache", "record" and "replay" modes). It is closed when the driver quits.
+        preset (Optional[str]): Named bundle of Chrome flags from LAUNCH_PRESETS, e.g. "low-memory" or "max-throughput".
+        profile_template (Union[ProfileTemplate, Path, None]): Golden profile cloned (hardlinks/reflinks, no caches)
+            into `user_data_dir`, or into a temporary directory removed on `quit()`, when a new browser is launched.
+            A `user_data_dir` that already holds a profile (e.g. from an earlier launch) is used as is.
+        session_snapshot (Union[SessionSnapshot, Path, str, None]): Session state (or a file saved by `save_session`)
+            restored before the first navigation, e.g. to start already logged in.
     """
     def __init__(
         self,
@@ -45,17 +85,48 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
         extension_path          : Optional[Path]                = None,
         chrome_options          : Options                       = None,
         user_data_dir           : Optional[Path]                = None,
-        chrome_driver_path      : Path                          = Path(ChromeDriverManager().install()),
-        debug                   : bool                          = False
+        chrome_driver_path      : Optional[Path]                = None,
+        debug                   : bool                          = False,
+        retry_policy            : Optional[RetryPolicy]         = None,
+        in_page_waits           : bool                          = True,
+        block_resources         : Union[BlockingRules, str, None] = None,
+        response_cache          : Optional[ResponseCache]       = None,
+        preset                  : Optional[str]                 = None,
+        profile_template        : Union[ProfileTemplate, Path, None] = None,
+        session_snapshot        : Union[SessionSnapshot, Path, str, None] = None
     ):
         
-        self.CHROME_PATH            = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+        self.CHROME_PATH            = os.environ.get("CHROME_PATH")  # None: detected per platform when launching
+        self.debug_registry         = DebugRegistry()
         self.remote_debugging_port  = remote_debugging_port
         self.user_data_dir          = user_data_dir
         self.debug                  = debug
         self.browser_pid            = None
         self.logging_string         = ""
-
+        self.startup_timings        = {"import": IMPORT_TIME}
+        self.instrumentation        = Instrumentation()
+        self._cdp_connection        = None
+        self._crash_monitor         = None
+        self._self_managed_tabs     = set()  # target ids the crash monitor leaves to their owner (crawl tabs)
+        self._tab_index             = None
+        self._script_timeout        = None
+        self._request_interceptor   = None
+        self._network_blocker       = None
+        self._response_cache        = None
+        self._memory_watchdog       = None
+        self._cloned_profile        = None
+        self._download_manager      = None
+        self._session_restore       = None
+        self.download_directory     = download_directory
+        self.max_concurrent_downloads = None  # limit for downloads started through `downloads.download`
+        self.launch_flags           = default_launch_flags(preset, headless)  # fails on unknown presets before launching
+        self.profile_template       = ProfileTemplate(profile_template) if isinstance(profile_template, (str, Path)) else profile_template
+        self.retry_policy           = retry_policy or RetryPolicy()
+        self.in_page_waits          = in_page_waits
+        self.poll_frequency         = 0.1  # WebDriverWait polling used when in-page waits are unavailable
+        block_resources             = resolve_rules(block_resources)  # fail on unknown presets before launching
+        self._cdp_lock              = Lock()
+        started                     = perf_counter()
 
         if driver:
             # Replace attributes of the current instance with those of the passed driver
@@ -69,25 +140,29 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
             print("Initialized Existing Chrome WebDriver", end='') if self.debug else None
         else:
             # Initialize the base class (webdriver.Chrome) with the configured options
+            if chrome_driver_path is None:
+                chrome_driver_path = resolve_chrome_driver_path()
+                self.startup_timings["driver_resolution"] = resolution_timings.get("total", 0.0)
             service = Service(chrome_driver_path)
             # Prepare Chrome options
             options = chrome_options or Options()
+            if self.remote_debugging_port == 0:
+                self.remote_debugging_port = allocate_free_ports(1, self.debug_registry)[0]
             if self.remote_debugging_port:
                 if not self.user_data_dir:
-                    self.user_data_dir = Path(f"C:/ChromeRemoteDebug/{self.remote_debugging_port}")
-                if not self._get_pid_using_remote_debugging_chrome():
+                    self.user_data_dir = default_user_data_dir(self.remote_debugging_port)
+                self.browser_pid = self._get_pid_using_remote_debugging_chrome()
+                if not self.browser_pid:
+                    if self.profile_template is not None:
+                        self._clone_profile_template(self.user_data_dir)
                     self._launch_debugging_chrome()
                 else:
                     self._detect_and_handle_crashed_tabs()
                     self.bring_to_front(suppress_error=True)
                 options.add_experimental_option("debuggerAddress", f"127.0.0.1:{self.remote_debugging_port}")
             else:
-                if headless:
-                    options.add_argument("--headless=new")  # New headless mode for better compatibility
-                    options.add_argument("--disable-gpu")
-                    options.add_argument("--no-sandbox")
-                    options.add_argument("--disable-dev-shm-usage")
-                    options.add_argument("--profile-directory=Default")
+                for flag in self.launch_flags:
+                    options.add_argument(flag)
                 if download_directory:
                     prefs = {
                         "download.default_directory": str(download_directory),
@@ -99,79 +174,185 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
                     options.add_argument(f'--proxy-server={proxy_url}')
                 if extension_path and extension_path.exists():
                     options.add_extension(str(extension_path))
+                if self.profile_template is not None:
+                    self._clone_profile_template(self.user_data_dir)
                 if self.user_data_dir:
-                    options.add_argument(fr"--user-data-dir={user_data_dir}")
+                    options.add_argument(fr"--user-data-dir={self.user_data_dir}")
 
+            launch_started = perf_counter()
             super().__init__(service=service, options=options)
+            self.startup_timings["browser_launch"] = perf_counter() - launch_started
             print("Initialized New Chrome WebDriver", end='') if self.debug else None
 
+        if block_resources:
+            self.set_blocking_rules(block_resources)
+        if response_cache is not None:
+            self.set_response_cache(response_cache)
+        if session_snapshot is not None:
+            self.restore_session(session_snapshot)
         if self.remote_debugging_port:
             self.logging_string = f" with debugging port: {self.remote_debugging_port}"
+        self.startup_timings["startup"] = perf_counter() - started
         print(self.logging_string) if self.debug else None
+        print(f"Startup timings (s): {self.startup_timings}") if self.debug else None
       
         
-    def _get_debugger_tabs(self):
-        """Fetches all tabs from the remote debugging Chrome instance."""
-        try:
-            response = requests.get(f'http://localhost:{self.remote_debugging_port}/json')
-            return response.json()
-        except requests.exceptions.RequestException:
-            print("Could not connect to remote debugger.")
-            return []
-
-    def _is_crashed_tab(self, tab):
-        """Determines if a tab is in an 'Aw Snap' or Out of Memory state."""
-        ws_url = tab.get('webSocketDebuggerUrl', '')
-        if not ws_url:
-            return False
-        try:
-            response = requests.get(ws_url.replace("ws://", "http://").replace("/devtools/page/", "/json/page/"))
-            return 'error' in response.text.lower() or 'out of memory' in response.text.lower()
-        except requests.exceptions.RequestException:
-            return False
-
-    def _handle_crashed_tab(self, tab):
-        """Handles crashed tabs by reopening and closing them."""
-        if self._is_crashed_tab(tab):
-            print(f"Crashed tab detected: {tab['title']}")
-            new_tab = self.execute_cdp_cmd("Target.createTarget", {"url": tab['url']})
-            print(f"Opened new tab with URL: {tab['url']}") if self.debug else None
-            self.execute_cdp_cmd("Target.closeTarget", {"targetId": tab['id']})
-            print("Closed crashed tab.") if self.debug else None
+    def _debugger_address(self) -> str:
+        """Returns the `host:port` DevTools address of the browser controlled by this driver."""
+        if self.remote_debugging_port:
+            return f"127.0.0.1:{self.remote_debugging_port}"
+        debugger_address = self.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if not debugger_address:
+            raise RuntimeError("The browser does not expose a DevTools debugger address.")
+        return debugger_address
+
+    @property
+    def cdp(self) -> CDPConnection:
+        """The long-lived DevTools websocket connection to the browser, opened on first use."""
+        with self._cdp_lock:
+            if self._cdp_connection is None or self._cdp_connection.closed:
+                self._cdp_connection = CDPConnection.from_debugger_address(self._debugger_address(), debug=self.debug).start()
+                self._crash_monitor = None
+            return self._cdp_connection
+
+    def _handle_crashed_tab(self, target_id: str) -> Optional[str]:
+        """Handles a crashed tab by reopening its URL in a new tab and closing it. Returns the new target id."""
+        if self._crash_monitor is None:
+            self._detect_and_handle_crashed_tabs()
+        return self._crash_monitor.recover(target_id)
 
     def _detect_and_handle_crashed_tabs(self):
-        """Detects crashed tabs and handles them in parallel."""
-        tabs = self._get_debugger_tabs()
-        with ThreadPoolExecutor() as executor:
-            executor.map(lambda tab: self._handle_crashed_tab(tab), tabs)
+        """
+        Starts event-driven crash recovery on the shared DevTools connection, recovering tabs that have
+        already crashed. Once started, crashed tabs are recovered as soon as the crash event arrives;
+        later calls only re-check the attached tabs.
+        """
+        connection = self.cdp
+        with self._cdp_lock:
+            monitor, created = self._crash_monitor, self._crash_monitor is None
+            if created:
+                monitor = self._crash_monitor = CrashMonitor(connection, ignored=self._self_managed_tabs, debug=self.debug)
+        if created:
+            monitor.start()
+        else:
+            monitor.sweep()
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        """Sends a WebDriver command, recording its round-trip latency (CDP commands are counted per DevTools method)."""
+        instrumentation = self.__dict__.get("instrumentation")
+        if instrumentation is None or not instrumentation.enabled:
+            return super().execute(driver_command, params)
+        command = f"{driver_command}:{params['cmd']}" if driver_command == "executeCdpCommand" and params else driver_command
+        started = perf_counter()
+        try:
+            return super().execute(driver_command, params)
+        finally:
+            instrumentation.record_command(command, perf_counter() - started)
+
+    def metrics(self, format: Literal["dict", "prometheus"] = "dict"):
+        """
+        Returns the recorded latency, command-count, retry and wait-versus-action metrics.
+
+        Args:
+            format (Literal["dict", "prometheus"]): "dict" for a stats snapshot, "prometheus" for Prometheus text.
+        """
+        if format == "prometheus":
+            return self.instrumentation.to_prometheus()
+        return self.instrumentation.snapshot()
+
+    def start_profiler(self, interval: float = 0.01, on_sample: Optional[Callable[[str, str, object], None]] = None) -> SamplingProfiler:
+        """
+        Starts a sampling profiler attributing time spent in helpers to the calling lines of user code.
+        Stop it with `.stop()` (or use it as a context manager) and read the results with `.report()`.
+        """
+        return SamplingProfiler(self.instrumentation, interval=interval, on_sample=on_sample).start()
+
+    def start_memory_watchdog(self, interval: float = 30, max_heap_mb: Optional[float] = 512, max_renderer_rss_mb: Optional[float] = None, idle_timeout: Optional[float] = None, action: Literal["reload", "discard", "recreate"] = "reload", idle_action: Literal["reload", "discard", "recreate"] = "discard", protect_current: bool = True) -> MemoryWatchdog:
+        """
+        Starts a background thread sampling the JS heap of every tab and the RSS of the browser's processes, which
+        reloads, discards or recreates (at the same URL) tabs over a threshold or idle for too long, before they
+        crash. Samples are published as gauges in `metrics()`; per-tab values are in the watchdog's `.metrics()`.
+        See MemoryWatchdog for the arguments. Stop it with `.stop()`; `quit()` stops it too.
+        """
+        if self._memory_watchdog is not None:
+            self._memory_watchdog.stop()
+        self._memory_watchdog = MemoryWatchdog(
+            self, interval=interval, max_heap_mb=max_heap_mb, max_renderer_rss_mb=max_renderer_rss_mb, idle_timeout=idle_timeout,
+            action=action, idle_action=idle_action, protect_current=protect_current, debug=self.debug,
+        )
+        return self._memory_watchdog.start()
+
+    def quit(self) -> None:
+        """Closes the DevTools connection and quits the driver."""
+        if self._memory_watchdog is not None:
+            self._memory_watchdog.stop()
+        if self._cdp_connection is not None:
+            self._cdp_connection.close()
+        if self._download_manager is not None:
+            self._download_manager.close()
+        if self._response_cache is not None:
+            self._response_cache.close()  # no more paused requests; finish pending writes
+        try:
+            if "service" in self.__dict__:
+                super().quit()
+            else:
+                # Attached to a driver without a local service (e.g. webdriver.Remote)
+                webdriver.Remote.quit(self)
+        finally:
+            if self._cloned_profile is not None:
+                shutil.rmtree(str(self._cloned_profile), ignore_errors=True)
+
+    def _clone_profile_template(self, user_data_dir: Optional[Path]) -> None:
+        """Clone the profile template into `user_data_dir`, or into a temporary profile removed on quit. A populated `user_data_dir` is kept as is."""
+        if user_data_dir is not None and Path(user_data_dir).is_dir() and any(Path(user_data_dir).iterdir()):
+            print(f"Keeping the existing profile in {user_data_dir} instead of cloning the template.") if self.debug else None
+            return
+        self.user_data_dir = self.profile_template.clone(user_data_dir)
+        if user_data_dir is None:
+            self._cloned_profile = self.user_data_dir
+        self.startup_timings["profile_clone"] = self.profile_template.last_clone["seconds"]
+        print(f"Cloned profile template into {self.user_data_dir}: {self.profile_template.last_clone}") if self.debug else None
 
     def _launch_debugging_chrome(self):
-        """Launch Chrome with remote debugging enabled."""
-        if not self.user_data_dir.exists():
-            self.user_data_dir.mkdir(parents=True, exist_ok=True)
-        Popen([self.CHROME_PATH, f'--remote-debugging-port={self.remote_debugging_port}', f'--user-data-dir={self.user_data_dir}'])
-        # print(f"Launched Chrome with remote debugging on port {self.remote_debugging_port}.")
+        """Launch Chrome with remote debugging enabled and wait until its DevTools port is ready."""
+        launch_started = perf_counter()
+        self.browser_pid = launch_debugging_chrome(
+            self.remote_debugging_port, self.user_data_dir, chrome_path=self.CHROME_PATH, extra_args=self.launch_flags, registry=self.debug_registry
+        )
+        self.startup_timings["debugging_chrome_launch"] = perf_counter() - launch_started
+        print(f"Launched Chrome with remote debugging on port {self.remote_debugging_port}.") if self.debug else None
 
     def _get_pid_using_remote_debugging_chrome(self) -> Optional[int]:
-        """Check if Chrome is running with the specified remote debugging port and return its PID."""
+        """
+        Check if Chrome is running with the specified remote debugging port and return its PID.
+        Looks the port up in the debug registry first (constant time); only unregistered instances, e.g. launched
+        by hand, need a scan of all processes, after which they are registered.
+        """
+        entry = self.debug_registry.get(self.remote_debugging_port)
+        if entry:
+            return entry["pid"]
         for proc in process_iter(['pid', 'name', 'cmdline']):
             try:
-                if proc.info['name'].lower() == "chrome.exe" and \
+                if proc.info['name'].lower() in CHROME_PROCESS_NAMES and \
                    f"--remote-debugging-port={self.remote_debugging_port}" in " ".join(proc.info['cmdline']).lower():
+                    self.debug_registry.register(self.remote_debugging_port, proc.info['pid'], self.user_data_dir)
                     return proc.info['pid']
-            except (AttributeError, KeyError):
+            except (AttributeError, KeyError, TypeError):
                 continue
         return None
 
 
+    @instrumented
     def bring_to_front(self, suppress_error: bool = False) -> None:
         """Activate the Chrome window to bring it to front."""
         try:
+            if getAllWindows is None:
+                raise RuntimeError("Bringing Chrome to front requires pywin32 and PyGetWindow (Windows only).")
             if self.browser_pid is None:
                 if self.remote_debugging_port:
                     self.browser_pid = self._get_pid_using_remote_debugging_chrome()
                 else:
-                    self.browser_pid = next(child.pid for child in Process(self.service.process.pid).children() if child.name().lower() == "chrome.exe")
+                    self.browser_pid = next(child.pid for child in Process(self.service.process.pid).children() if child.name().lower() in CHROME_PROCESS_NAMES)
 
             if self.browser_pid is None:
                 raise RuntimeError(f"No Chrome process found{self.logging_string}.")
@@ -198,35 +379,209 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
                 return None
             raise e
 
-    def switch_to_tab_with_url(self, target_url: str, new_tab_url: str = None):
+    @property
+    def tab_index(self) -> TabIndex:
+        """Index of the browser's tabs by URL, host and title, kept current through DevTools target events."""
+        connection = self.cdp
+        with self._cdp_lock:
+            if self._tab_index is None or self._tab_index.connection is not connection:
+                self._tab_index = TabIndex(connection).start()
+            return self._tab_index
+
+    @property
+    def downloads(self) -> DownloadManager:
+        """
+        Tracks downloads over DevTools events, without polling the download directory.
+
+        Example:
+            finished = driver.downloads.expect()
+            driver.click_element("//a[@id='export']")
+            download = finished.result(timeout=300)  # Download(url, path, size, digest, elapsed)
+            files = [future.result() for future in [driver.downloads.download(url, directory=folder) for url in urls]]
+        """
+        connection = self.cdp
+        with self._cdp_lock:
+            if self._download_manager is None or self._download_manager.connection is not connection:
+                directory = Path(self.download_directory) if self.download_directory else Path.cwd() / "downloads"
+                self._download_manager = DownloadManager(connection, directory, max_concurrent=self.max_concurrent_downloads, debug=self.debug)
+            manager = self._download_manager
+        return manager.start()
+
+    def save_session(self, path: Union[Path, str], origins: Optional[List[str]] = None, max_age: Optional[float] = 24 * 3600, include_indexed_db: bool = True) -> SessionSnapshot:
+        """
+        Snapshot cookies, localStorage, sessionStorage and IndexedDB into a compact versioned file, so that other
+        browsers can skip login flows with `restore_session`.
+
+        Args:
+            path (Union[Path, str]): The file to write (gzip-compressed JSON).
+            origins (Optional[List[str]], optional): Origins such as "https://example.com" to capture (default is the
+                origins of all open tabs). Storages are read from an open tab of each origin.
+            max_age (Optional[float], optional): Seconds after which the snapshot counts as expired (default is a day, None never).
+            include_indexed_db (bool, optional): Whether to capture IndexedDB databases (default is True).
+        Returns:
+            SessionSnapshot: The saved snapshot.
+        """
+        snapshot = SessionSnapshot.capture(self.cdp, origins, max_age=max_age, include_indexed_db=include_indexed_db, debug=self.debug)
+        snapshot.save(path)
+        print(f"Saved session of {len(snapshot.origins)} origins and {len(snapshot.cookies)} cookies to {path}") if self.debug else None
+        return snapshot
+
+    def restore_session(self, snapshot: Union[SessionSnapshot, Path, str], allow_expired: bool = False) -> SessionSnapshot:
+        """
+        Restore a session snapshot: cookies in one bulk DevTools call, and storages before the first script of every
+        page of a snapshotted origin (tabs already on such an origin are updated through DOMStorage). Restoring another
+        snapshot stops the previous one from being restored into new pages.
+
+        Args:
+            snapshot (Union[SessionSnapshot, Path, str]): The snapshot or a file saved by `save_session`.
+            allow_expired (bool, optional): Whether to restore an expired snapshot (default is False).
+        Raises:
+            ValueError: If the file is not a supported snapshot, or the snapshot has expired.
+        Returns:
+            SessionSnapshot: The restored snapshot.
+        """
+        if not isinstance(snapshot, SessionSnapshot):
+            snapshot = SessionSnapshot.load(snapshot)
+        started = perf_counter()
+        if self._session_restore is not None:
+            # e.g. a pooled browser: the previous lease's storage must not reach the next job's pages
+            self._session_restore()
+            self._session_restore = None
+        self._session_restore = snapshot.apply(self.cdp, allow_expired=allow_expired)
+        self.startup_timings["session_restore"] = perf_counter() - started
+        print(f"Restored session of {len(snapshot.origins)} origins and {len(snapshot.cookies)} cookies") if self.debug else None
+        return snapshot
+
+    @property
+    def request_interceptor(self) -> RequestInterceptor:
+        """Routes requests paused through the DevTools `Fetch` domain to the registered handlers, in every tab."""
+        connection = self.cdp
+        with self._cdp_lock:
+            created = self._request_interceptor is None or self._request_interceptor.connection is not connection
+            if created:
+                self._request_interceptor = RequestInterceptor(connection, debug=self.debug)
+            interceptor = self._request_interceptor
+        if created:
+            # Reapply blocking and caching after the DevTools connection was reopened
+            for handler in (self._network_blocker, self._response_cache):
+                if handler is not None:
+                    interceptor.add_handler(handler)
+        return interceptor
+
+    def set_blocking_rules(self, rules: Union[BlockingRules, str, None]) -> None:
+        """
+        Blocks matching requests in all current and future tabs, replacing any previous rules.
+
+        Args:
+            rules (Union[BlockingRules, str, None]): BlockingRules, the name of a preset ("media", "trackers" or
+                "lean"), or None to stop blocking.
+        """
+        rules = resolve_rules(rules)
+        interceptor = self.request_interceptor
+        if self._network_blocker is None:
+            if rules is None:
+                return
+            self._network_blocker = NetworkBlocker(rules, debug=self.debug)
+            interceptor.add_handler(self._network_blocker)
+            return
+        self._network_blocker.update(interceptor.connection, rules or BlockingRules())
+        interceptor.refresh()
+
+    def blocking_stats(self) -> Dict[str, dict]:
+        """
+        Returns the requests and bytes saved by the blocking rules for the current page of each tab.
+
+        Returns:
+            Dict[str, dict]: Per window handle, the page URL, `requests_loaded`, `bytes_loaded`, `requests_blocked`,
+                `bytes_saved_estimate` and `blocked_by_type`. Saved bytes are estimated from the average size of
+                loaded requests of the same resource type.
+        """
+        return self._network_blocker.stats() if self._network_blocker else {}
+
+    def set_response_cache(self, cache: Optional[ResponseCache]) -> None:
+        """
+        Serves matching requests of all current and future tabs from `cache`, replacing any previous cache.
+        The driver closes the cache in use when it quits.
+
+        Args:
+            cache (Optional[ResponseCache]): The cache to use, or None to stop caching.
+        """
+        interceptor = self.request_interceptor
+        if self._response_cache is not None:
+            interceptor.remove_handler(self._response_cache)
+        self._response_cache = cache
+        if cache is not None:
+            interceptor.add_handler(cache)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Returns the hit, miss, store and eviction counts and the size of the response cache."""
+        return self._response_cache.cache_stats() if self._response_cache else {}
+
+    @instrumented
+    def switch_to_tab_with_url(self, target_url: str, new_tab_url: str = None, match: Literal["contains", "prefix", "exact", "regex"] = "contains"):
         """
         Switches to an existing tab with the specified target URL or opens a new tab with the provided URL.
-        This function first checks if the current tab's URL matches the target URL. If it does, it remains on the current tab.
-        If not, it iterates through all open tabs to find one with the target URL and switches to it. If no such tab is found,
-        it looks for an empty tab (e.g., a new tab page) to reuse. If an empty tab is found, it navigates to the new_tab_url
-        (or target_url if new_tab_url is not provided). If no empty tab is found, it opens a new tab with the new_tab_url
-        (or target_url if new_tab_url is not provided).
+        Tabs are looked up in the tab index once pending tab events are processed, so switching to a match takes at most two
+        WebDriver round trips (reading the current tab and switching). If the current tab matches, it remains on the current tab. If no tab matches, it looks for an empty tab (e.g., a new tab page) to reuse.
+        If an empty tab is found, it navigates to the new_tab_url. If no empty tab is found, it opens a new tab with the new_tab_url.
+        Falls back to checking every window handle when the DevTools connection is unavailable.
         Args:
-            target_url (str): The URL to switch to or open in a new tab.
+            target_url (str): The URL (or URL pattern, see `match`) to switch to.
             new_tab_url (str, optional): The URL to open in a new tab if no tab with the target URL is found. Defaults to None.
+            match (Literal["contains", "prefix", "exact", "regex"], optional): How `target_url` is matched against tab URLs. Defaults to "contains".
         Returns:
             None
         """
+        try:
+            index = self.tab_index
+        except Exception as e:
+            print(f"Tab index unavailable ({e}), scanning window handles.") if self.debug else None
+            return self._scan_tabs_for_url(target_url, new_tab_url, match=match)
+
+        self.cdp.flush_events()  # tabs opened or navigated just before this call must be in the index
+        tabs = index.find_all(target_url, match=match)
+        if tabs:
+            if len(tabs) > 1:
+                try:
+                    current = self.current_window_handle
+                except WebDriverException:
+                    current = None  # the current tab was closed
+                if any(tab.handle == current for tab in tabs):
+                    print("Already at tab having URL:", target_url) if self.debug else None
+                    return
+            self.switch_to.window(tabs[0].handle)
+            print("Switched to tab with URL:", tabs[0].url) if self.debug else None
+            return
+        print(f"No tab found with URL: {target_url}") if self.debug or not new_tab_url else None
+
+        # If no tab found, search for empty tab or open a new tab
+        if new_tab_url:
+            empty_tab = index.find_empty()
+            if empty_tab:
+                print(f"An empty tab exists, opening '{new_tab_url}' in it.") if self.debug else None
+                self.switch_to.window(empty_tab.handle)
+                self.get(new_tab_url)
+            else:
+                print(f"Opening a new tab with the URL: {new_tab_url}.") if self.debug else None
+                target_id = self.execute_cdp_cmd("Target.createTarget", {"url": new_tab_url})["targetId"]
+                self.switch_to.window(target_id)  # Switch to the newly opened tab
+
+    def _scan_tabs_for_url(self, target_url: str, new_tab_url: str = None, match: Literal["contains", "prefix", "exact", "regex"] = "contains"):
+        """Switches to a tab matching the target URL (like `TabIndex.find_all`) by visiting every window handle (used without DevTools access)."""
+        matches = compile_matcher(target_url, match)
         try:
             self.current_window_handle  # Try accessing it
-            # is_closed = driver.current_window_handle not in driver.window_handles
         except:
-            # is_closed = True
             if self.window_handles:
                 self.switch_to.window(self.window_handles[-1])
-        if self.current_url and target_url in self.current_url:
+        if self.current_url and matches(self.current_url):
             print("Already at tab having URL:", self.current_url) if self.debug else None
             return
-        
+
         empty_tab_handle = None
         for handle in self.window_handles:
             self.switch_to.window(handle)
-            if target_url in self.current_url:
+            if matches(self.current_url):
                 print("Switched to tab with URL:", self.current_url) if self.debug else None
                 return
             if self.current_url in ['data:,', 'chrome://new-tab-page/']:
@@ -237,16 +592,18 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
         if new_tab_url:
             if empty_tab_handle:
                 print(f"An empty tab exists, opening '{new_tab_url}' in it.") if self.debug else None
-                self.switch_to.window(handle)
+                self.switch_to.window(empty_tab_handle)
                 self.get(new_tab_url)
             else:
                 print(f"Opening a new tab with the URL: {new_tab_url}.") if self.debug else None
                 self.execute_cdp_cmd("Target.createTarget", {"url": new_tab_url})
                 self.switch_to.window(self.window_handles[-1])  # Switch to the newly opened tab
-    
+
     def _retry_logic(self, action: Callable[[], WebElement], retries: int = 2, suppress_error: bool = False) -> Optional[WebElement]:
         """
         Retry logic for executing actions with suppress_error option.
+        Attempts are spaced by the exponential backoff with jitter of `self.retry_policy`, and stop early
+        once the current deadline budget (see `retry.deadline`) is spent.
 
         Args:
             action (Callable[[], WebElement]): The action to perform as a callable function.
@@ -259,43 +616,79 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
         Raises:
             Exception: The last caught exception if all attempts fail and suppress_error is False.
         """
-        for _ in range(retries):
+        for attempt in range(retries):
             try:
                 return action()
             except Exception as e:
                 if suppress_error:
                     return None
-                sleep(1)
                 error = e
+                left = remaining()
+                if attempt == retries - 1 or left == 0:
+                    break
+                delay = self.retry_policy.delay(attempt)
+                delay = delay if left is None else min(delay, left)
+                self.instrumentation.record_backoff(delay)
+                sleep(delay)
         raise error  # Raise the last caught exception if suppress_error is False
 
+    _WAIT_CONDITIONS = {
+        "visible": EC.visibility_of_element_located,
+        "clickable": EC.element_to_be_clickable,
+        "present": EC.presence_of_element_located,
+    }
+
+    def _wait(self, selector: str, by: str, condition: str, timeout: float, parent_element: Optional[WebElement] = None) -> WebElement:
+        """
+        Wait engine shared by the element helpers.
+
+        Resolves the condition inside the page with a MutationObserver through one async script call, returning as soon as
+        the element matches. Falls back to WebDriverWait polling at `self.poll_frequency` if the script cannot run (e.g. the
+        page navigated away mid-wait). The timeout is capped by the current deadline budget.
+
+        Raises:
+            TimeoutException: If the condition is not met in time.
+        """
+        with self.instrumentation.wait():
+            return self._wait_until(selector, by, condition, timeout, parent_element)
+
+    def _wait_until(self, selector: str, by: str, condition: str, timeout: float, parent_element: Optional[WebElement] = None) -> WebElement:
+        if self.in_page_waits:
+            timeout_left = budget(timeout)
+            try:
+                self._ensure_script_timeout(timeout_left + 5)
+                result = self.execute_async_script(scripts.async_script(scripts.WAIT_FOR_ELEMENT), by, selector, condition, int(timeout_left * 1000), parent_element)
+                if isinstance(result, WebElement):
+                    return result
+                raise TimeoutException(f"Element '{selector}' not {condition}: {result.get('__error') if isinstance(result, dict) else result}")
+            except JavascriptException as e:
+                print(f"In-page wait interrupted ({e.msg}), polling instead.") if self.debug else None
+        search_context = parent_element or self
+        return WebDriverWait(search_context, budget(timeout), poll_frequency=self.poll_frequency).until(self._WAIT_CONDITIONS[condition]((by, selector)))
+
+    @instrumented
     def wait_for_element(self, selector: str, by: str = By.XPATH, timeout: int = 120, parent_element: Optional[WebElement] = None, condition: str = "visible", suppress_error: bool = False) -> Optional[WebElement]:
         """
         Wait for an element to meet the specified condition.
+        The wait returns as soon as the condition holds (see `_wait`) and never outlasts the current deadline budget.
 
         Returns:
             WebElement or None: The located element if the condition is met, or None if suppressed and failed.
         """
-        conditions = {
-            "visible": EC.visibility_of_element_located,
-            "clickable": EC.element_to_be_clickable,
-            "present": EC.presence_of_element_located,
-        }
-
-        if condition not in conditions:
+        if condition not in self._WAIT_CONDITIONS:
             raise ValueError(f"Unsupported condition '{condition}'. Choose from 'visible', 'clickable', or 'present'.")
 
-        wait_condition = conditions[condition]((by, selector))
-
         def action() -> WebElement:
-            search_context = parent_element or self
-            return WebDriverWait(search_context, timeout).until(wait_condition)
+            return self._wait(selector, by, condition, timeout, parent_element)
 
-        return self._retry_logic(action, retries=1, suppress_error=suppress_error)
+        with deadline(timeout):
+            return self._retry_logic(action, retries=1, suppress_error=suppress_error)
 
+    @instrumented
     def click_element(self, selector: str, by: str = By.XPATH, parent_element: Optional[WebElement] = None, immediate: bool = False, timeout: int = 15, suppress_error: bool = False, retries: int = 2) -> Optional[WebElement]:
         """
         Click on an element with retry logic.
+        The whole call, retries and backoff included, shares one `timeout` deadline budget.
 
         Args:
             selector (str): The selector to locate the element.
@@ -314,15 +707,18 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
             if immediate:
                 element = search_context.find_element(by=by, value=selector)
             else:
-                element = WebDriverWait(search_context, timeout).until(EC.element_to_be_clickable((by, selector)))
+                element = self._wait(selector, by, "clickable", timeout, parent_element)
             ActionChains(self).click(element).perform()
             return element
 
-        return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
+        with deadline(timeout):
+            return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
 
+    @instrumented
     def double_click_element(self, selector: str, by: str = By.XPATH, timeout: int = 15, parent_element: Optional[WebElement] = None, suppress_error: bool = False, retries: int = 2) -> Optional[WebElement]:
         """
         Double-click on a web element specified by the selector with retry logic.
+        The whole call, retries and backoff included, shares one `timeout` deadline budget.
         Args:
             selector (str): The selector string to locate the element.
             by (str, optional): The type of selector to use (e.g., By.XPATH, By.ID). Defaults to By.XPATH.
@@ -335,16 +731,18 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
             WebElement or None: The double-clicked element if successful, or None if suppressed and failed.
         """
         def action() -> WebElement:
-            search_context = parent_element or self
-            element = WebDriverWait(search_context, timeout).until(EC.element_to_be_clickable((by, selector)))
+            element = self._wait(selector, by, "clickable", timeout, parent_element)
             ActionChains(self).double_click(element).perform()
             return element
 
-        return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
+        with deadline(timeout):
+            return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
 
+    @instrumented
     def send_keys_to_element(self, selector: str, key, by: str = By.XPATH, timeout: int = 15, parent_element: Optional[WebElement] = None, suppress_error: bool = False, retries: int = 2) -> Optional[WebElement]:
         """
         Send keys to a web element identified by a selector with retry logic.
+        The whole call, retries and backoff included, shares one `timeout` deadline budget.
         Args:
             selector (str): The selector string to locate the element.
             key: The key(s) to send to the element.
@@ -358,16 +756,18 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
             WebElement or None: The element after sending keys if successful, or None if suppressed and failed.
         """
         def action() -> WebElement:
-            search_context = parent_element or self
-            element = WebDriverWait(search_context, timeout).until(EC.presence_of_element_located((by, selector)))
+            element = self._wait(selector, by, "present", timeout, parent_element)
             element.send_keys(key)
             return element
 
-        return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
+        with deadline(timeout):
+            return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
 
+    @instrumented
     def select_value(self, selector: str, value, by: str = By.XPATH, timeout: int = 15, select_by: Literal["index", "value", "visible text"] = "value", parent_element: Optional[WebElement] = None, suppress_error: bool = False, retries: int = 2) -> Optional[WebElement]:
         """
         Select a value from a dropdown element with retry logic.
+        The whole call, retries and backoff included, shares one `timeout` deadline budget.
         Args:
             selector (str): The selector string to locate the dropdown element.
             value: The value to select in the dropdown. The type depends on `select_by`.
@@ -387,8 +787,7 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
             raise ValueError(f"Invalid `select_by` value: {select_by}")
         
         def action() -> WebElement:
-            search_context = parent_element or self
-            element = WebDriverWait(search_context, timeout).until(EC.presence_of_element_located((by, selector)))
+            element = self._wait(selector, by, "present", timeout, parent_element)
             dropdown = Select(element)
             if select_by == "index":
                 dropdown.select_by_index(value)
@@ -398,8 +797,17 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
                 dropdown.select_by_visible_text(value)
             return element
 
-        return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
+        with deadline(timeout):
+            return self._retry_logic(action, retries=retries, suppress_error=suppress_error)
+
+    _SCROLL_SCRIPTS = {
+        "Top": "window.scrollTo(0, 0);",
+        "Up": "window.scrollBy(0, -250);",
+        "Down": "window.scrollBy(0, 250);",
+        "Bottom": "window.scrollTo(0, document.body.scrollHeight);",
+    }
 
+    @instrumented
     def scroll(self, move: Literal["Top", "Up", "Down", "Bottom"]) -> None:
         """
         Scroll the webpage in the specified direction.
@@ -411,13 +819,181 @@ class AdvanceSeleniumChrome(webdriver.Chrome):
                 "Down" to scroll down by a fixed amount (250 pixels).
                 "Bottom" to scroll to the bottom of the page.
         """
-        if move == "Top":
-            self.execute_script("window.scrollTo(0, 0);")
-        elif move == "Up":
-            self.execute_script("window.scrollBy(0, -250);")
-        elif move == "Down":
-            self.execute_script("window.scrollBy(0, 250);")
-        elif move == "Bottom":
-            self.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        if move not in self._SCROLL_SCRIPTS:
+            raise ValueError("Invalid value for move. Use 'Up', 'Down', 'Top' or 'Bottom'.")
+        self.execute_script(self._SCROLL_SCRIPTS[move])
+
+    def _ensure_script_timeout(self, seconds: float) -> None:
+        """Raises the session's async script timeout to at least `seconds` (one round trip, only when needed)."""
+        if self._script_timeout is None or self._script_timeout < seconds:
+            self.set_script_timeout(seconds)
+            self._script_timeout = seconds
+
+    @staticmethod
+    def _needs_trusted_input(action: Dict[str, Any]) -> bool:
+        """Whether an action must go through WebDriver's trusted input events instead of running in the page."""
+        if action.get("trusted") or action.get("action") not in ("click", "double_click", "send_keys", "clear", "select"):
+            return True
+        # Special keys (Keys.ENTER, Keys.TAB, ...) live in the Unicode private use area and need real key events
+        return action.get("action") == "send_keys" and any("\ue000" <= char <= "\uf8ff" for char in str(action.get("value", "")))
+
+    def _run_trusted_action(self, action: Dict[str, Any], timeout: int, retries: int) -> None:
+        """Runs one action through the per-element helper methods."""
+        by, selector, value = action.get("by", By.XPATH), action["selector"], action.get("value")
+        if action["action"] == "click":
+            self.click_element(selector, by=by, timeout=timeout, retries=retries)
+        elif action["action"] == "double_click":
+            self.double_click_element(selector, by=by, timeout=timeout, retries=retries)
+        elif action["action"] == "send_keys":
+            self.send_keys_to_element(selector, value, by=by, timeout=timeout, retries=retries)
+        elif action["action"] == "clear":
+            self.wait_for_element(selector, by=by, timeout=timeout, condition="present").clear()
+        elif action["action"] == "select":
+            self.select_value(selector, value, by=by, timeout=timeout, select_by=action.get("select_by", "value"), retries=retries)
         else:
-            raise ValueError("Invalid value for move. Use 'Up', 'Down', 'Top' or 'Bottom'.")
\ No newline at end of file
+            raise ValueError(f"Unsupported action '{action['action']}'.")
+
+    @instrumented
+    def run_actions(self, actions: List[Dict[str, Any]], timeout: int = 15, suppress_error: bool = False, retries: int = 2) -> List[Dict[str, Any]]:
+        """
+        Run many element interactions with as few WebDriver round trips as possible.
+
+        Consecutive actions are compiled into a single async script that waits for each element, acts on it and
+        reports per-action results. Actions that need trusted input events (`"trusted": True`, or special keys such
+        as Keys.ENTER) run through the per-element methods instead, in order.
+        Args:
+            actions (List[Dict[str, Any]]): Actions to run. Each is a dict with:
+                "selector" (str): The selector string to locate the element.
+                "by" (str, optional): The method to locate the element (default is By.XPATH).
+                "action" (str): One of "click", "double_click", "send_keys", "clear" or "select".
+                "value" (optional): Keys to send, or the value to select.
+                "select_by" (str, optional): "index", "value" or "visible text" for "select" (default is "value").
+                "trusted" (bool, optional): Whether to use trusted WebDriver input events (default is False).
+            timeout (int, optional): The maximum time to wait for each element (default is 15 seconds).
+            suppress_error (bool, optional): Whether to return the failed results instead of raising (default is False).
+            retries (int, optional): The number of retries for actions run through the per-element methods (default is 2).
+        Raises:
+            RuntimeError: If an action fails and suppress_error is False.
+        Returns:
+            List[Dict[str, Any]]: One {"ok": bool, "error": Optional[str]} result per action. Actions after a failure are skipped.
+        """
+        results: List[Dict[str, Any]] = []
+        index = 0
+        while index < len(actions) and (not results or results[-1]["ok"]):
+            if self._needs_trusted_input(actions[index]):
+                try:
+                    self._run_trusted_action(actions[index], timeout, retries)
+                    results.append({"ok": True, "error": None})
+                except Exception as e:
+                    results.append({"ok": False, "error": str(e)})
+                index += 1
+                continue
+            batch = []
+            while index < len(actions) and not self._needs_trusted_input(actions[index]):
+                action = actions[index]
+                batch.append({
+                    "selector": action["selector"],
+                    "by": action.get("by", By.XPATH),
+                    "action": action["action"],
+                    "value": action.get("value"),
+                    "select_by": action.get("select_by", "value"),
+                })
+                index += 1
+            self._ensure_script_timeout(timeout * len(batch) + 5)
+            batch_results = self.execute_async_script(scripts.async_script(scripts.RUN_ACTIONS), batch, timeout * 1000)
+            if isinstance(batch_results, dict) and "__error" in batch_results:
+                raise RuntimeError(f"Batched actions failed: {batch_results['__error']}")
+            results.extend(batch_results)
+        results.extend({"ok": False, "error": "skipped after earlier failure"} for _ in range(len(actions) - len(results)))
+
+        failed = next((i for i, result in enumerate(results) if not result["ok"]), None)
+        print(f"Ran {len(actions)} actions, first failure: {failed}") if self.debug else None
+        if failed is not None and not suppress_error:
+            raise RuntimeError(f"Action {failed} ({actions[failed]['action']} on '{actions[failed]['selector']}') failed: {results[failed]['error']}")
+        return results
+
+    @staticmethod
+    def _field_spec(field: Union[str, Dict[str, Any]], by: str) -> Dict[str, Any]:
+        if isinstance(field, dict):
+            unknown = set(field) - {"selector", "by", "attr", "prop", "html", "all"}
+            if unknown:
+                raise ValueError(f"Unsupported field options: {', '.join(sorted(unknown))}")
+            return {"selector": field.get("selector", ""), "by": field.get("by", by), "attr": field.get("attr"), "prop": field.get("prop"), "html": field.get("html", False), "all": field.get("all", False)}
+        match = _FIELD_SUFFIX.match(field)
+        selector, kind = (match.group(1), match.group(2)) if match else (field, "text")
+        return {"selector": selector.strip(), "by": by, "attr": match and match.group(3), "prop": match and match.group(4), "html": kind == "html", "all": False}
+
+    def extract_rows(self, row_selector: str, fields: Dict[str, Union[str, Dict[str, Any]]], by: str = By.XPATH, chunk_size: int = 500, infinite_scroll: bool = False, key: Optional[List[str]] = None, timeout: float = 0, max_scrolls: int = 100, scroll_timeout: float = 5) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extract structured rows inside the page, one round trip per chunk instead of per element or text.
+
+        Example:
+            for chunk in driver.extract_rows("table#results tr", {"name": "td.name", "link": "a::attr(href)"}, by=By.CSS_SELECTOR):
+                save(chunk)
+        Args:
+            row_selector (str): The selector matching every row.
+            fields (Dict[str, Union[str, Dict[str, Any]]]): Field name to a sub-selector relative to the row, using `by`.
+                The text content is extracted unless the selector ends in "::attr(name)", "::prop(name)" or "::html";
+                an empty selector (e.g. "::attr(data-id)") reads the row itself. A dict with "selector", "by", "attr",
+                "prop", "html" and "all" (a list of values of every match) gives full control. Missing elements give None.
+            by (str, optional): The method to locate rows and fields (default is By.XPATH).
+            chunk_size (int, optional): The number of rows per chunk (default is 500).
+            infinite_scroll (bool, optional): Whether to keep scrolling to the bottom for more rows once the loaded ones run out (default is False).
+            key (Optional[List[str]], optional): The fields identifying a row; rows repeating their values are dropped (default is all
+                fields with `infinite_scroll`, and no deduplication by value otherwise).
+            timeout (float, optional): The maximum time to wait for the first row to appear (default is 0, extract right away).
+            max_scrolls (int, optional): The maximum number of scroll steps (default is 100).
+            scroll_timeout (float, optional): The time to wait for new rows after a scroll before assuming the end (default is 5 seconds).
+        Yields:
+            List[Dict[str, Any]]: Chunks of up to `chunk_size` rows as plain dicts, in document order.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        specs = {name: self._field_spec(field, by) for name, field in fields.items()}
+        if key and set(key) - set(specs):
+            raise ValueError(f"Unknown key fields: {', '.join(sorted(set(key) - set(specs)))}")
+        if timeout:
+            self.wait_for_element(row_selector, by=by, timeout=timeout, condition="present", suppress_error=True)
+        extraction_id, done, rows = uuid4().hex, False, 0
+        self._ensure_script_timeout(scroll_timeout * max_scrolls + 30 if infinite_scroll else 30)
+        script = scripts.async_script(scripts.EXTRACT_ROWS)
+        try:
+            while not done:
+                with self.instrumentation.call("extract_rows"):
+                    result = self.execute_async_script(script, extraction_id, by, row_selector, specs, chunk_size, list(key or []), infinite_scroll, max_scrolls, int(scroll_timeout * 1000))
+                if isinstance(result, dict) and "__error" in result:
+                    raise RuntimeError(f"Extracting rows '{row_selector}' failed: {result['__error']}")
+                done = result["done"]
+                rows += len(result["rows"])
+                if result["rows"]:
+                    yield result["rows"]
+        finally:
+            print(f"Extracted {rows} rows matching '{row_selector}'") if self.debug else None
+            if not done:
+                # The consumer stopped early: drop the cursor held by the page
+                try:
+                    self.execute_script("delete (window.__ascExtractions || {})[arguments[0]];", extraction_id)
+                except WebDriverException:
+                    pass
+
+    def crawl(self, urls: Iterable[str], extract: Callable[[Any], Any], concurrency: int = 4, timeout: float = 30, retries: int = 1, buffer_size: Optional[int] = None) -> Iterator[Any]:
+        """
+        Crawl many URLs in parallel tabs and stream the extraction results in completion order.
+
+        A bounded number of tabs load concurrently over DevTools and are reused between URLs. Failed URLs are retried,
+        in a fresh tab if theirs crashed or hung (see CrawlEngine). Throughput is reported in `self.crawl_stats["pages_per_second"]`.
+        Args:
+            urls (Iterable[str]): URLs to crawl; consumed lazily, so it may be a generator.
+            extract (Callable[[AsyncTab], Any]): Extraction function, sync or async, called with each loaded tab (see `AsyncTab`).
+            concurrency (int, optional): Number of tabs in flight (default is 4).
+            timeout (float, optional): Per-URL timeout in seconds covering navigation and extraction (default is 30).
+            retries (int, optional): Number of retries per URL after a failure (default is 1).
+            buffer_size (Optional[int], optional): Finished results buffered for the consumer before workers pause (default is 2 * concurrency).
+        Returns:
+            Iterator[CrawlResult]: Results with `url`, `value`, `error`, `elapsed` and `attempts`.
+        """
+        from .crawl import CrawlEngine
+
+        engine = CrawlEngine(self, concurrency=concurrency, timeout=timeout, retries=retries, buffer_size=buffer_size, debug=self.debug)
+        self.crawl_stats = engine.stats
+        return engine.run(urls, extract)
@@ -0,0 +1,351 @@
+import asyncio
+from typing import Any, Dict, List, Literal, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from . import scripts
+from .advance_selenium_chrome import AdvanceSeleniumChrome
+from .cdp import CDPConnection, CDPError
+
+
+# Selenium special keys (Unicode private use area) as DevTools key events: (key, code, Windows virtual key code, text)
+_SPECIAL_KEYS: Dict[str, tuple] = {
+    Keys.CANCEL: ("Cancel", "Abort", 3, ""),
+    Keys.HELP: ("Help", "Help", 47, ""),
+    Keys.BACKSPACE: ("Backspace", "Backspace", 8, ""),
+    Keys.TAB: ("Tab", "Tab", 9, ""),
+    Keys.CLEAR: ("Clear", "", 12, ""),
+    Keys.RETURN: ("Enter", "Enter", 13, "\r"),
+    Keys.ENTER: ("Enter", "Enter", 13, "\r"),
+    Keys.PAUSE: ("Pause", "Pause", 19, ""),
+    Keys.ESCAPE: ("Escape", "Escape", 27, ""),
+    Keys.SPACE: (" ", "Space", 32, " "),
+    Keys.PAGE_UP: ("PageUp", "PageUp", 33, ""),
+    Keys.PAGE_DOWN: ("PageDown", "PageDown", 34, ""),
+    Keys.END: ("End", "End", 35, ""),
+    Keys.HOME: ("Home", "Home", 36, ""),
+    Keys.LEFT: ("ArrowLeft", "ArrowLeft", 37, ""),
+    Keys.UP: ("ArrowUp", "ArrowUp", 38, ""),
+    Keys.RIGHT: ("ArrowRight", "ArrowRight", 39, ""),
+    Keys.DOWN: ("ArrowDown", "ArrowDown", 40, ""),
+    Keys.INSERT: ("Insert", "Insert", 45, ""),
+    Keys.DELETE: ("Delete", "Delete", 46, ""),
+    Keys.SEMICOLON: (";", "Semicolon", 186, ";"),
+    Keys.EQUALS: ("=", "Equal", 187, "="),
+    Keys.MULTIPLY: ("*", "NumpadMultiply", 106, "*"),
+    Keys.ADD: ("+", "NumpadAdd", 107, "+"),
+    Keys.SEPARATOR: (",", "NumpadComma", 108, ","),
+    Keys.SUBTRACT: ("-", "NumpadSubtract", 109, "-"),
+    Keys.DECIMAL: (".", "NumpadDecimal", 110, "."),
+    Keys.DIVIDE: ("/", "NumpadDivide", 111, "/"),
+    **{getattr(Keys, f"NUMPAD{i}"): (str(i), f"Numpad{i}", 96 + i, str(i)) for i in range(10)},
+    **{getattr(Keys, f"F{i}"): (f"F{i}", f"F{i}", 111 + i, "") for i in range(1, 13)},
+}
+
+# Modifier keys stay pressed until pressed again, Keys.NULL or the end of the text: (modifier bit, key, code, virtual key code)
+_MODIFIER_KEYS: Dict[str, tuple] = {
+    Keys.ALT: (1, "Alt", "AltLeft", 18),
+    Keys.CONTROL: (2, "Control", "ControlLeft", 17),
+    Keys.META: (4, "Meta", "MetaLeft", 91),
+    Keys.SHIFT: (8, "Shift", "ShiftLeft", 16),
+}
+
+
+class AsyncTab:
+    """
+    Awaitable element helpers for one tab, driven over its own DevTools session.
+
+    Tabs do not need WebDriver focus, so helpers on different tabs progress concurrently on one event loop.
+    Clicks and typed text are dispatched as trusted input events through the `Input` domain.
+
+    Args:
+        browser (AsyncAdvanceSeleniumChrome): The facade owning this tab.
+        target_id (str): DevTools target id (also the WebDriver window handle).
+        session_id (str): Flattened DevTools session attached to the target.
+    """
+    def __init__(self, browser: "AsyncAdvanceSeleniumChrome", target_id: str, session_id: str):
+        self.browser        = browser
+        self.target_id      = target_id
+        self.session_id     = session_id
+        self._page_enabled  = False
+
+    def __repr__(self) -> str:
+        return f"AsyncTab({self.target_id!r}, url={self.url!r})"
+
+    @property
+    def url(self) -> str:
+        return self.browser.connection.targets.get(self.target_id, {}).get("url", "")
+
+    @property
+    def handle(self) -> str:
+        """The WebDriver window handle of this tab."""
+        return self.target_id
+
+    async def send(self, method: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> dict:
+        """Sends a DevTools command in this tab's session."""
+        future = self.browser.connection.send_async(method, params, self.session_id)
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.browser.connection.timeout)
+
+    async def evaluate(self, expression: str, timeout: float = 30) -> Any:
+        """
+        Evaluates a JavaScript expression in the page, awaiting it if it returns a promise.
+
+        Raises:
+            RuntimeError: If the expression throws.
+        """
+        result = await self.send("Runtime.evaluate", {"expression": expression, "awaitPromise": True, "returnByValue": True}, timeout=timeout + 5)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise RuntimeError(details.get("exception", {}).get("description") or details.get("text"))
+        return result.get("result", {}).get("value")
+
+    async def goto(self, url: str, timeout: float = 30) -> None:
+        """Navigates the tab to `url` and waits for the load event."""
+        if not self._page_enabled:
+            await self.send("Page.enable")
+            self._page_enabled = True
+        loaded = self.browser._event_future("Page.loadEventFired", self.session_id)
+        try:
+            result = await self.send("Page.navigate", {"url": url})
+            if result.get("errorText"):
+                raise RuntimeError(f"Navigation to {url} failed: {result['errorText']}")
+            await asyncio.wait_for(loaded, timeout)
+        finally:
+            loaded.cancel()
+
+    async def _element_point(self, selector: str, by: str, condition: str, timeout: float, focus: bool = False) -> dict:
+        try:
+            return await self.evaluate(scripts.expression(scripts.ELEMENT_POINT, by, selector, condition, int(timeout * 1000), focus), timeout=timeout)
+        except RuntimeError as e:
+            raise TimeoutError(f"Element '{selector}' not {condition}: {e}")
+
+    async def wait_for_element(self, selector: str, by: str = By.XPATH, timeout: float = 120, condition: str = "visible", suppress_error: bool = False) -> bool:
+        """
+        Wait for an element to meet the specified condition ("visible", "clickable" or "present").
+
+        Returns:
+            bool: True once the condition is met, or False if suppressed and failed.
+        """
+        if condition not in AdvanceSeleniumChrome._WAIT_CONDITIONS:
+            raise ValueError(f"Unsupported condition '{condition}'. Choose from 'visible', 'clickable', or 'present'.")
+        try:
+            await self._element_point(selector, by, condition, timeout)
+            return True
+        except (TimeoutError, asyncio.TimeoutError, CDPError):
+            if suppress_error:
+                return False
+            raise
+
+    async def _mouse_click(self, point: dict, click_count: int) -> None:
+        for clicks in range(1, click_count + 1):
+            for event_type in ("mousePressed", "mouseReleased"):
+                await self.send("Input.dispatchMouseEvent", {"type": event_type, "x": point["x"], "y": point["y"], "button": "left", "clickCount": clicks})
+
+    async def click_element(self, selector: str, by: str = By.XPATH, timeout: float = 15, suppress_error: bool = False) -> bool:
+        """Click on an element once it is clickable. Returns False if suppressed and failed."""
+        try:
+            await self._mouse_click(await self._element_point(selector, by, "clickable", timeout), 1)
+            return True
+        except (TimeoutError, asyncio.TimeoutError, CDPError):
+            if suppress_error:
+                return False
+            raise
+
+    async def double_click_element(self, selector: str, by: str = By.XPATH, timeout: float = 15, suppress_error: bool = False) -> bool:
+        """Double-click on an element once it is clickable. Returns False if suppressed and failed."""
+        try:
+            await self._mouse_click(await self._element_point(selector, by, "clickable", timeout), 2)
+            return True
+        except (TimeoutError, asyncio.TimeoutError, CDPError):
+            if suppress_error:
+                return False
+            raise
+
+    async def _type(self, text: str) -> None:
+        """
+        Types text into the focused element: plain text is inserted in one `Input.insertText` call, while special keys
+        (Keys.ENTER, Keys.TAB, ...) and text typed with a modifier held are dispatched as key events.
+        """
+        modifiers, pending = 0, ""
+        for char in text:
+            special = "\ue000" <= char <= "\uf8ff"
+            if not special and not modifiers:
+                pending += char
+                continue
+            if pending:
+                await self.send("Input.insertText", {"text": pending})
+                pending = ""
+            if char == Keys.NULL:
+                modifiers = await self._release_modifiers(modifiers)
+            elif char in _MODIFIER_KEYS:
+                bit, key, code, key_code = _MODIFIER_KEYS[char]
+                modifiers ^= bit
+                event_type = "rawKeyDown" if modifiers & bit else "keyUp"
+                await self.send("Input.dispatchKeyEvent", {"type": event_type, "key": key, "code": code, "windowsVirtualKeyCode": key_code, "modifiers": modifiers})
+            else:
+                if special:
+                    key, code, key_code, key_text = _SPECIAL_KEYS[char]
+                else:
+                    key, key_text = char, char
+                    code = f"Key{char.upper()}" if char.isascii() and char.isalpha() else (f"Digit{char}" if char.isdigit() else "")
+                    key_code = ord(char.upper()) if char.isascii() and char.isalnum() else 0
+                if modifiers & 7:
+                    key_text = ""  # shortcuts (Ctrl+A, ...) type no text
+                params = {"key": key, "code": code, "windowsVirtualKeyCode": key_code, "modifiers": modifiers}
+                await self.send("Input.dispatchKeyEvent", dict(params, type="keyDown" if key_text else "rawKeyDown", text=key_text))
+                await self.send("Input.dispatchKeyEvent", dict(params, type="keyUp"))
+        if pending:
+            await self.send("Input.insertText", {"text": pending})
+        await self._release_modifiers(modifiers)
+
+    async def _release_modifiers(self, modifiers: int) -> int:
+        for bit, key, code, key_code in _MODIFIER_KEYS.values():
+            if modifiers & bit:
+                modifiers &= ~bit
+                await self.send("Input.dispatchKeyEvent", {"type": "keyUp", "key": key, "code": code, "windowsVirtualKeyCode": key_code, "modifiers": modifiers})
+        return modifiers
+
+    async def send_keys_to_element(self, selector: str, key: str, by: str = By.XPATH, timeout: float = 15, suppress_error: bool = False) -> bool:
+        """
+        Focus an element and type text into it. Selenium special keys (Keys.ENTER, Keys.TAB, ...) and modifiers
+        (Keys.SHIFT, Keys.CONTROL, ... released by Keys.NULL) are sent as trusted key events. Returns False if suppressed and failed.
+
+        Raises:
+            ValueError: If the text contains a special key without a DevTools equivalent.
+        """
+        text = str(key)
+        unsupported = {char for char in text if "\ue000" <= char <= "\uf8ff" and char != Keys.NULL and char not in _SPECIAL_KEYS and char not in _MODIFIER_KEYS}
+        if unsupported:
+            raise ValueError(f"Unsupported special keys: {', '.join(f'U+{ord(char):04X}' for char in sorted(unsupported))}")
+        try:
+            await self._element_point(selector, by, "present", timeout, focus=True)
+            await self._type(text)
+            return True
+        except (TimeoutError, asyncio.TimeoutError, CDPError):
+            if suppress_error:
+                return False
+            raise
+
+    async def select_value(self, selector: str, value, by: str = By.XPATH, timeout: float = 15, select_by: Literal["index", "value", "visible text"] = "value", suppress_error: bool = False) -> bool:
+        """Select a value from a dropdown element. Returns False if suppressed and failed."""
+        if select_by not in ["index", "value", "visible text"]:
+            raise ValueError(f"Invalid `select_by` value: {select_by}")
+        action = {"selector": selector, "by": by, "action": "select", "value": value, "select_by": select_by}
+        result = (await self.evaluate(scripts.expression(scripts.RUN_ACTIONS, [action], int(timeout * 1000)), timeout=timeout))[0]
+        if not result["ok"] and not suppress_error:
+            raise RuntimeError(f"Selecting {select_by} '{value}' in '{selector}' failed: {result['error']}")
+        return result["ok"]
+
+    async def scroll(self, move: Literal["Top", "Up", "Down", "Bottom"]) -> None:
+        """Scroll the page in the specified direction (see `AdvanceSeleniumChrome.scroll`)."""
+        if move not in AdvanceSeleniumChrome._SCROLL_SCRIPTS:
+            raise ValueError("Invalid value for move. Use 'Up', 'Down', 'Top' or 'Bottom'.")
+        await self.evaluate(AdvanceSeleniumChrome._SCROLL_SCRIPTS[move])
+
+    async def close(self) -> None:
+        """Closes the tab."""
+        await asyncio.wrap_future(self.browser.connection.send_async("Target.closeTarget", {"targetId": self.target_id}))
+
+
+class AsyncAdvanceSeleniumChrome:
+    """
+    An asyncio facade over an AdvanceSeleniumChrome instance for driving many tabs concurrently.
+
+    All tabs are driven over per-target sessions of the driver's single DevTools connection, so awaiting helpers
+    on several tabs (e.g. with `asyncio.gather`) lets them progress concurrently on one event loop.
+
+    Example:
+        browser = AsyncAdvanceSeleniumChrome(AdvanceSeleniumChrome(headless=True))
+        tabs = await asyncio.gather(*(browser.new_tab(url) for url in urls))
+        await asyncio.gather(*(tab.click_element("//button") for tab in tabs))
+
+    Args:
+        driver (AdvanceSeleniumChrome): The driver whose browser is controlled.
+    """
+    def __init__(self, driver: AdvanceSeleniumChrome):
+        self.driver                 = driver
+        self._tabs                  : Dict[str, AsyncTab] = {}
+        self._attach_waiters        : Dict[str, List[asyncio.Future]] = {}
+        self._attach_subscribed     = False
+
+    @property
+    def connection(self) -> CDPConnection:
+        return self.driver.cdp
+
+    def _event_future(self, event: str, session_id: Optional[str]) -> asyncio.Future:
+        """Returns a future resolved with the params of the next `event` in `session_id`."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        connection = self.connection
+
+        def handler(params: dict, event_session_id: Optional[str]) -> None:
+            if event_session_id == session_id:
+                connection.off(event, handler)
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(params))
+
+        connection.on(event, handler)
+        future.add_done_callback(lambda _: connection.off(event, handler))
+        return future
+
+    def _on_attached(self, session_id: str, target_info: dict) -> None:
+        for future in self._attach_waiters.pop(target_info["targetId"], []):
+            future.get_loop().call_soon_threadsafe(lambda f=future: f.done() or f.set_result(session_id))
+
+    async def _session(self, target_id: str, timeout: Optional[float] = None) -> str:
+        connection = self.connection
+        if not self._attach_subscribed:
+            self._attach_subscribed = True
+            await asyncio.get_running_loop().run_in_executor(None, connection.on_page_attached, self._on_attached)
+        if target_id in connection.sessions:
+            return connection.sessions[target_id]
+        future = asyncio.get_running_loop().create_future()
+        self._attach_waiters.setdefault(target_id, []).append(future)
+        # The target may have been attached between the check above and registering the waiter
+        if target_id in connection.sessions:
+            return connection.sessions[target_id]
+        return await asyncio.wait_for(future, timeout or connection.timeout)
+
+    async def tab(self, target_id: str) -> AsyncTab:
+        """Returns the tab with the given target id (window handle)."""
+        if target_id not in self._tabs or self._tabs[target_id].session_id != self.connection.sessions.get(target_id):
+            self._tabs[target_id] = AsyncTab(self, target_id, await self._session(target_id))
+        return self._tabs[target_id]
+
+    async def tabs(self) -> List[AsyncTab]:
+        """Returns all open tabs."""
+        return [await self.tab(tab.target_id) for tab in self.driver.tab_index.tabs]
+
+    async def new_tab(self, url: str = "about:blank", wait_for_load: bool = True, timeout: float = 30) -> AsyncTab:
+        """Opens a new tab, optionally waiting for `url` to load."""
+        result = await asyncio.wrap_future(self.connection.send_async("Target.createTarget", {"url": "about:blank"}))
+        tab = await self.tab(result["targetId"])
+        if url != "about:blank":
+            if wait_for_load:
+                await tab.goto(url, timeout=timeout)
+            else:
+                await tab.send("Page.navigate", {"url": url})
+        return tab
+
+    async def switch_to_tab_with_url(self, target_url: str, new_tab_url: Optional[str] = None, match: Literal["contains", "prefix", "exact", "regex"] = "contains") -> Optional[AsyncTab]:
+        """
+        Returns the tab whose URL matches `target_url`, or opens `new_tab_url` (reusing an empty tab if there is one).
+        Unlike `AdvanceSeleniumChrome.switch_to_tab_with_url` this does not move WebDriver focus.
+        """
+        index = self.driver.tab_index
+        found = index.find(target_url, match=match)
+        if found:
+            return await self.tab(found.target_id)
+        if not new_tab_url:
+            return None
+        empty = index.find_empty()
+        if empty:
+            tab = await self.tab(empty.target_id)
+            await tab.goto(new_tab_url)
+            return tab
+        return await self.new_tab(new_tab_url)
+
+    async def close_tab(self, tab: AsyncTab) -> None:
+        """Closes a tab."""
+        await tab.close()
+        self._tabs.pop(tab.target_id, None)
@@ -0,0 +1,350 @@
+import json
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from itertools import count
+from queue import Queue
+from threading import Condition, Event, Lock, Thread, current_thread
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import requests
+import websocket
+
+
+class CDPError(RuntimeError):
+    """Raised when a DevTools command returns an error or the connection is lost."""
+
+
+class CDPConnection:
+    """
+    A single long-lived DevTools websocket connection to a browser.
+
+    Commands can be sent from any thread and are multiplexed over the one socket; responses are matched
+    by id on a reader thread. Events are dispatched to subscribers on a separate dispatcher thread, so
+    handlers may themselves send commands. Page targets are auto-attached as flattened sessions, which
+    lets callers run commands in, and receive events from, every tab over the same connection.
+
+    Args:
+        ws_url (str): Browser websocket debugger URL (e.g. `ws://127.0.0.1:9222/devtools/browser/<id>`).
+        timeout (float): Default timeout in seconds for commands.
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(self, ws_url: str, timeout: float = 10, debug: bool = False):
+        self.ws_url             = ws_url
+        self.timeout            = timeout
+        self.debug              = debug
+        self.sessions           : Dict[str, str] = {}   # targetId -> sessionId of attached pages
+        self.targets            : Dict[str, dict] = {}  # targetId -> TargetInfo of attached pages
+        self._ws                = None
+        self._ids               = count(1)
+        self._pending           : Dict[int, Future] = {}
+        self._handlers          : Dict[str, List[Callable[[dict, Optional[str]], None]]] = {}
+        self._attach_callbacks  : List[Callable[[str, dict], None]] = []
+        self._send_lock         = Lock()
+        self._state_lock        = Lock()
+        self._events            = Queue()
+        self._auto_attached     = False
+        self._attached          = Condition()
+        self.closed             = True
+
+    @classmethod
+    def from_debugger_address(cls, debugger_address: str, **kwargs: Any) -> "CDPConnection":
+        """Creates a connection from a `host:port` debugger address by reading `/json/version` once."""
+        response = requests.get(f"http://{debugger_address}/json/version", timeout=kwargs.get("timeout", 10))
+        response.raise_for_status()
+        return cls(response.json()["webSocketDebuggerUrl"], **kwargs)
+
+    def start(self) -> "CDPConnection":
+        """Opens the websocket and starts the reader and dispatcher threads."""
+        if not self.closed:
+            return self
+        # Chrome rejects websocket connections carrying an Origin header unless --remote-allow-origins is set
+        self._ws = websocket.create_connection(self.ws_url, timeout=self.timeout, suppress_origin=True, enable_multithread=True)
+        self._ws.settimeout(None)
+        self.closed = False
+        Thread(target=self._read_loop, name="cdp-reader", daemon=True).start()
+        Thread(target=self._dispatch_loop, name="cdp-dispatcher", daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        """Closes the connection and fails all pending commands."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+        self._fail_pending(CDPError("DevTools connection closed."))
+        self._events.put(None)
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._state_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _read_loop(self) -> None:
+        while not self.closed:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception as e:
+                if not self.closed:
+                    print(f"DevTools connection lost: {e}") if self.debug else None
+                    self.closed = True
+                    self._fail_pending(CDPError(f"DevTools connection lost: {e}"))
+                    self._events.put(None)
+                return
+            if "id" in message:
+                with self._state_lock:
+                    future = self._pending.pop(message["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(CDPError(f"{message['error'].get('message')} ({message['error'].get('code')})"))
+                else:
+                    future.set_result(message.get("result", {}))
+            else:
+                self._events.put(message)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            message = self._events.get()
+            if message is None:
+                return
+            if isinstance(message, Event):
+                message.set()
+                continue
+            for handler in list(self._handlers.get(message.get("method"), [])):
+                try:
+                    handler(message.get("params", {}), message.get("sessionId"))
+                except Exception as e:
+                    print(f"Error in DevTools event handler for {message.get('method')}: {e}") if self.debug else None
+
+    def flush_events(self, timeout: Optional[float] = None) -> None:
+        """Waits until every event received so far has been dispatched to its handlers."""
+        if self.closed or current_thread().name == "cdp-dispatcher":
+            return
+        barrier = Event()
+        self._events.put(barrier)
+        barrier.wait(self.timeout if timeout is None else timeout)
+
+    def send_async(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None) -> Future:
+        """Sends a command without waiting and returns a Future resolving to its result."""
+        if self.closed:
+            raise CDPError("DevTools connection is closed.")
+        message_id = next(self._ids)
+        future = Future()
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        with self._state_lock:
+            self._pending[message_id] = future
+        try:
+            with self._send_lock:
+                self._ws.send(json.dumps(message))
+        except Exception as e:
+            with self._state_lock:
+                self._pending.pop(message_id, None)
+            raise CDPError(f"Could not send {method}: {e}")
+        return future
+
+    def send(self, method: str, params: Optional[dict] = None, session_id: Optional[str] = None, timeout: Optional[float] = None) -> dict:
+        """
+        Sends a command and waits for its result.
+
+        Args:
+            method (str): DevTools method, e.g. `Target.getTargets`.
+            params (Optional[dict]): Command parameters.
+            session_id (Optional[str]): Session to run the command in (None for the browser target).
+            timeout (Optional[float]): Maximum time to wait in seconds (defaults to the connection timeout).
+
+        Raises:
+            CDPError: If the command fails, times out or the connection is lost.
+        """
+        future = self.send_async(method, params, session_id)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            raise CDPError(f"Timed out waiting for {method}.")
+
+    def on(self, event: str, handler: Callable[[dict, Optional[str]], None]) -> None:
+        """Subscribes `handler(params, session_id)` to a DevTools event."""
+        self._handlers.setdefault(event, []).append(handler)
+
+    def off(self, event: str, handler: Callable[[dict, Optional[str]], None]) -> None:
+        """Unsubscribes a handler previously registered with `on`."""
+        if handler in self._handlers.get(event, []):
+            self._handlers[event].remove(handler)
+
+    def session_for(self, target_id: str) -> Optional[str]:
+        """Returns the session id attached to a page target, if any."""
+        return self.sessions.get(target_id)
+
+    def on_page_attached(self, callback: Callable[[str, dict], None]) -> None:
+        """
+        Calls `callback(session_id, target_info)` for every page target: immediately for pages already
+        attached, and for new pages before they start running (so setup such as request interception
+        applies to their first request).
+        """
+        self._attach_callbacks.append(callback)
+        for target_id, session_id in list(self.sessions.items()):
+            callback(session_id, self.targets[target_id])
+        self.enable_auto_attach()
+
+    def off_page_attached(self, callback: Callable[[str, dict], None]) -> None:
+        """Stops calling a callback previously registered with `on_page_attached` for new pages."""
+        if callback in self._attach_callbacks:
+            self._attach_callbacks.remove(callback)
+
+    def enable_auto_attach(self) -> None:
+        """Enables target discovery and flattened auto-attach to page targets (idempotent)."""
+        if self._auto_attached:
+            return
+        self._auto_attached = True
+        self.on("Target.attachedToTarget", self._on_attached)
+        self.on("Target.detachedFromTarget", self._on_detached)
+        self.on("Target.targetInfoChanged", self._on_target_info_changed)
+        self.send("Target.setDiscoverTargets", {"discover": True})
+        pages = {target["targetId"] for target in self.send("Target.getTargets")["targetInfos"] if target.get("type") == "page"}
+        self.send("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True})
+        # Existing pages are reported through attachedToTarget events; make sure they are registered on return
+        if current_thread().name != "cdp-dispatcher":
+            with self._attached:
+                self._attached.wait_for(lambda: pages.issubset(self.sessions) or self.closed, timeout=self.timeout)
+
+    def _on_attached(self, params: dict, _session_id: Optional[str]) -> None:
+        session_id, target_info = params["sessionId"], params["targetInfo"]
+        if target_info.get("type") == "page":
+            self.sessions[target_info["targetId"]] = session_id
+            self.targets[target_info["targetId"]] = target_info
+            with self._attached:
+                self._attached.notify_all()
+            for callback in list(self._attach_callbacks):
+                try:
+                    callback(session_id, target_info)
+                except Exception as e:
+                    print(f"Error setting up DevTools session for {target_info.get('url')}: {e}") if self.debug else None
+        if params.get("waitingForDebugger"):
+            self.send_async("Runtime.runIfWaitingForDebugger", session_id=session_id)
+
+    def _on_detached(self, params: dict, _session_id: Optional[str]) -> None:
+        for target_id, session_id in list(self.sessions.items()):
+            if session_id == params.get("sessionId"):
+                self.sessions.pop(target_id, None)
+                self.targets.pop(target_id, None)
+
+    def _on_target_info_changed(self, params: dict, _session_id: Optional[str]) -> None:
+        target_info = params["targetInfo"]
+        if target_info["targetId"] in self.targets:
+            self.targets[target_info["targetId"]] = target_info
+
+
+class CrashMonitor:
+    """
+    Recovers crashed tabs as soon as DevTools reports the crash, without polling.
+
+    Subscribes to `Target.targetCrashed` and to `Inspector.targetCrashed` of every attached page, and
+    tracks `Target.targetDestroyed` to forget closed tabs. A crashed tab is replaced by a new tab opened
+    at the same URL and then closed.
+
+    Args:
+        connection (CDPConnection): Started browser connection.
+        on_recovered (Optional[Callable[[str, str], None]]): Called with (crashed target id, new target id) after recovery.
+        ignored (Optional[Set[str]]): Target ids left alone because their owner replaces them itself (e.g. crawl tabs);
+            the set is shared, not copied, so owners can add and remove ids while the monitor runs.
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(self, connection: CDPConnection, on_recovered: Optional[Callable[[str, str], None]] = None, ignored: Optional[Set[str]] = None, debug: bool = False):
+        self.connection     = connection
+        self.on_recovered   = on_recovered
+        self.ignored        = ignored if ignored is not None else set()
+        self.debug          = debug
+        self.urls           : Dict[str, str] = {}   # last known URL of every page target
+        self.recovered      = 0
+        self._handling      = set()
+        self._done          = set()  # crashes are reported by both Target and Inspector events; recover once
+        self._lock          = Lock()
+
+    def start(self) -> "CrashMonitor":
+        """Subscribes to crash events and recovers tabs that had already crashed before the monitor started."""
+        connection = self.connection
+        connection.on("Target.targetCreated", self._on_target_info)
+        connection.on("Target.targetInfoChanged", self._on_target_info)
+        connection.on("Target.targetDestroyed", self._on_target_destroyed)
+        connection.on("Target.targetCrashed", lambda params, _: self.recover(params["targetId"]))
+        connection.on("Inspector.targetCrashed", self._on_inspector_crashed)
+        for target in connection.send("Target.getTargets")["targetInfos"]:
+            if target.get("type") == "page":
+                self.urls[target["targetId"]] = target.get("url", "")
+        connection.on_page_attached(lambda session_id, _: connection.send_async("Inspector.enable", session_id=session_id))
+        self.sweep()
+        return self
+
+    def sweep(self, timeout: float = 5) -> List[str]:
+        """
+        Checks all attached tabs at once by evaluating a trivial expression in each over the shared
+        connection; tabs whose renderer answers with an error (e.g. "Target crashed") are recovered.
+        Used once at start-up to catch tabs that crashed before the monitor was listening.
+
+        Returns:
+            List[str]: Target ids of the recovered tabs.
+        """
+        probes = {
+            target_id: self.connection.send_async("Runtime.evaluate", {"expression": "1", "returnByValue": True}, session_id)
+            for target_id, session_id in list(self.connection.sessions.items())
+        }
+        crashed = []
+        for target_id, probe in probes.items():
+            try:
+                probe.result(timeout=timeout)
+            except CDPError:
+                crashed.append(target_id)
+            except FutureTimeoutError:
+                print(f"Tab {target_id} is busy, skipping crash check.") if self.debug else None
+        for target_id in crashed:
+            self.recover(target_id)
+        return crashed
+
+    def _on_target_info(self, params: dict, _session_id: Optional[str]) -> None:
+        target_info = params["targetInfo"]
+        if target_info.get("type") == "page":
+            self.urls[target_info["targetId"]] = target_info.get("url", "")
+
+    def _on_target_destroyed(self, params: dict, _session_id: Optional[str]) -> None:
+        self.urls.pop(params["targetId"], None)
+        with self._lock:
+            # Both crash events arrive before the crashed tab is closed, so a recovered id is not needed any more
+            self._done.discard(params["targetId"])
+
+    def _on_inspector_crashed(self, _params: dict, session_id: Optional[str]) -> None:
+        for target_id, attached_session in list(self.connection.sessions.items()):
+            if attached_session == session_id:
+                self.recover(target_id)
+
+    def recover(self, target_id: str) -> Optional[str]:
+        """Replaces a crashed tab with a new tab at the same URL and closes the crashed one."""
+        with self._lock:
+            if target_id in self._handling or target_id in self._done or target_id in self.ignored:
+                return None
+            self._handling.add(target_id)
+        try:
+            url = self.urls.get(target_id) or "about:blank"
+            print(f"Crashed tab detected: {url}")
+            new_target_id = self.connection.send("Target.createTarget", {"url": url})["targetId"]
+            print(f"Opened new tab with URL: {url}") if self.debug else None
+            try:
+                self.connection.send("Target.closeTarget", {"targetId": target_id})
+                print("Closed crashed tab.") if self.debug else None
+            except CDPError:
+                pass  # Already gone
+            self.recovered += 1
+            self._done.add(target_id)
+            if self.on_recovered:
+                self.on_recovered(target_id, new_target_id)
+            return new_target_id
+        except CDPError as e:
+            print(f"Could not recover crashed tab {target_id}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._handling.discard(target_id)
@@ -0,0 +1,186 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .async_chrome import AsyncAdvanceSeleniumChrome, AsyncTab
+from .cdp import CDPError
+
+
+@dataclass
+class CrawlResult:
+    """The outcome of crawling one URL."""
+    url         : str
+    value       : Any = None
+    error       : Optional[str] = None
+    elapsed     : float = 0.0
+    attempts    : int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_DONE = object()
+
+
+class CrawlEngine:
+    """
+    Crawls URLs in a bounded number of concurrently loading tabs and streams results in completion order.
+
+    Each worker owns one tab and reuses it for every URL it processes. URLs are pulled from the input iterable
+    lazily and results are handed over through a bounded buffer, so a slow consumer stalls the workers instead
+    of letting results pile up (backpressure). A failed URL is retried up to `retries` times: in a fresh tab if
+    its tab crashed or stopped responding, otherwise in the same tab once its load is stopped and it is reset to
+    about:blank. The driver's crash monitor leaves the crawl's tabs alone, since the crawl replaces them itself.
+
+    Args:
+        driver: The AdvanceSeleniumChrome instance whose browser is used.
+        concurrency (int): Number of tabs in flight.
+        timeout (float): Per-URL timeout in seconds, covering navigation and extraction.
+        retries (int): Number of retries for a URL after a timeout, crash or navigation error.
+        buffer_size (Optional[int]): Maximum number of finished results waiting for the consumer (default is 2 * concurrency).
+        close_tabs (bool): Whether to close the crawl's tabs when it finishes.
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(self, driver, concurrency: int = 4, timeout: float = 30, retries: int = 1, buffer_size: Optional[int] = None, close_tabs: bool = True, debug: bool = False):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        self.driver         = driver
+        self.concurrency    = concurrency
+        self.timeout        = timeout
+        self.retries        = retries
+        self.buffer_size    = buffer_size or 2 * concurrency
+        self.close_tabs     = close_tabs
+        self.debug          = debug
+        self.stats          = {"pages": 0, "errors": 0, "retries": 0, "tabs_recreated": 0, "elapsed": 0.0, "pages_per_second": 0.0}
+        self._stop          = Event()
+
+    async def _process(self, tab: AsyncTab, url: str, extract: Callable[[AsyncTab], Any]) -> Any:
+        await tab.goto(url, timeout=self.timeout)
+        value = extract(tab)
+        return await value if inspect.isawaitable(value) else value
+
+    async def _is_alive(self, tab: AsyncTab) -> bool:
+        try:
+            await tab.send("Runtime.evaluate", {"expression": "1"}, timeout=2)
+            return True
+        except (CDPError, asyncio.TimeoutError):
+            return False
+
+    async def _reset(self, tab: AsyncTab) -> bool:
+        """Stops a load still in progress (e.g. after a timeout) and leaves the tab on about:blank."""
+        try:
+            await tab.send("Page.stopLoading", timeout=2)
+            await tab.goto("about:blank", timeout=5)
+            return True
+        except (CDPError, RuntimeError, asyncio.TimeoutError):
+            return False
+
+    async def _new_tab(self, browser: AsyncAdvanceSeleniumChrome, tabs: list) -> AsyncTab:
+        tab = await browser.new_tab()
+        tabs.append(tab)
+        self.driver._self_managed_tabs.add(tab.target_id)
+        return tab
+
+    async def _close_tab(self, browser: AsyncAdvanceSeleniumChrome, tab: AsyncTab, tabs: list) -> None:
+        tabs.remove(tab)
+        self.driver._self_managed_tabs.discard(tab.target_id)
+        try:
+            await browser.close_tab(tab)
+        except CDPError:
+            pass
+
+    async def _worker(self, browser: AsyncAdvanceSeleniumChrome, urls: Iterator[str], extract: Callable[[AsyncTab], Any], results: Queue, tabs: list) -> None:
+        loop = asyncio.get_running_loop()
+        tab = await self._new_tab(browser, tabs)
+        for url in urls:
+            if self._stop.is_set():
+                break
+            started, attempts = perf_counter(), 0
+            while True:
+                attempts += 1
+                try:
+                    result = CrawlResult(url, value=await asyncio.wait_for(self._process(tab, url, extract), self.timeout))
+                    break
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    if not await self._is_alive(tab) or not await self._reset(tab):
+                        # Crashed or hung renderer: replace the tab rather than reusing it
+                        print(f"Recreating tab after failure on {url}: {error}") if self.debug else None
+                        await self._close_tab(browser, tab, tabs)
+                        tab = await self._new_tab(browser, tabs)
+                        self.stats["tabs_recreated"] += 1
+                    if attempts > self.retries or self._stop.is_set():
+                        result = CrawlResult(url, error=error)
+                        break
+                    self.stats["retries"] += 1
+            result.elapsed, result.attempts = perf_counter() - started, attempts
+            self.stats["pages"] += 1
+            self.stats["errors"] += 0 if result.ok else 1
+            # Blocks while the consumer's buffer is full, so no further URLs are pulled (backpressure)
+            await loop.run_in_executor(None, results.put, result)
+
+    async def _crawl(self, urls: Iterable[str], extract: Callable[[AsyncTab], Any], results: Queue) -> None:
+        browser = AsyncAdvanceSeleniumChrome(self.driver)
+        url_iterator = iter(urls)  # shared by all workers; the event loop is single-threaded so no lock is needed
+        tabs = []
+        try:
+            await asyncio.gather(*(self._worker(browser, url_iterator, extract, results, tabs) for _ in range(self.concurrency)))
+        finally:
+            for tab in list(tabs):
+                self.driver._self_managed_tabs.discard(tab.target_id)  # tabs left open are the crash monitor's again
+                if self.close_tabs:
+                    try:
+                        await browser.close_tab(tab)
+                    except Exception:
+                        pass
+
+    def run(self, urls: Iterable[str], extract: Callable[[AsyncTab], Any]) -> Iterator[CrawlResult]:
+        """
+        Crawls `urls`, calling `extract(tab)` on each loaded page, and yields results as they complete.
+
+        Args:
+            urls (Iterable[str]): URLs to crawl; consumed lazily, so it may be a generator.
+            extract (Callable[[AsyncTab], Any]): Extraction function, sync or async, called with the loaded tab.
+
+        Yields:
+            CrawlResult: One result per URL, in completion order.
+        """
+        results = Queue(maxsize=self.buffer_size)
+        self._stop.clear()
+        started = perf_counter()
+
+        def run_loop() -> None:
+            try:
+                asyncio.run(self._crawl(urls, extract, results))
+            except BaseException as e:
+                results.put(e)
+            results.put(_DONE)
+
+        thread = Thread(target=run_loop, name="asc-crawl", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                self.stats["elapsed"] = perf_counter() - started
+                self.stats["pages_per_second"] = self.stats["pages"] / self.stats["elapsed"] if self.stats["elapsed"] else 0.0
+                yield item
+        finally:
+            # Stop the workers and unblock any of them waiting on a full buffer
+            self._stop.set()
+            while thread.is_alive():
+                try:
+                    results.get(timeout=0.1)
+                except Empty:
+                    pass
+            self.stats["elapsed"] = perf_counter() - started
+            self.stats["pages_per_second"] = self.stats["pages"] / self.stats["elapsed"] if self.stats["elapsed"] else 0.0
+            print(f"Crawled {self.stats['pages']} pages at {self.stats['pages_per_second']:.2f} pages/s") if self.debug else None
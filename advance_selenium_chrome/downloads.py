@@ -0,0 +1,294 @@
+import hashlib
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock, Semaphore, Timer
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Union
+
+from .cdp import CDPConnection, CDPError
+
+
+_CHUNK = 1024 * 1024
+
+
+@dataclass
+class Download:
+    """A finished download."""
+    url         : str
+    path        : Path
+    size        : int
+    digest      : str
+    elapsed     : float
+    guid        : str = ""
+
+
+@dataclass
+class _Tracked:
+    future          : Future
+    directory       : Path
+    url             : str = ""
+    filename        : str = ""
+    started         : float = 0.0
+    frame_id        : Optional[str] = None
+    url_contains    : Optional[str] = None
+    timer           : Optional[Timer] = None
+    limited         : bool = False  # holds one of the `max_concurrent` slots
+
+
+class DownloadManager:
+    """
+    Tracks downloads through DevTools events instead of polling the download directory.
+
+    Downloads are saved under a staging directory with `Browser.setDownloadBehavior` ("allowAndName") and followed
+    through `Browser.downloadWillBegin` and `Browser.downloadProgress`. Once one completes it is moved into its target
+    directory under its suggested filename and hashed in chunks (in one pass with the copy if it has to cross
+    filesystems), and its future resolves with a Download.
+
+    Args:
+        connection (CDPConnection): Started browser connection.
+        directory (Path): Default directory for finished downloads.
+        max_concurrent (Optional[int]): Maximum number of downloads started through `download` running at once.
+        hash_algorithm (str): hashlib algorithm for `Download.digest`.
+        on_progress (Optional[Callable[[str, int, int], None]]): Called with (guid, received bytes, total bytes).
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(
+        self,
+        connection      : CDPConnection,
+        directory       : Union[Path, str],
+        max_concurrent  : Optional[int]     = None,
+        hash_algorithm  : str               = "sha256",
+        on_progress     : Optional[Callable[[str, int, int], None]] = None,
+        debug           : bool              = False
+    ):
+        hashlib.new(hash_algorithm)  # fail early on unknown algorithms
+        self.connection     = connection
+        self.directory      = Path(directory)
+        self.staging        = self.directory / ".incoming"
+        self.max_concurrent = max_concurrent
+        self.hash_algorithm = hash_algorithm
+        self.on_progress    = on_progress
+        self.debug          = debug
+        self._active        : Dict[str, _Tracked] = {}  # guid -> download in progress
+        self._by_frame      : Dict[str, _Tracked] = {}  # frame (= target) id -> download started by `download`
+        self._expected      : List[_Tracked] = []
+        self._queued        : List[_Tracked] = []  # started by `download`, waiting for the launcher or a free slot
+        self._launching     : List[_Tracked] = []  # started by `download`, tab not created yet
+        self._slots         = Semaphore(max_concurrent) if max_concurrent else None
+        self._launcher      = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asc-download-launcher")
+        self._finisher      = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asc-download")
+        self._lock          = Lock()
+        self._started       = False
+        self._closed        = False
+
+    def start(self) -> "DownloadManager":
+        if not self._started:
+            self._started = True
+            self.staging.mkdir(parents=True, exist_ok=True)
+            self.connection.on("Browser.downloadWillBegin", self._on_will_begin)
+            self.connection.on("Browser.downloadProgress", self._on_progress)
+            self.connection.send("Browser.setDownloadBehavior", {"behavior": "allowAndName", "downloadPath": str(self.staging.resolve()), "eventsEnabled": True})
+        return self
+
+    def expect(self, directory: Optional[Union[Path, str]] = None, url_contains: Optional[str] = None, timeout: Optional[float] = 60) -> Future:
+        """
+        Returns a future for the next download the page starts (e.g. by a click made after this call).
+
+        Args:
+            directory (Optional[Union[Path, str]]): Where to put the file (default is the manager's directory).
+            url_contains (Optional[str]): Only claim a download whose URL contains this text.
+            timeout (Optional[float]): Seconds to wait for the download to begin before the future fails with TimeoutError.
+        """
+        tracked = _Tracked(Future(), Path(directory or self.directory), url_contains=url_contains)
+        with self._lock:
+            if self._closed:
+                tracked.future.set_exception(RuntimeError("The download manager is closed."))
+                return tracked.future
+            self._expected.append(tracked)
+        self._arm_timeout(tracked, timeout)
+        return tracked.future
+
+    def download(self, url: str, directory: Optional[Union[Path, str]] = None, timeout: Optional[float] = 60) -> Future:
+        """
+        Downloads `url` in a background tab, waiting for a free slot if `max_concurrent` downloads are running.
+        The URL has to be served as a download (e.g. with `Content-Disposition: attachment`).
+
+        Returns:
+            Future: Resolves with a Download, or fails with TimeoutError if the download does not begin in time.
+        """
+        tracked = _Tracked(Future(), Path(directory or self.directory), url=url)
+        with self._lock:
+            if self._closed:
+                tracked.future.set_exception(RuntimeError("The download manager is closed."))
+                return tracked.future
+            self._queued.append(tracked)
+            self._launcher.submit(self._launch, tracked, timeout)
+        return tracked.future
+
+    def _launch(self, tracked: _Tracked, timeout: Optional[float]) -> None:
+        # Waits in short steps, so a closed manager never leaves this thread parked on the semaphore
+        if self._slots is not None:
+            while not self._slots.acquire(timeout=0.1):
+                if self._closed:
+                    return  # already failed by close
+        with self._lock:
+            if self._closed:
+                if self._slots is not None:
+                    self._slots.release()
+                return
+            self._queued.remove(tracked)
+            tracked.limited = self._slots is not None
+            self._launching.append(tracked)
+        try:
+            target_id = self.connection.send("Target.createTarget", {"url": tracked.url, "background": True})["targetId"]
+            with self._lock:
+                if tracked in self._launching:  # not begun yet, so later matched by frame (a tab's main frame id is its target id)
+                    self._launching.remove(tracked)
+                    self._by_frame[target_id] = tracked
+                tracked.frame_id = target_id
+            if tracked.started or tracked.future.done():  # begun already, or failed by close while the tab opened
+                self._close_tab(tracked)
+            if not tracked.future.done():
+                self._arm_timeout(tracked, timeout)
+        except CDPError as e:
+            self._fail(tracked, e)
+
+    def _arm_timeout(self, tracked: _Tracked, timeout: Optional[float]) -> None:
+        if timeout is None:
+            return
+        tracked.timer = Timer(timeout, lambda: tracked.started or self._fail(tracked, TimeoutError(f"Download did not begin within {timeout} seconds.")))
+        tracked.timer.daemon = True
+        tracked.timer.start()
+
+    def _release(self, tracked: _Tracked) -> None:
+        if tracked.timer is not None:
+            tracked.timer.cancel()
+        with self._lock:
+            for pending in (self._expected, self._launching):
+                if tracked in pending:
+                    pending.remove(tracked)
+        self._close_tab(tracked)
+        if tracked.limited:
+            tracked.limited = False
+            self._slots.release()
+
+    def _close_tab(self, tracked: _Tracked) -> None:
+        """Closes the background tab a download was started in; the download itself continues."""
+        with self._lock:
+            frame_id, tracked.frame_id = tracked.frame_id, None
+            if frame_id is None:
+                return
+            self._by_frame.pop(frame_id, None)
+        try:
+            self.connection.send_async("Target.closeTarget", {"targetId": frame_id})
+        except CDPError:
+            pass
+
+    def _fail(self, tracked: _Tracked, error: BaseException) -> None:
+        self._release(tracked)
+        if not tracked.future.done():
+            tracked.future.set_exception(error)
+
+    def _on_will_begin(self, params: dict, _session_id: Optional[str]) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            tracked = self._by_frame.get(params.get("frameId"))
+            if tracked is None:
+                tracked = next((launching for launching in self._launching if launching.url == params["url"]), None)
+                if tracked is not None:
+                    self._launching.remove(tracked)
+            if tracked is None:
+                tracked = next((expected for expected in self._expected if not expected.url_contains or expected.url_contains in params["url"]), None)
+                if tracked is not None:
+                    self._expected.remove(tracked)
+            if tracked is None:
+                tracked = _Tracked(Future(), self.directory)  # not awaited by anyone, but still moved and named
+            tracked.url, tracked.filename, tracked.started = params["url"], params.get("suggestedFilename") or params["guid"], perf_counter()
+            self._active[params["guid"]] = tracked
+        if tracked.timer is not None:
+            tracked.timer.cancel()
+        self._close_tab(tracked)
+        print(f"Download started: {tracked.filename} from {tracked.url}") if self.debug else None
+
+    def _on_progress(self, params: dict, _session_id: Optional[str]) -> None:
+        guid, state = params["guid"], params.get("state")
+        if self.on_progress:
+            self.on_progress(guid, int(params.get("receivedBytes", 0)), int(params.get("totalBytes", 0)))
+        if state not in ("completed", "canceled"):
+            return
+        with self._lock:
+            tracked = self._active.pop(guid, None)
+        if tracked is None:
+            return
+        if state == "canceled":
+            self._fail(tracked, RuntimeError(f"Download of {tracked.url} was canceled."))
+        else:
+            self._finisher.submit(self._finish, tracked, guid)
+
+    @staticmethod
+    def _reserve_path(directory: Path, filename: str) -> Path:
+        """Creates an empty file at a free name ("name (1).ext" and so on), so concurrent downloads never collide."""
+        path, counter = directory / filename, 1
+        while True:
+            try:
+                with open(path, "xb"):
+                    return path
+            except FileExistsError:
+                path = directory / f"{Path(filename).stem} ({counter}){Path(filename).suffix}"
+                counter += 1
+
+    def _finish(self, tracked: _Tracked, guid: str) -> None:
+        try:
+            tracked.directory.mkdir(parents=True, exist_ok=True)
+            source, destination = self.staging / guid, self._reserve_path(tracked.directory, Path(tracked.filename).name)
+            digest, size = hashlib.new(self.hash_algorithm), 0
+            try:
+                os.replace(str(source), str(destination))
+                moved = True
+            except OSError:
+                moved = False
+            if moved:
+                with open(destination, "rb") as file:
+                    for chunk in iter(lambda: file.read(_CHUNK), b""):
+                        digest.update(chunk)
+                        size += len(chunk)
+            else:
+                # Different filesystem: copy and hash in one pass
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    for chunk in iter(lambda: src.read(_CHUNK), b""):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                        size += len(chunk)
+                shutil.copystat(str(source), str(destination))
+                source.unlink()
+            result = Download(tracked.url, destination, size, digest.hexdigest(), perf_counter() - tracked.started, guid)
+        except Exception as e:
+            self._fail(tracked, e)
+            return
+        self._release(tracked)
+        print(f"Download finished: {result.path} ({result.size} bytes)") if self.debug else None
+        if not tracked.future.done():
+            tracked.future.set_result(result)
+
+    def cancel_all(self) -> None:
+        """Cancels downloads in progress."""
+        for guid in list(self._active):
+            try:
+                self.connection.send("Browser.cancelDownload", {"guid": guid})
+            except CDPError:
+                pass
+
+    def close(self) -> None:
+        """Fails every download that has not finished yet, so no future is left unresolved, and stops the workers."""
+        with self._lock:
+            self._closed = True
+            pending = self._queued + self._expected + self._launching + list(self._active.values()) + list(self._by_frame.values())
+            self._queued, self._active = [], {}
+        for tracked in pending:
+            self._fail(tracked, RuntimeError("The download manager is closed."))
+        self._launcher.shutdown(wait=False)
+        self._finisher.shutdown(wait=True)
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter, sleep, time
+from typing import Dict, Optional
+
+from psutil import pid_exists
+
+
+CACHE_DIR = Path(os.environ.get("ADVANCE_SELENIUM_CHROME_CACHE", Path.home() / ".cache" / "advance_selenium_chrome"))
+LOCK_STALE_AFTER = 90  # seconds after which a lock file without a readable owner is broken (below the lock timeout)
+
+# Timings of the last resolution in this process, in seconds.
+resolution_timings: Dict[str, float] = {}
+
+
+class _FileLock:
+    """
+    Minimal cross-platform inter-process lock based on exclusive creation of a lock file holding the owner's PID.
+    A lock whose owner is no longer running (e.g. killed while downloading) is broken right away.
+
+    Args:
+        path (Path): Path of the lock file.
+        timeout (float): Maximum time to wait for the lock in seconds.
+    """
+    def __init__(self, path: Path, timeout: float = 120):
+        self.path = path
+        self.timeout = timeout
+
+    def __enter__(self):
+        deadline = perf_counter() + self.timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if self._is_stale():
+                        self.path.unlink()
+                        continue
+                except FileNotFoundError:
+                    continue
+                if perf_counter() > deadline:
+                    raise TimeoutError(f"Timed out waiting for lock: {self.path}")
+                sleep(0.05)
+
+    def _is_stale(self) -> bool:
+        try:
+            owner = int(self.path.read_text() or 0)
+        except ValueError:
+            owner = 0
+        if owner and not pid_exists(owner):
+            return True
+        # Without a PID (the owner died between creating and writing the file), fall back to the file's age
+        return not owner and time() - self.path.stat().st_mtime > LOCK_STALE_AFTER
+
+    def __exit__(self, *exc):
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def get_installed_chrome_version() -> Optional[str]:
+    """Returns the locally installed Chrome version (e.g. '134.0.6998.89') without any network access."""
+    if sys.platform.startswith("win"):
+        commands = [
+            ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"],
+            ["reg", "query", r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon", "/v", "version"],
+        ]
+    elif sys.platform == "darwin":
+        commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        commands = [[name, "--version"] for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"\d+\.\d+\.\d+\.\d+", output)
+        if match:
+            return match.group(0)
+    return None
+
+
+def resolve_chrome_driver_path(cache_dir: Path = CACHE_DIR) -> Path:
+    """
+    Resolves the ChromeDriver executable matching the installed Chrome.
+
+    The resolved path is cached on disk keyed by the installed Chrome version, so after the first
+    successful resolution every process works fully offline. Concurrent callers are serialised by a
+    lock file, so only one of them hits the network while the others wait and then read the cache.
+    If the Chrome version cannot be detected nothing is cached, since a cached driver could not be
+    told apart from one matching an older Chrome after an upgrade.
+
+    Args:
+        cache_dir (Path): Directory holding the cache and lock files.
+
+    Returns:
+        Path: Path to the ChromeDriver executable.
+    """
+    resolution_timings.clear()
+    started = perf_counter()
+    chrome_version = get_installed_chrome_version()
+    resolution_timings["chrome_version_lookup"] = perf_counter() - started
+    if chrome_version is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = Path(ChromeDriverManager().install())
+        resolution_timings["download"] = resolution_timings["total"] = perf_counter() - started
+        return path
+    cache_file = cache_dir / "drivers.json"
+
+    def cached_path() -> Optional[Path]:
+        try:
+            path = Path(json.loads(cache_file.read_text())[chrome_version])
+        except (OSError, ValueError, KeyError):
+            return None
+        return path if path.exists() else None
+
+    path = cached_path()
+    if path is None:
+        with _FileLock(cache_dir / "drivers.lock"):
+            # Another process may have resolved it while we were waiting for the lock
+            path = cached_path()
+            if path is None:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = Path(ChromeDriverManager().install())
+                try:
+                    cache = json.loads(cache_file.read_text())
+                except (OSError, ValueError):
+                    cache = {}
+                cache[chrome_version] = str(path)
+                temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+                temp_file.write_text(json.dumps(cache, indent=2))
+                os.replace(str(temp_file), str(cache_file))
+                resolution_timings["download"] = perf_counter() - started
+
+    resolution_timings["total"] = perf_counter() - started
+    return path
@@ -0,0 +1,283 @@
+import os
+import sys
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Histogram:
+    """A cumulative latency histogram with fixed bucket upper bounds in seconds."""
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets    = buckets
+        self.counts     = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum        = 0.0
+        self.count      = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _Call:
+    __slots__ = ("method", "started", "wait", "backoff")
+
+    def __init__(self, method: str):
+        self.method     = method
+        self.started    = perf_counter()
+        self.wait       = 0.0
+        self.backoff    = 0.0
+
+
+class Instrumentation:
+    """
+    Latency and command-count instrumentation for an AdvanceSeleniumChrome instance.
+
+    Records per-helper latency histograms, WebDriver command counts and latencies, retry counts, and how much of
+    each helper's time went into waiting for the page, retry backoff or acting. Calls nest: time spent in a nested
+    helper is attributed to it, and its wait and backoff time to its callers as well.
+
+    Args:
+        enabled (bool): Whether to record anything.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled            = enabled
+        self.latency            : Dict[str, Histogram] = {}
+        self.command_latency    : Dict[str, Histogram] = {}
+        self.commands           : Counter = Counter()
+        self.retries            : Counter = Counter()
+        self.wait_time          : Counter = Counter()
+        self.backoff_time       : Counter = Counter()
+        self.action_time        : Counter = Counter()
+        self.gauges             : Dict[str, float] = {}
+        self.active             : Dict[int, List[_Call]] = {}  # thread id -> stack of calls in progress
+        self._lock              = Lock()
+
+    def _current(self) -> Optional[_Call]:
+        stack = self.active.get(get_ident())
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def call(self, method: str) -> Iterator[None]:
+        """Measures one helper call."""
+        if not self.enabled:
+            yield
+            return
+        stack = self.active.setdefault(get_ident(), [])
+        call = _Call(method)
+        stack.append(call)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = perf_counter() - call.started
+            with self._lock:
+                self.latency.setdefault(method, Histogram()).observe(elapsed)
+                self.wait_time[method] += call.wait
+                self.backoff_time[method] += call.backoff
+                self.action_time[method] += max(0.0, elapsed - call.wait - call.backoff)
+            if stack:
+                stack[-1].wait += call.wait
+                stack[-1].backoff += call.backoff
+            else:
+                self.active.pop(get_ident(), None)
+
+    @contextmanager
+    def wait(self) -> Iterator[None]:
+        """Attributes the duration of the block to waiting for the page."""
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            call = self._current()
+            if call is not None:
+                call.wait += perf_counter() - started
+
+    def record_backoff(self, seconds: float) -> None:
+        """Records a retry of the current helper and the backoff slept before it."""
+        call = self._current()
+        if not self.enabled or call is None:
+            return
+        call.backoff += seconds
+        with self._lock:
+            self.retries[call.method] += 1
+
+    def record_command(self, command: str, seconds: float) -> None:
+        """Records one WebDriver command round trip."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.commands[command] += 1
+            self.command_latency.setdefault(command, Histogram()).observe(seconds)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Sets a point-in-time metric such as memory usage."""
+        self.gauges[name] = value
+
+    def reset(self) -> None:
+        """Clears all recorded data."""
+        with self._lock:
+            for counter in (self.commands, self.retries, self.wait_time, self.backoff_time, self.action_time):
+                counter.clear()
+            self.latency.clear()
+            self.command_latency.clear()
+            self.gauges.clear()
+
+    def snapshot(self) -> dict:
+        """Returns all recorded data as a JSON-serialisable dict."""
+        with self._lock:
+            return {
+                "helpers": {
+                    method: dict(
+                        histogram.to_dict(),
+                        retries=self.retries[method],
+                        wait_seconds=self.wait_time[method],
+                        backoff_seconds=self.backoff_time[method],
+                        action_seconds=self.action_time[method],
+                    )
+                    for method, histogram in self.latency.items()
+                },
+                "commands": {
+                    command: dict(histogram.to_dict())
+                    for command, histogram in self.command_latency.items()
+                },
+                "command_count": sum(self.commands.values()),
+                "gauges": dict(self.gauges),
+            }
+
+    def to_prometheus(self, prefix: str = "advance_selenium_chrome") -> str:
+        """Renders all recorded data in the Prometheus text exposition format."""
+        def label(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def histogram_lines(name: str, label_name: str, histograms: Dict[str, Histogram]) -> List[str]:
+            lines = [f"# TYPE {name} histogram"]
+            for key, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f'{name}_bucket{{{label_name}="{label(key)}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label_name}="{label(key)}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{{label_name}="{label(key)}"}} {histogram.count}')
+            return lines
+
+        def counter_lines(name: str, label_name: str, counter: Counter) -> List[str]:
+            return [f"# TYPE {name} counter"] + [f'{name}{{{label_name}="{label(key)}"}} {value}' for key, value in sorted(counter.items())]
+
+        with self._lock:
+            lines = histogram_lines(f"{prefix}_helper_latency_seconds", "method", self.latency)
+            lines += histogram_lines(f"{prefix}_command_latency_seconds", "command", self.command_latency)
+            lines += counter_lines(f"{prefix}_commands_total", "command", self.commands)
+            lines += counter_lines(f"{prefix}_retries_total", "method", self.retries)
+            lines += counter_lines(f"{prefix}_wait_seconds_total", "method", self.wait_time)
+            lines += counter_lines(f"{prefix}_backoff_seconds_total", "method", self.backoff_time)
+            lines += counter_lines(f"{prefix}_action_seconds_total", "method", self.action_time)
+            for name, value in sorted(self.gauges.items()):
+                metric = f"{prefix}_{''.join(c if c.isalnum() else '_' for c in name)}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def instrumented(method: Callable) -> Callable:
+    """Decorator recording the latency of an AdvanceSeleniumChrome helper method."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.instrumentation.call(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of threads running instrumented helpers at a fixed interval, attributing each sample
+    to the helper in progress and to the calling line of user code, so slow scripted flows can be traced to
+    specific calls.
+
+    Args:
+        instrumentation (Instrumentation): The instrumentation whose active calls are sampled.
+        interval (float): Sampling interval in seconds.
+        on_sample (Optional[Callable[[str, str, object], None]]): Hook called with (helper, caller, frame) for every sample.
+    """
+    def __init__(self, instrumentation: Instrumentation, interval: float = 0.01, on_sample: Optional[Callable[[str, str, object], None]] = None):
+        self.instrumentation    = instrumentation
+        self.interval           = interval
+        self.on_sample          = on_sample
+        self.samples            : Counter = Counter()  # (helper, caller) -> sample count
+        self._stop              = Event()
+        self._thread            = None
+
+    @staticmethod
+    def _caller(frame) -> str:
+        """Returns `file:line (function)` of the innermost frame outside this package and Selenium."""
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if not filename.startswith(_PACKAGE_DIR) and f"{os.sep}selenium{os.sep}" not in filename and "threading" not in filename:
+                return f"{filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+            frame = frame.f_back
+        return "<unknown>"
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, stack in list(self.instrumentation.active.items()):
+                if not stack or thread_id not in frames:
+                    continue
+                helper = stack[0].method if len(stack) == 1 else " > ".join(call.method for call in stack)
+                caller = self._caller(frames[thread_id])
+                self.samples[(helper, caller)] += 1
+                if self.on_sample:
+                    self.on_sample(helper, caller, frames[thread_id])
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="asc-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def report(self, top: int = 20) -> List[dict]:
+        """Returns the most sampled (helper, caller) pairs with their estimated time in seconds."""
+        return [
+            {"helper": helper, "caller": caller, "samples": samples, "seconds": samples * self.interval}
+            for (helper, caller), samples in self.samples.most_common(top)
+        ]
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,190 @@
+import json
+import os
+import shutil
+import socket
+import sys
+from pathlib import Path
+from subprocess import DEVNULL, Popen
+from time import monotonic, sleep
+from typing import Dict, Iterable, List, Optional
+
+import requests
+from psutil import AccessDenied, NoSuchProcess, Process, pid_exists
+
+from .driver_resolver import CACHE_DIR, _FileLock
+
+
+CHROME_PROCESS_NAMES = {"chrome.exe", "chrome", "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "google chrome"}
+
+
+def find_chrome_binary() -> Path:
+    """
+    Finds the Chrome executable on Windows, macOS or Linux. The `CHROME_PATH` environment variable takes precedence.
+
+    Raises:
+        FileNotFoundError: If no Chrome or Chromium installation is found.
+    """
+    if os.environ.get("CHROME_PATH"):
+        return Path(os.environ["CHROME_PATH"])
+    if sys.platform.startswith("win"):
+        candidates = [
+            Path(os.environ[variable]) / "Google" / "Chrome" / "Application" / "chrome.exe"
+            for variable in ("PROGRAMFILES", "PROGRAMFILES(X86)", "LOCALAPPDATA")
+            if os.environ.get(variable)
+        ]
+        candidates.append(Path(r"C:\Program Files\Google\Chrome\Application\chrome.exe"))
+    elif sys.platform == "darwin":
+        candidates = [
+            Path("/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"),
+            Path("/Applications/Chromium.app/Contents/MacOS/Chromium"),
+        ]
+    else:
+        candidates = [Path(found) for found in map(shutil.which, ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")) if found]
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError("Could not find a Chrome installation; set the CHROME_PATH environment variable.")
+
+
+def default_user_data_dir(port: int) -> Path:
+    """Returns the default profile directory of a remote debugging Chrome on the given port."""
+    if sys.platform.startswith("win"):
+        return Path(f"C:/ChromeRemoteDebug/{port}")
+    return CACHE_DIR / "ChromeRemoteDebug" / str(port)
+
+
+def wait_for_debugger(port: int, timeout: float = 15, initial_delay: float = 0.02, max_delay: float = 0.5) -> dict:
+    """
+    Probes `/json/version` with short exponential backoff until the DevTools port accepts connections.
+
+    Returns:
+        dict: The `/json/version` response.
+
+    Raises:
+        TimeoutError: If the port is not ready within `timeout` seconds.
+    """
+    deadline, delay = monotonic() + timeout, initial_delay
+    while True:
+        try:
+            response = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=min(1.0, timeout))
+            if response.ok:
+                return response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        if monotonic() + delay > deadline:
+            raise TimeoutError(f"Chrome did not open remote debugging port {port} within {timeout} seconds.")
+        sleep(delay)
+        delay = min(max_delay, delay * 2)
+
+
+class DebugRegistry:
+    """
+    A small on-disk registry of the remote debugging Chrome instances launched on this machine, mapping each port
+    to its PID and profile directory. Lookups validate a single PID instead of scanning every process.
+
+    Args:
+        path (Path): Registry file.
+    """
+    def __init__(self, path: Path = CACHE_DIR / "debug_registry.json"):
+        self.path = path
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: Dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.path.with_suffix(f".{os.getpid()}.tmp")
+        temp_file.write_text(json.dumps(entries, indent=2))
+        os.replace(str(temp_file), str(self.path))
+
+    @staticmethod
+    def _is_running(port: int, pid: int) -> bool:
+        """Whether `pid` is alive and is the Chrome serving `port` (PIDs can be reused)."""
+        if not pid_exists(pid):
+            return False
+        try:
+            return f"--remote-debugging-port={port}" in " ".join(Process(pid).cmdline())
+        except (NoSuchProcess, AccessDenied):
+            return False
+
+    def get(self, port: int) -> Optional[dict]:
+        """Returns the entry of a running instance on `port`, dropping it if the process is gone."""
+        entry = self._read().get(str(port))
+        if entry is None:
+            return None
+        if self._is_running(port, entry["pid"]):
+            return entry
+        self.remove(port)
+        return None
+
+    def register(self, port: int, pid: int, user_data_dir: Optional[Path] = None) -> None:
+        with _FileLock(self.path.with_suffix(".lock")):
+            entries = self._read()
+            entries[str(port)] = {"pid": pid, "user_data_dir": str(user_data_dir) if user_data_dir else None}
+            self._write(entries)
+
+    def remove(self, port: int) -> None:
+        with _FileLock(self.path.with_suffix(".lock")):
+            entries = self._read()
+            if entries.pop(str(port), None) is not None:
+                self._write(entries)
+
+    def ports(self) -> List[int]:
+        return [int(port) for port in self._read()]
+
+
+def allocate_free_ports(count: int = 1, registry: Optional[DebugRegistry] = None, exclude: Iterable[int] = ()) -> List[int]:
+    """
+    Allocates `count` distinct free local TCP ports, skipping ports of registered debugging instances, so that many
+    debugging browsers can be launched in parallel.
+    """
+    taken = set(exclude) | set((registry or DebugRegistry()).ports())
+    sockets, ports = [], []
+    try:
+        while len(ports) < count:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(("127.0.0.1", 0))
+            sockets.append(sock)  # keep bound until done so the OS does not hand out the same port twice
+            port = sock.getsockname()[1]
+            if port not in taken:
+                ports.append(port)
+    finally:
+        for sock in sockets:
+            sock.close()
+    return ports
+
+
+def launch_debugging_chrome(
+    port            : int,
+    user_data_dir   : Optional[Path]    = None,
+    chrome_path     : Optional[Path]    = None,
+    extra_args      : Iterable[str]     = (),
+    timeout         : float             = 15,
+    registry        : Optional[DebugRegistry] = None
+) -> int:
+    """
+    Launches Chrome with remote debugging on `port`, waits until the DevTools endpoint is ready and registers it.
+
+    Args:
+        port (int): Remote debugging port.
+        user_data_dir (Optional[Path]): Profile directory (default is `default_user_data_dir(port)`).
+        chrome_path (Optional[Path]): Chrome executable (default is `find_chrome_binary()`).
+        extra_args (Iterable[str]): Additional command-line flags.
+        timeout (float): Maximum time to wait for the debugging port in seconds.
+        registry (Optional[DebugRegistry]): Registry to record the instance in.
+
+    Returns:
+        int: PID of the launched Chrome.
+    """
+    user_data_dir = Path(user_data_dir or default_user_data_dir(port))
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    process = Popen(
+        [str(chrome_path or find_chrome_binary()), f"--remote-debugging-port={port}", f"--user-data-dir={user_data_dir}", *extra_args],
+        stdout=DEVNULL, stderr=DEVNULL,
+    )
+    wait_for_debugger(port, timeout=timeout)
+    (registry or DebugRegistry()).register(port, process.pid, user_data_dir)
+    return process.pid
@@ -0,0 +1,294 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Union
+from urllib.parse import urlsplit
+
+from .cdp import CDPConnection, CDPError
+
+
+# Rough transfer sizes used to estimate the bytes saved by a blocked request until real sizes have been observed
+DEFAULT_RESOURCE_BYTES = {
+    "Image": 30_000, "Media": 500_000, "Font": 40_000, "Script": 25_000, "Stylesheet": 15_000,
+    "XHR": 5_000, "Fetch": 5_000, "Ping": 500, "Other": 5_000,
+}
+
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com", "adservice.google.com",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "segment.io", "mixpanel.com", "scorecardresearch.com",
+    "criteo.com", "taboola.com", "outbrain.com", "amazon-adsystem.com", "adnxs.com", "quantserve.com",
+)
+
+
+@dataclass
+class BlockingRules:
+    """
+    Which requests the browser should not make.
+
+    Args:
+        resource_types (Sequence[str]): DevTools resource types to block, e.g. "Image", "Media", "Font", "Stylesheet".
+        deny_domains (Sequence[str]): Domains (including their subdomains) whose requests are blocked.
+        allow_domains (Sequence[str]): If set, subresources from any other domain are blocked. Page navigations are never blocked.
+        url_patterns (Sequence[str]): URL wildcard patterns (`*` matches anything) to block, e.g. "*.mp4".
+    """
+    resource_types  : Sequence[str] = ()
+    deny_domains    : Sequence[str] = ()
+    allow_domains   : Sequence[str] = ()
+    url_patterns    : Sequence[str] = ()
+
+
+BLOCKING_PRESETS = {
+    "media": BlockingRules(resource_types=("Image", "Media", "Font")),
+    "trackers": BlockingRules(deny_domains=TRACKER_DOMAINS),
+    "lean": BlockingRules(resource_types=("Image", "Media", "Font"), deny_domains=TRACKER_DOMAINS),
+}
+
+
+def _matches_domain(host: str, domains: Sequence[str]) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+class RequestHandler:
+    """Base class for handlers of requests paused by a RequestInterceptor. Handlers with a lower `priority` run first."""
+    priority = 50
+
+    def patterns(self) -> List[dict]:
+        """Fetch `RequestPattern`s this handler needs to see."""
+        return []
+
+    def setup_session(self, connection: CDPConnection, session_id: str, target_info: dict) -> None:
+        """Prepares a newly attached page before it starts running."""
+
+    def on_request_paused(self, connection: CDPConnection, params: dict, session_id: str) -> bool:
+        """Handles a `Fetch.requestPaused` event. Returns True if the handler resolved the request."""
+        return False
+
+
+class RequestInterceptor:
+    """
+    Owns the `Fetch` domain of every attached page and routes paused requests through an ordered chain of handlers.
+    Requests no handler resolves are continued unchanged.
+
+    Args:
+        connection (CDPConnection): Started browser connection.
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(self, connection: CDPConnection, debug: bool = False):
+        self.connection = connection
+        self.debug      = debug
+        self.handlers   : List[RequestHandler] = []
+        self._started   = False
+
+    def add_handler(self, handler: RequestHandler) -> None:
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+            self.handlers.sort(key=lambda registered: registered.priority)
+        if self._started:
+            for target_id, session_id in list(self.connection.sessions.items()):
+                handler.setup_session(self.connection, session_id, self.connection.targets.get(target_id, {}))
+        self.refresh()
+
+    def remove_handler(self, handler: RequestHandler) -> None:
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+            self.refresh()
+
+    def _patterns(self) -> List[dict]:
+        patterns = []
+        for handler in self.handlers:
+            patterns.extend(pattern for pattern in handler.patterns() if pattern not in patterns)
+        return patterns
+
+    def _enable(self, session_id: str) -> None:
+        patterns = self._patterns()
+        if patterns:
+            self.connection.send("Fetch.enable", {"patterns": patterns}, session_id=session_id)
+        else:
+            self.connection.send("Fetch.disable", session_id=session_id)
+
+    def _setup_session(self, session_id: str, target_info: dict) -> None:
+        for handler in list(self.handlers):
+            handler.setup_session(self.connection, session_id, target_info)
+        self._enable(session_id)
+
+    def refresh(self) -> None:
+        """Re-applies the combined interception patterns to every attached page (starting interception on first use)."""
+        if not self._started:
+            self._started = True
+            self.connection.on("Fetch.requestPaused", self._on_request_paused)
+            self.connection.on_page_attached(self._setup_session)
+            return
+        for session_id in list(self.connection.sessions.values()):
+            try:
+                self._enable(session_id)
+            except CDPError as e:
+                print(f"Could not update request interception: {e}") if self.debug else None
+
+    def _on_request_paused(self, params: dict, session_id: Optional[str]) -> None:
+        for handler in list(self.handlers):
+            try:
+                if handler.on_request_paused(self.connection, params, session_id):
+                    return
+            except CDPError as e:
+                print(f"Request handler failed for {params['request']['url']}: {e}") if self.debug else None
+        response_stage = "responseStatusCode" in params or "responseErrorReason" in params
+        method = "Fetch.continueResponse" if response_stage and "responseStatusCode" in params else "Fetch.continueRequest"
+        self.connection.send_async(method, {"requestId": params["requestId"]}, session_id=session_id)
+
+
+@dataclass
+class PageBlockingStats:
+    """Request and byte counts for the current page of one tab."""
+    url                     : str = ""
+    requests_loaded         : int = 0
+    bytes_loaded            : int = 0
+    requests_blocked        : int = 0
+    bytes_saved_estimate    : int = 0
+    blocked_by_type         : Dict[str, int] = field(default_factory=dict)
+
+
+class NetworkBlocker(RequestHandler):
+    """
+    Applies BlockingRules to every tab and counts what they save.
+
+    URL patterns and denied domains are passed to `Network.setBlockedURLs`, so matching requests fail inside the
+    browser without a round trip. Resource types and allow-lists need per-request decisions and go through the
+    `Fetch` domain, which only pauses requests of the blocked types (or every request when an allow-list is set).
+    Saved bytes are estimated from the average transfer size of loaded requests of the same resource type.
+
+    Args:
+        rules (BlockingRules): Rules to apply.
+        debug (bool): Whether to enable debug logging.
+    """
+    priority = 10  # blocked requests are never served from or stored in a cache
+
+    def __init__(self, rules: BlockingRules, debug: bool = False):
+        self.rules          = rules
+        self.debug          = debug
+        self.pages          : Dict[str, PageBlockingStats] = {}  # targetId -> stats of its current page
+        self._requests      : Dict[str, tuple] = {}  # requestId -> (resource type, session id), for requests in flight
+        self._type_bytes    : Dict[str, List[int]] = {}  # resource type -> [total bytes, count] of loaded requests
+        self._session_targets : Dict[str, str] = {}  # sessionId -> targetId of attached pages
+        self._subscribed    = False
+        self._lock          = Lock()
+
+    def blocked_url_patterns(self) -> List[str]:
+        patterns = list(self.rules.url_patterns)
+        for domain in self.rules.deny_domains:
+            patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        return patterns
+
+    def patterns(self) -> List[dict]:
+        if self.rules.allow_domains:
+            return [{"urlPattern": "*", "requestStage": "Request"}]
+        return [{"urlPattern": "*", "resourceType": resource_type, "requestStage": "Request"} for resource_type in self.rules.resource_types]
+
+    def setup_session(self, connection: CDPConnection, session_id: str, target_info: dict) -> None:
+        if not self._subscribed:
+            self._subscribed = True
+            connection.on("Network.requestWillBeSent", self._on_request)
+            connection.on("Network.loadingFinished", self._on_finished)
+            connection.on("Network.loadingFailed", self._on_failed)
+            connection.on("Target.detachedFromTarget", self._on_detached)
+            connection.on("Target.targetDestroyed", self._on_target_destroyed)
+        self._session_targets[session_id] = target_info.get("targetId", "")
+        self.pages.setdefault(target_info.get("targetId", ""), PageBlockingStats(url=target_info.get("url", "")))
+        connection.send("Network.enable", session_id=session_id)
+        connection.send("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()}, session_id=session_id)
+
+    def _page(self, session_id: Optional[str]) -> PageBlockingStats:
+        target_id = self._session_targets.get(session_id)
+        if target_id is None:
+            return PageBlockingStats()  # late event of a detached page: counted nowhere
+        return self.pages.setdefault(target_id, PageBlockingStats())
+
+    def _forget_sessions(self, session_ids: set) -> None:
+        for session_id in session_ids:
+            self._session_targets.pop(session_id, None)
+        for request_id, (_resource_type, session_id) in list(self._requests.items()):
+            if session_id in session_ids:
+                self._requests.pop(request_id, None)
+
+    def _on_detached(self, params: dict, _session_id: Optional[str]) -> None:
+        with self._lock:
+            self._forget_sessions({params.get("sessionId")})
+
+    def _on_target_destroyed(self, params: dict, _session_id: Optional[str]) -> None:
+        target_id = params["targetId"]
+        with self._lock:
+            self.pages.pop(target_id, None)
+            self._forget_sessions({session_id for session_id, target in self._session_targets.items() if target == target_id})
+
+    def _estimate(self, resource_type: str) -> int:
+        observed = self._type_bytes.get(resource_type)
+        if observed and observed[1]:
+            return observed[0] // observed[1]
+        return DEFAULT_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES["Other"])
+
+    def _record_blocked(self, session_id: Optional[str], resource_type: str) -> None:
+        with self._lock:
+            page = self._page(session_id)
+            page.requests_blocked += 1
+            page.bytes_saved_estimate += self._estimate(resource_type)
+            page.blocked_by_type[resource_type] = page.blocked_by_type.get(resource_type, 0) + 1
+
+    def _on_request(self, params: dict, session_id: Optional[str]) -> None:
+        resource_type = params.get("type", "Other")
+        self._requests[params["requestId"]] = (resource_type, session_id)
+        # A main-frame navigation starts a new page (the main frame id equals the target id)
+        if resource_type == "Document" and params.get("frameId") == self._session_targets.get(session_id) and params["requestId"] == params.get("loaderId"):
+            with self._lock:
+                self.pages[self._session_targets[session_id]] = PageBlockingStats(url=params["request"]["url"])
+
+    def _on_finished(self, params: dict, session_id: Optional[str]) -> None:
+        resource_type = self._requests.pop(params["requestId"], ("Other",))[0]
+        size = int(params.get("encodedDataLength", 0))
+        with self._lock:
+            page = self._page(session_id)
+            page.requests_loaded += 1
+            page.bytes_loaded += size
+            observed = self._type_bytes.setdefault(resource_type, [0, 0])
+            observed[0] += size
+            observed[1] += 1
+
+    def _on_failed(self, params: dict, session_id: Optional[str]) -> None:
+        resource_type = self._requests.pop(params["requestId"], (params.get("type", "Other"),))[0]
+        if params.get("blockedReason") == "inspector":  # blocked by Network.setBlockedURLs
+            self._record_blocked(session_id, resource_type)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if resource_type == "Document":
+            return False
+        host = urlsplit(url).hostname or ""
+        if self.rules.allow_domains and not _matches_domain(host, self.rules.allow_domains):
+            return True
+        return resource_type in self.rules.resource_types or _matches_domain(host, self.rules.deny_domains)
+
+    def on_request_paused(self, connection: CDPConnection, params: dict, session_id: str) -> bool:
+        if "responseStatusCode" in params or "responseErrorReason" in params:
+            return False
+        resource_type = params.get("resourceType", "Other")
+        if not self.should_block(params["request"]["url"], resource_type):
+            return False
+        connection.send_async("Fetch.failRequest", {"requestId": params["requestId"], "errorReason": "BlockedByClient"}, session_id=session_id)
+        self._record_blocked(session_id, resource_type)
+        return True
+
+    def update(self, connection: CDPConnection, rules: BlockingRules) -> None:
+        """Replaces the rules in every attached page."""
+        self.rules = rules
+        for session_id in list(connection.sessions.values()):
+            connection.send("Network.setBlockedURLs", {"urls": self.blocked_url_patterns()}, session_id=session_id)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-tab counts for the current page, keyed by target id (window handle)."""
+        with self._lock:
+            return {target_id: dict(vars(page), blocked_by_type=dict(page.blocked_by_type)) for target_id, page in self.pages.items()}
+
+
+def resolve_rules(rules: Union[BlockingRules, str, None]) -> Optional[BlockingRules]:
+    """Accepts BlockingRules or the name of a preset in BLOCKING_PRESETS."""
+    if rules is None or isinstance(rules, BlockingRules):
+        return rules
+    if rules not in BLOCKING_PRESETS:
+        raise ValueError(f"Unknown blocking preset '{rules}'. Choose from {', '.join(BLOCKING_PRESETS)}.")
+    return BLOCKING_PRESETS[rules]
@@ -0,0 +1,239 @@
+import os
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition, Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from psutil import AccessDenied, NoSuchProcess, Process
+
+from .advance_selenium_chrome import AdvanceSeleniumChrome
+
+
+class ChromePool:
+    """
+    A pool of pre-launched, warm AdvanceSeleniumChrome instances handed out through context-manager leases.
+
+    Instances are health-checked when returned to the pool and recycled (quit and replaced) once they have
+    served `max_uses` leases or their browser process tree grows beyond `max_memory_mb`.
+    The pool is thread-safe. WebDriver sessions cannot be shared across processes, so each worker process
+    owns its own pool; use `ChromePool.for_process(...)` to lazily get the pool of the current process.
+
+    Args:
+        size (int): Number of warm instances to keep.
+        max_uses (Optional[int]): Recycle an instance after this many leases (None to disable).
+        max_memory_mb (Optional[float]): Recycle an instance once its browser RSS exceeds this many MiB (None to disable).
+        factory (Optional[Callable[[], AdvanceSeleniumChrome]]): Callable creating a new instance.
+            Defaults to `AdvanceSeleniumChrome(**chrome_kwargs)`.
+        prelaunch (bool): Whether to launch all instances up front instead of on first demand.
+        debug (bool): Whether to enable debug logging.
+        **chrome_kwargs: Keyword arguments forwarded to AdvanceSeleniumChrome when no factory is given.
+    """
+    _process_pools: Dict[int, "ChromePool"] = {}
+    _process_pools_lock = Lock()
+
+    def __init__(
+        self,
+        size            : int                                               = 2,
+        max_uses        : Optional[int]                                     = 50,
+        max_memory_mb   : Optional[float]                                   = 1500,
+        factory         : Optional[Callable[[], AdvanceSeleniumChrome]]     = None,
+        prelaunch       : bool                                              = True,
+        debug           : bool                                              = False,
+        **chrome_kwargs : Any
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.size           = size
+        self.max_uses       = max_uses
+        self.max_memory_mb  = max_memory_mb
+        self.factory        = factory or (lambda: AdvanceSeleniumChrome(**chrome_kwargs))
+        self.debug          = debug
+        self._idle          = deque()
+        self._uses          = {}
+        self._created       = 0
+        self._lock          = Lock()
+        self._available     = Condition(self._lock)  # signalled when an instance is returned, a slot is freed or the pool closes
+        self._closed        = False
+        self.stats          = {"leases": 0, "launched": 0, "recycled": 0, "unhealthy": 0}
+
+        if prelaunch:
+            while self._reserve():
+                self._put(self._launch())
+
+    @classmethod
+    def for_process(cls, **pool_kwargs: Any) -> "ChromePool":
+        """Returns the pool of the current process, creating it on first use (safe to call after fork)."""
+        pid = os.getpid()
+        with cls._process_pools_lock:
+            if pid not in cls._process_pools:
+                cls._process_pools[pid] = cls(**pool_kwargs)
+            return cls._process_pools[pid]
+
+    def _reserve(self) -> bool:
+        """Claims a slot for a new instance unless the pool is full."""
+        with self._lock:  # check and claim together, so concurrent callers cannot overshoot `size`
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _launch(self) -> AdvanceSeleniumChrome:
+        """Launches an instance into a slot claimed with `_reserve`, giving the slot back if the launch fails."""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()  # a waiter can try the slot again
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self.stats["launched"] += 1
+        print(f"Pool launched a new Chrome instance ({self._created}/{self.size}).") if self.debug else None
+        return driver
+
+    def _put(self, driver: AdvanceSeleniumChrome) -> None:
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+        self._discard(driver)
+
+    def _discard(self, driver: AdvanceSeleniumChrome) -> None:
+        with self._available:
+            self._created -= 1
+            self._uses.pop(id(driver), None)
+            self._available.notify()
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting pooled Chrome instance: {e}") if self.debug else None
+
+    @staticmethod
+    def browser_memory_mb(driver: AdvanceSeleniumChrome) -> float:
+        """
+        Returns the total RSS in MiB of the browser process tree (Chrome and its renderers) of a driver: the browser
+        process itself when its pid is known (remote-debugging instances are not children of chromedriver),
+        otherwise the chromedriver process and its descendants.
+        """
+        try:
+            if driver.browser_pid:
+                root = Process(driver.browser_pid)
+            else:
+                root = Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except (AttributeError, NoSuchProcess, AccessDenied):
+            return 0.0
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except (NoSuchProcess, AccessDenied):
+                continue
+        return total / (1024 * 1024)
+
+    def _is_healthy(self, driver: AdvanceSeleniumChrome) -> bool:
+        """Checks that the session responds and recovers crashed tabs."""
+        try:
+            if not driver.window_handles:
+                return False
+            driver._detect_and_handle_crashed_tabs()
+            driver.execute_script("return 1;")
+            return True
+        except Exception as e:
+            print(f"Pooled Chrome instance failed health check: {e}") if self.debug else None
+            return False
+
+    def _should_recycle(self, driver: AdvanceSeleniumChrome) -> bool:
+        if self.max_uses is not None and self._uses.get(id(driver), 0) >= self.max_uses:
+            return True
+        return self.max_memory_mb is not None and self.browser_memory_mb(driver) > self.max_memory_mb
+
+    def acquire(self, timeout: Optional[float] = None) -> AdvanceSeleniumChrome:
+        """
+        Takes an instance out of the pool, launching one if the pool is not yet full.
+
+        Args:
+            timeout (Optional[float]): Maximum time to wait for a free instance (None waits forever).
+
+        Raises:
+            RuntimeError: If the pool is closed, also while waiting.
+            TimeoutError: If no instance became free within `timeout`.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The pool is closed.")
+                if self._idle:
+                    driver = self._idle.popleft()
+                    break
+                if self._created < self.size:
+                    self._created += 1  # a slot freed by a discarded instance or a failed launch is claimed here too
+                    driver = None
+                    break
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No pooled Chrome instance became free within {timeout} seconds.")
+                self._available.wait(remaining)
+        if driver is None:
+            driver = self._launch()
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            self.stats["leases"] += 1
+        return driver
+
+    def release(self, driver: AdvanceSeleniumChrome) -> None:
+        """Returns an instance to the pool, replacing it if it is unhealthy or due for recycling."""
+        if self._closed:
+            self._discard(driver)
+            return
+        if not self._is_healthy(driver):
+            reason = "unhealthy"
+        elif self._should_recycle(driver):
+            reason = "recycled"
+        else:
+            self._put(driver)
+            return
+        with self._lock:
+            self.stats[reason] += 1
+        self._discard(driver)
+        # Keep the pool warm by launching the replacement now rather than on the next lease
+        if not self._reserve():
+            return  # a waiting caller already claimed the freed slot
+        try:
+            self._put(self._launch())
+        except Exception as e:
+            print(f"Error launching replacement Chrome instance: {e}") if self.debug else None
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[AdvanceSeleniumChrome]:
+        """
+        Leases an instance for the duration of a `with` block.
+
+        Example:
+            with pool.lease() as driver:
+                driver.get("https://example.com")
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Quits all idle instances and wakes up waiting callers. Leased instances are quit when they are released."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._available.notify_all()
+        for driver in idle:
+            self._discard(driver)
+
+    def __enter__(self) -> "ChromePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,157 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Union
+from uuid import uuid4
+
+from .driver_resolver import CACHE_DIR
+
+
+HEADLESS_FLAGS = ["--headless=new", "--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage", "--profile-directory=Default"]
+
+# Chrome flags bundled by name; combined with HEADLESS_FLAGS when running headless.
+LAUNCH_PRESETS: Dict[str, List[str]] = {
+    "default": [],
+    "low-memory": [
+        "--renderer-process-limit=2",
+        "--process-per-site",
+        "--disable-site-isolation-trials",
+        "--js-flags=--max-old-space-size=256",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+        "--mute-audio",
+        "--no-first-run",
+    ],
+    "max-throughput": [
+        "--disable-background-timer-throttling",
+        "--disable-backgrounding-occluded-windows",
+        "--disable-renderer-backgrounding",
+        "--disable-ipc-flooding-protection",
+        "--disable-hang-monitor",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-sync",
+        "--disable-features=Translate,MediaRouter,BackForwardCache",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ],
+}
+
+# Rebuilt on demand, so never worth copying into an instance
+SKIPPED_NAMES = {
+    "Cache", "Code Cache", "GPUCache", "GrShaderCache", "GraphiteDawnCache", "DawnCache", "DawnGraphiteCache",
+    "DawnWebGPUCache", "ShaderCache", "CacheStorage", "ScriptCache", "Crashpad", "Crash Reports", "BrowserMetrics",
+    "component_crx_cache", "optimization_guide_model_store", "Download Service",
+    "SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "DevToolsActivePort",
+}
+
+# Component and extension installs are replaced by new versioned directories, never modified in place,
+# so instances can share them through hardlinks. Everything else is written to and must be copied.
+IMMUTABLE_DIRS = {
+    "Extensions", "Dictionaries", "Safe Browsing", "WidevineCdm", "hyphen-data", "ZxcvbnData", "Subresource Filter",
+    "FirstPartySetsPreloaded", "OnDeviceHeadSuggestModel", "TrustTokenKeyCommitments", "MEIPreload", "SSLErrorAssistant",
+    "CertificateRevocation", "FileTypePolicies", "OriginTrials", "PKIMetadata", "AutofillStates", "CookieReadinessList",
+}
+
+_FICLONE = 0x40049409  # Linux ioctl cloning a file's extents (btrfs, XFS, overlayfs on those)
+
+
+def default_launch_flags(preset: Optional[str] = None, headless: bool = False) -> List[str]:
+    """
+    Returns the Chrome flags of a launch preset, with the headless flags first if `headless`.
+
+    Raises:
+        ValueError: If the preset is unknown.
+    """
+    if preset is not None and preset not in LAUNCH_PRESETS:
+        raise ValueError(f"Unknown launch preset '{preset}'. Choose from {', '.join(LAUNCH_PRESETS)}.")
+    return (HEADLESS_FLAGS if headless else []) + LAUNCH_PRESETS[preset or "default"]
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        shutil.copystat(str(source), str(destination))
+        return True
+    except OSError:
+        return False
+
+
+class ProfileTemplate:
+    """
+    A golden Chrome profile (e.g. with logins and settings in place) cloned cheaply into a fresh `user_data_dir`
+    per instance, so many instances start from the same state concurrently.
+
+    Caches, crash dumps and lock files are skipped. Files in directories Chrome never modifies in place (installed
+    extensions and components) are hardlinked; other files are reflinked (copy-on-write) where the filesystem
+    supports it and copied otherwise. Close every browser using the template's directory before cloning it.
+
+    Args:
+        path (Path): Directory of the template (a `user_data_dir`).
+    """
+    def __init__(self, path: Union[Path, str]):
+        self.path           = Path(path)
+        self.last_clone     : Dict[str, float] = {}  # statistics of the last clone
+        if not self.path.is_dir():
+            raise FileNotFoundError(f"Profile template not found: {self.path}")
+
+    @classmethod
+    def capture(cls, user_data_dir: Union[Path, str], path: Union[Path, str]) -> "ProfileTemplate":
+        """Creates a template from an existing, closed profile (e.g. one logged in by hand), leaving out caches."""
+        path = Path(path)
+        if path.exists():
+            shutil.rmtree(str(path))
+        shutil.copytree(str(user_data_dir), str(path), ignore=lambda _directory, names: [name for name in names if name in SKIPPED_NAMES])
+        return cls(path)
+
+    def clone(self, destination: Optional[Union[Path, str]] = None) -> Path:
+        """
+        Clones the template into `destination` (default is a new directory under the cache directory).
+        Files already in `destination` (e.g. from an earlier clone) are replaced, never written through.
+
+        Returns:
+            Path: The new `user_data_dir`.
+
+        Raises:
+            ValueError: If `destination` is the template itself.
+        """
+        started = perf_counter()
+        destination = Path(destination or CACHE_DIR / "profiles" / uuid4().hex)
+        if destination.resolve() == self.path.resolve():
+            raise ValueError(f"Cannot clone the profile template into itself: {destination}")
+        stats = {"files": 0, "hardlinked": 0, "reflinked": 0, "copied": 0}
+        for directory, names, files in os.walk(str(self.path)):
+            relative = Path(directory).relative_to(self.path)
+            names[:] = [name for name in names if name not in SKIPPED_NAMES]
+            immutable = any(part in IMMUTABLE_DIRS for part in relative.parts)
+            (destination / relative).mkdir(parents=True, exist_ok=True)
+            for name in files:
+                if name in SKIPPED_NAMES or name.endswith(".tmp"):
+                    continue
+                source, target = Path(directory) / name, destination / relative / name
+                stats["files"] += 1
+                if os.path.lexists(str(target)):
+                    # May be a hardlink to the template: writing to it would truncate the template's file
+                    target.unlink()
+                if immutable:
+                    try:
+                        os.link(str(source), str(target))
+                        stats["hardlinked"] += 1
+                        continue
+                    except OSError:
+                        pass  # other filesystem, or links unsupported
+                if _reflink(source, target):
+                    stats["reflinked"] += 1
+                else:
+                    shutil.copy2(str(source), str(target))
+                    stats["copied"] += 1
+        self.last_clone = dict(stats, seconds=perf_counter() - started)
+        return destination
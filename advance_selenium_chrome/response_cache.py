@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Dict, List, Literal, Optional, Sequence
+
+from .cdp import CDPConnection
+from .driver_resolver import CACHE_DIR
+from .network import RequestHandler
+
+
+@dataclass
+class CacheRule:
+    """
+    Which responses to cache and for how long.
+
+    Args:
+        pattern (str): URL wildcard pattern (`*` and `?`), e.g. "https://cdn.example.com/*".
+        ttl (Optional[float]): Time to live of stored responses in seconds (None never expires).
+        resource_types (Sequence[str]): DevTools resource types the rule applies to (empty for all).
+    """
+    pattern         : str
+    ttl             : Optional[float] = 24 * 3600
+    resource_types  : Sequence[str] = ()
+
+    def matches(self, url: str, resource_type: str) -> bool:
+        return (not self.resource_types or resource_type in self.resource_types) and fnmatchcase(url, self.pattern)
+
+
+STATIC_ASSET_RULES = (CacheRule("*", ttl=24 * 3600, resource_types=("Stylesheet", "Script", "Image", "Font", "Media")),)
+
+# Headers that describe the transfer rather than the (decoded) body returned by Fetch.getResponseBody
+_TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+
+class ResponseCache(RequestHandler):
+    """
+    A disk-backed HTTP response cache served through DevTools `Fetch` interception.
+
+    Bodies are stored content-addressed (by SHA-256) under `objects/`, so identical assets served from different
+    URLs are stored once, and an SQLite index maps each URL to its status, headers, body and expiry. The store is
+    bounded to `max_size_mb` and evicts least recently used entries. It can be shared by several browsers and processes,
+    each using its own ResponseCache on the same directory, since a browser closes its cache when it quits.
+
+    Modes:
+        "cache": Serves fresh stored responses and stores cacheable (200, not `no-store`) responses of matching requests.
+        "record": Always loads from the network and stores every matching response, ignoring TTLs.
+        "replay": Serves stored responses regardless of age and fails any other matching request, so a recorded
+            flow runs fully offline.
+
+    Args:
+        path (Path): Cache directory.
+        max_size_mb (float): Maximum size of the stored bodies in megabytes.
+        rules (Optional[Sequence[CacheRule]]): Requests to cache (default is static assets for a day in "cache"
+            mode, and every request in "record" and "replay" mode).
+        mode (Literal["cache", "record", "replay"]): See above.
+        debug (bool): Whether to enable debug logging.
+    """
+    priority = 20
+
+    def __init__(
+        self,
+        path            : Path                              = CACHE_DIR / "responses",
+        max_size_mb     : float                             = 512,
+        rules           : Optional[Sequence[CacheRule]]     = None,
+        mode            : Literal["cache", "record", "replay"] = "cache",
+        debug           : bool                              = False
+    ):
+        if mode not in ("cache", "record", "replay"):
+            raise ValueError(f"Unsupported cache mode '{mode}'. Choose from 'cache', 'record' or 'replay'.")
+        self.path           = Path(path)
+        self.max_size       = int(max_size_mb * 1024 * 1024)
+        self.mode           = mode
+        self.rules          = list(rules) if rules is not None else list(STATIC_ASSET_RULES if mode == "cache" else (CacheRule("*", ttl=None),))
+        self.debug          = debug
+        self.stats          = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_served": 0}
+        self._lock          = Lock()
+        self._writer        = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asc-cache")
+        (self.path / "objects").mkdir(parents=True, exist_ok=True)
+        self._db            = sqlite3.connect(str(self.path / "index.sqlite"), timeout=30, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT,"
+                " digest TEXT, size INTEGER, stored_at REAL, expires_at REAL, last_access REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+
+    @staticmethod
+    def _key(method: str, url: str) -> str:
+        return hashlib.sha256(f"{method} {url}".encode()).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest
+
+    def _rule(self, url: str, resource_type: str) -> Optional[CacheRule]:
+        return next((rule for rule in self.rules if rule.matches(url, resource_type)), None)
+
+    def patterns(self) -> List[dict]:
+        stages = ("Request",) if self.mode == "replay" else ("Request", "Response")
+        patterns = []
+        for rule in self.rules:
+            for stage in stages:
+                for resource_type in rule.resource_types or (None,):
+                    pattern = {"urlPattern": rule.pattern, "requestStage": stage}
+                    if resource_type:
+                        pattern["resourceType"] = resource_type
+                    patterns.append(pattern)
+        return patterns
+
+    def lookup(self, url: str, method: str = "GET") -> Optional[dict]:
+        """Returns the stored response for `url` (status, headers and body), or None. Expired entries are returned too."""
+        with self._lock:
+            row = self._db.execute("SELECT status, headers, digest, expires_at FROM entries WHERE key = ?", (self._key(method, url),)).fetchone()
+        if row is None:
+            return None
+        try:
+            body = self._object_path(row[2]).read_bytes()
+        except OSError:
+            return None
+        return {"status": row[0], "headers": json.loads(row[1]), "body": body, "expires_at": row[3]}
+
+    def _touch(self, url: str, method: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time(), self._key(method, url)))
+
+    def store(self, url: str, status: int, headers: List[dict], body: bytes, ttl: Optional[float], method: str = "GET") -> None:
+        """Stores a response, then evicts least recently used entries while the store exceeds its size limit."""
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = object_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_file.write_bytes(body)
+            os.replace(str(temp_file), str(object_path))
+        now = time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(method, url), url, status, json.dumps(headers), digest, len(body), now, now + ttl if ttl is not None else None, now),
+            )
+            self.stats["stored"] += 1
+        self._evict()
+
+    def _size(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)").fetchone()[0]
+
+    def _evict(self) -> None:
+        with self._lock, self._db:
+            size = self._size()
+            if size <= self.max_size:
+                return
+            removed = []
+            for key, digest in self._db.execute("SELECT key, digest FROM entries ORDER BY last_access").fetchall():
+                if size <= self.max_size:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.stats["evicted"] += 1
+                if self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None:
+                    removed.append(digest)
+                    size = self._size()
+        for digest in removed:
+            try:
+                self._object_path(digest).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Removes every stored response."""
+        with self._lock, self._db:
+            digests = [row[0] for row in self._db.execute("SELECT DISTINCT digest FROM entries")]
+            self._db.execute("DELETE FROM entries")
+        for digest in digests:
+            try:
+                self._object_path(digest).unlink()
+            except OSError:
+                pass
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Hit, miss, store and eviction counts, the hit ratio and the current size of the store."""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0], self._size()
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        return dict(stats, hit_ratio=stats["hits"] / lookups if lookups else 0.0, entries=entries, size_bytes=size)
+
+    def on_request_paused(self, connection: CDPConnection, params: dict, session_id: str) -> bool:
+        request, resource_type = params["request"], params.get("resourceType", "Other")
+        rule = self._rule(request["url"], resource_type)
+        if rule is None or request.get("method", "GET") != "GET":
+            return False
+        if "responseStatusCode" in params or "responseErrorReason" in params:
+            return self._on_response(connection, params, session_id, rule)
+        if self.mode == "record":
+            return False
+        cached = self.lookup(request["url"])
+        if cached is not None and (self.mode == "replay" or cached["expires_at"] is None or cached["expires_at"] > time()):
+            connection.send_async("Fetch.fulfillRequest", {
+                "requestId": params["requestId"],
+                "responseCode": cached["status"],
+                "responseHeaders": cached["headers"],
+                "body": base64.b64encode(cached["body"]).decode(),
+            }, session_id=session_id)
+            with self._lock:
+                self.stats["hits"] += 1
+                self.stats["bytes_served"] += len(cached["body"])
+            self._writer.submit(self._touch, request["url"], "GET")
+            return True
+        with self._lock:
+            self.stats["misses"] += 1
+        if self.mode == "replay":
+            print(f"Not in the recorded cache: {request['url']}") if self.debug else None
+            connection.send_async("Fetch.failRequest", {"requestId": params["requestId"], "errorReason": "InternetDisconnected"}, session_id=session_id)
+            return True
+        return False
+
+    def _on_response(self, connection: CDPConnection, params: dict, session_id: str, rule: CacheRule) -> bool:
+        status, headers = params.get("responseStatusCode"), params.get("responseHeaders", [])
+        cache_control = next((header["value"].lower() for header in headers if header["name"].lower() == "cache-control"), "")
+        if status is None or (self.mode == "cache" and (status != 200 or "no-store" in cache_control)):
+            return False
+        if 300 <= status < 400:
+            return False  # redirects have no body; the browser follows them to a response that is stored
+        url, request_id = params["request"]["url"], params["requestId"]
+        stored_headers = [
+            header for header in headers
+            if header["name"].lower() not in _TRANSFER_HEADERS and (self.mode != "cache" or header["name"].lower() != "set-cookie")
+        ]
+
+        def on_body(future: Future) -> None:
+            # Runs on the connection's reader thread: hand the response back first, write to disk elsewhere
+            connection.send_async("Fetch.continueResponse", {"requestId": request_id}, session_id=session_id)
+            if future.exception() is not None:
+                print(f"Could not read response body of {url}: {future.exception()}") if self.debug else None
+                return
+            result = future.result()
+            body = base64.b64decode(result["body"]) if result.get("base64Encoded") else result.get("body", "").encode()
+            self._writer.submit(self.store, url, status, stored_headers, body, None if self.mode != "cache" else rule.ttl)
+
+        connection.send_async("Fetch.getResponseBody", {"requestId": request_id}, session_id=session_id).add_done_callback(on_body)
+        return True
+
+    def close(self) -> None:
+        """Finishes pending writes and closes the index."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._db.close()
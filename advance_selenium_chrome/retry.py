@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from random import random
+from threading import local
+from time import monotonic
+from typing import Iterator, Optional
+
+
+_state = local()
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Exponential backoff with jitter between retry attempts.
+
+    Args:
+        base_delay (float): Delay before the first retry in seconds.
+        multiplier (float): Factor applied to the delay after every attempt.
+        max_delay (float): Upper bound for a single delay in seconds.
+        jitter (float): Fraction of each delay that is randomised (0 for none, 1 for "full jitter").
+    """
+    base_delay  : float = 0.1
+    multiplier  : float = 2.0
+    max_delay   : float = 2.0
+    jitter      : float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        """Returns the delay in seconds before retry number `attempt` (starting at 0)."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        return delay * (1 - self.jitter * random())
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current thread's deadline budget, or None if no deadline is active."""
+    expires_at = getattr(_state, "expires_at", None)
+    return None if expires_at is None else max(0.0, expires_at - monotonic())
+
+
+def budget(timeout: float) -> float:
+    """Returns `timeout` capped by the current deadline budget."""
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Runs a block under a deadline budget shared by all helpers called within it on the same thread.
+    Nested deadlines can only shorten the budget, never extend it.
+
+    Example:
+        with deadline(10):
+            driver.click_element(...)        # waits and retries all fit in the same 10 seconds
+            driver.send_keys_to_element(...)
+    """
+    previous = getattr(_state, "expires_at", None)
+    if seconds is not None:
+        expires_at = monotonic() + seconds
+        _state.expires_at = expires_at if previous is None else min(previous, expires_at)
+    try:
+        yield
+    finally:
+        _state.expires_at = previous
@@ -0,0 +1,247 @@
+"""
+JavaScript sources run inside the page.
+
+Each script is a function expression so it can be used both through WebDriver's `execute_async_script`
+(see `async_script`) and through DevTools `Runtime.evaluate` with `awaitPromise` (see `expression`).
+"""
+import json
+from typing import Any
+
+
+# Shared helpers: element lookup for every Selenium `By` strategy, condition checks, and `waitFor`, which
+# resolves as soon as a check passes by re-checking on DOM mutations instead of polling at a fixed rate.
+PRELUDE = r"""
+const __asc = {
+    findAll(by, selector, root) {
+        root = root || document;
+        switch (by) {
+            case "xpath": {
+                const result = document.evaluate(selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                const nodes = [];
+                for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+                return nodes;
+            }
+            case "id": return Array.from(root.querySelectorAll(`[id="${CSS.escape(selector)}"]`));
+            case "name": return Array.from(root.querySelectorAll(`[name="${CSS.escape(selector)}"]`));
+            case "class name": return Array.from(root.getElementsByClassName(selector));
+            case "tag name": return Array.from(root.getElementsByTagName(selector));
+            case "link text": return Array.from(root.querySelectorAll("a")).filter(a => a.innerText.trim() === selector);
+            case "partial link text": return Array.from(root.querySelectorAll("a")).filter(a => a.innerText.includes(selector));
+            default: return Array.from(root.querySelectorAll(selector));
+        }
+    },
+    find(by, selector, root) {
+        return __asc.findAll(by, selector, root)[0] || null;
+    },
+    isVisible(el) {
+        if (!el || !el.isConnected) return false;
+        const style = getComputedStyle(el);
+        if (style.visibility === "hidden" || style.display === "none" || Number(style.opacity) === 0) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    },
+    check(el, condition) {
+        if (!el) return false;
+        if (condition === "present") return true;
+        if (condition === "clickable") return __asc.isVisible(el) && !el.disabled;
+        return __asc.isVisible(el);
+    },
+    waitFor(check, timeoutMs) {
+        return new Promise((resolve, reject) => {
+            const first = check();
+            if (first) return resolve(first);
+            let done = false;
+            const finish = (value, error) => {
+                if (done) return;
+                done = true;
+                observer.disconnect();
+                clearInterval(styleTimer);
+                clearTimeout(timer);
+                error ? reject(error) : resolve(value);
+            };
+            const recheck = () => { const value = check(); if (value) finish(value); };
+            const observer = new MutationObserver(recheck);
+            observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+            // Visibility can also change through stylesheets and animations, which do not mutate the DOM
+            const styleTimer = setInterval(recheck, 100);
+            const timer = setTimeout(() => finish(null, new Error(`Timed out after ${timeoutMs} ms`)), timeoutMs);
+        });
+    },
+    setValue(el, value) {
+        if (el.isContentEditable) {
+            el.textContent = value;
+        } else {
+            const proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            // Use the native setter so frameworks tracking the value property (e.g. React) see the change
+            Object.getOwnPropertyDescriptor(proto, "value").set.call(el, value);
+        }
+        el.dispatchEvent(new Event("input", {bubbles: true}));
+        el.dispatchEvent(new Event("change", {bubbles: true}));
+    },
+};
+"""
+
+
+# Resolves with the first element matching the selector once it meets the condition ("present", "visible" or "clickable").
+WAIT_FOR_ELEMENT = PRELUDE + r"""
+return function waitForElement(by, selector, condition, timeoutMs, root) {
+    return __asc.waitFor(() => {
+        const el = __asc.find(by, selector, root);
+        return __asc.check(el, condition) ? el : null;
+    }, timeoutMs);
+};
+"""
+
+
+# Waits for an element, scrolls it into view (optionally focusing it) and returns the viewport coordinates of its centre,
+# for dispatching trusted input events at it over DevTools.
+ELEMENT_POINT = PRELUDE + r"""
+return async function elementPoint(by, selector, condition, timeoutMs, focus) {
+    const el = await __asc.waitFor(() => {
+        const found = __asc.find(by, selector);
+        return __asc.check(found, condition) ? found : null;
+    }, timeoutMs);
+    el.scrollIntoView({block: "center", inline: "center"});
+    if (focus) el.focus();
+    const rect = el.getBoundingClientRect();
+    return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2};
+};
+"""
+
+
+# Runs a list of actions sequentially, waiting for each element, and reports one result per action.
+# Stops at the first failure, since later steps of a flow usually depend on earlier ones.
+RUN_ACTIONS = PRELUDE + r"""
+return async function runActions(actions, timeoutMs) {
+    const results = [];
+    for (const action of actions) {
+        if (results.length && !results[results.length - 1].ok) {
+            results.push({ok: false, error: "skipped after earlier failure"});
+            continue;
+        }
+        try {
+            const condition = ["click", "double_click"].includes(action.action) ? "clickable" : "present";
+            const el = await __asc.waitFor(() => {
+                const found = __asc.find(action.by, action.selector);
+                return __asc.check(found, condition) ? found : null;
+            }, timeoutMs);
+            el.scrollIntoView({block: "center", inline: "center"});
+            switch (action.action) {
+                case "click":
+                    el.click();
+                    break;
+                case "double_click":
+                    el.click();
+                    el.click();
+                    el.dispatchEvent(new MouseEvent("dblclick", {bubbles: true, cancelable: true, detail: 2}));
+                    break;
+                case "send_keys":
+                    el.focus();
+                    __asc.setValue(el, (el.isContentEditable ? el.textContent : el.value) + String(action.value));
+                    break;
+                case "clear":
+                    __asc.setValue(el, "");
+                    break;
+                case "select": {
+                    const options = Array.from(el.options);
+                    const option = action.select_by === "index" ? options[Number(action.value)]
+                        : action.select_by === "visible text" ? options.find(o => o.text.trim() === String(action.value))
+                        : options.find(o => o.value === String(action.value));
+                    if (!option) throw new Error(`No option matching ${action.select_by} '${action.value}'`);
+                    option.selected = true;
+                    el.dispatchEvent(new Event("input", {bubbles: true}));
+                    el.dispatchEvent(new Event("change", {bubbles: true}));
+                    break;
+                }
+                default:
+                    throw new Error(`Unsupported action '${action.action}'`);
+            }
+            results.push({ok: true, error: null});
+        } catch (e) {
+            results.push({ok: false, error: String(e && e.message || e)});
+        }
+    }
+    return results;
+};
+"""
+
+
+# Extracts rows as plain objects in chunks, keeping the cursor in `window.__ascExtractions[id]` between calls so
+# huge tables cross the wire one chunk at a time. With `scroll`, scrolls to the bottom whenever the collected rows
+# run out and waits for new ones (infinite scrolling). Rows are deduplicated by element; with `scroll` or `keyFields`
+# also by the values of `keyFields` (all fields if empty), which catches virtualised lists that recycle row elements.
+EXTRACT_ROWS = PRELUDE + r"""
+return async function extractRows(id, by, selector, fields, chunkSize, keyFields, scroll, maxScrolls, scrollTimeoutMs) {
+    const store = window.__ascExtractions = window.__ascExtractions || {};
+    const state = store[id] = store[id] || {seenRows: new WeakSet(), seenKeys: new Set(), pending: [], next: 0, scrolls: 0, exhausted: false};
+    const text = el => el.textContent.replace(/\s+/g, " ").trim();
+    const read = (el, field) => {
+        if (!el) return null;
+        if (field.attr) return el.getAttribute(field.attr);
+        if (field.prop) { const value = el[field.prop]; return value === undefined ? null : value; }
+        return field.html ? el.innerHTML : text(el);
+    };
+    const value = (row, field) => {
+        if (!field.selector) return read(row, field);
+        if (field.all) return __asc.findAll(field.by, field.selector, row).map(el => read(el, field));
+        return read(__asc.find(field.by, field.selector, row), field);
+    };
+    const collect = () => {
+        for (const row of __asc.findAll(by, selector)) {
+            if (!state.seenRows.has(row)) {
+                state.seenRows.add(row);
+                state.pending.push(row);
+            }
+        }
+        return state.next < state.pending.length;
+    };
+    if (!state.started) {
+        state.started = true;
+        collect();
+    }
+    const rows = [];
+    while (rows.length < chunkSize) {
+        if (state.next >= state.pending.length) {
+            state.pending = [];
+            state.next = 0;
+            if (!scroll || state.exhausted || state.scrolls >= maxScrolls) break;
+            state.scrolls++;
+            window.scrollTo(0, document.documentElement.scrollHeight);
+            try {
+                await __asc.waitFor(collect, scrollTimeoutMs);
+            } catch (e) {
+                state.exhausted = true;  // nothing new appeared: the end of the list
+            }
+            continue;
+        }
+        const row = state.pending[state.next++];
+        const record = {};
+        for (const name of Object.keys(fields)) record[name] = value(row, fields[name]);
+        if (scroll || keyFields.length) {
+            const key = JSON.stringify(keyFields.length ? keyFields.map(name => record[name]) : record);
+            if (state.seenKeys.has(key)) continue;
+            state.seenKeys.add(key);
+        }
+        rows.push(record);
+    }
+    const done = rows.length < chunkSize;
+    if (done) delete store[id];
+    return {rows, done};
+};
+"""
+
+
+def async_script(script: str) -> str:
+    """Wraps a script returning an async function into an `execute_async_script` body that calls it with the script arguments."""
+    return (
+        "const __done = arguments[arguments.length - 1];\n"
+        "const __args = Array.prototype.slice.call(arguments, 0, -1);\n"
+        f"const __fn = (function() {{ {script} }})();\n"
+        "Promise.resolve(__fn(...__args)).then(__done, e => __done({__error: String(e && e.message || e)}));"
+    )
+
+
+def expression(script: str, *args: Any) -> str:
+    """Builds a `Runtime.evaluate` expression calling the script's function with JSON-serialisable arguments."""
+    arguments = ", ".join(json.dumps(arg) for arg in args)
+    return f"(function() {{ {script} }})()({arguments})"
@@ -0,0 +1,280 @@
+import gzip
+import json
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from typing import Callable, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+from .cdp import CDPConnection, CDPError
+
+
+SNAPSHOT_FORMAT = "advance_selenium_chrome.session"
+SNAPSHOT_VERSION = 1
+
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority", "sourceScheme", "sourcePort", "partitionKey")
+
+# Reads both storages and every IndexedDB database of the page's origin in one evaluation.
+# IndexedDB values round-trip as JSON, so Dates and binary values are not preserved.
+_CAPTURE_SCRIPT = r"""
+(async () => {
+    const request = r => new Promise((resolve, reject) => { r.onsuccess = () => resolve(r.result); r.onerror = () => reject(r.error); });
+    const entries = storage => Object.fromEntries(Object.keys(storage).map(key => [key, storage.getItem(key)]));
+    const state = {localStorage: entries(localStorage), sessionStorage: entries(sessionStorage), indexedDB: []};
+    if (INCLUDE_INDEXED_DB && indexedDB.databases) {
+        for (const info of await indexedDB.databases()) {
+            const db = await request(indexedDB.open(info.name));
+            const stores = [];
+            for (const name of Array.from(db.objectStoreNames)) {
+                const store = db.transaction(name, "readonly").objectStore(name);
+                const [keys, values] = await Promise.all([request(store.getAllKeys()), request(store.getAll())]);
+                const indexes = Array.from(store.indexNames).map(index => {
+                    const { keyPath, unique, multiEntry } = store.index(index);
+                    return {name: index, keyPath, unique, multiEntry};
+                });
+                stores.push({name, keyPath: store.keyPath, autoIncrement: store.autoIncrement, indexes, keys, values});
+            }
+            state.indexedDB.push({name: db.name, version: db.version, stores});
+            db.close();
+        }
+    }
+    return state;
+})()
+"""
+
+# Runs at the start of every document, before the page's own scripts: fills the storages of a snapshotted origin
+# once per browser (localStorage, IndexedDB) and once per tab (sessionStorage), marked by a key holding the snapshot id.
+_RESTORE_SCRIPT = r"""
+(() => {
+    const snapshot = SNAPSHOT;
+    const state = snapshot.origins[location.origin];
+    if (!state) return;
+    const marker = "__asc_session_" + snapshot.id;
+    const fill = (storage, items) => {
+        if (storage.getItem(marker)) return false;
+        for (const [key, value] of Object.entries(items || {})) storage.setItem(key, value);
+        storage.setItem(marker, "1");
+        return true;
+    };
+    try {
+        fill(sessionStorage, state.sessionStorage);
+        if (!fill(localStorage, state.localStorage)) return;
+    } catch (e) {
+        return;  // storage disabled for this document (e.g. sandboxed frames)
+    }
+    for (const database of state.indexedDB || []) {
+        const open = indexedDB.open(database.name, database.version);
+        open.onupgradeneeded = () => {
+            for (const spec of database.stores) {
+                if (open.result.objectStoreNames.contains(spec.name)) continue;
+                const store = open.result.createObjectStore(spec.name, {keyPath: spec.keyPath, autoIncrement: spec.autoIncrement});
+                for (const index of spec.indexes) store.createIndex(index.name, index.keyPath, {unique: index.unique, multiEntry: index.multiEntry});
+            }
+        };
+        open.onsuccess = () => {
+            const db = open.result;
+            const names = database.stores.map(spec => spec.name).filter(name => db.objectStoreNames.contains(name));
+            if (!names.length) return db.close();
+            const transaction = db.transaction(names, "readwrite");
+            for (const spec of database.stores.filter(spec => names.includes(spec.name))) {
+                const store = transaction.objectStore(spec.name);
+                spec.values.forEach((value, i) => spec.keyPath === null ? store.put(value, spec.keys[i]) : store.put(value));
+            }
+            transaction.oncomplete = () => db.close();
+        };
+    }
+})();
+"""
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _cookie_matches(cookie: dict, hosts: Iterable[str]) -> bool:
+    domain = cookie.get("domain", "").lstrip(".")
+    return any(host == domain or host.endswith("." + domain) for host in hosts)
+
+
+def _remove_script(connection: CDPConnection, session_id: str, added: Future) -> None:
+    """Removes a script added with `Page.addScriptToEvaluateOnNewDocument` once its identifier is known."""
+    if added.exception() is not None or connection.closed or "identifier" not in added.result():
+        return
+    try:
+        connection.send_async("Page.removeScriptToEvaluateOnNewDocument", {"identifier": added.result()["identifier"]}, session_id=session_id)
+    except CDPError:
+        pass  # the connection closed meanwhile
+
+
+@dataclass
+class SessionSnapshot:
+    """
+    Cookies and per-origin localStorage, sessionStorage and IndexedDB of a browser, saved as versioned gzip JSON.
+
+    Args:
+        cookies (List[dict]): DevTools cookies.
+        origins (Dict[str, dict]): Per origin, "localStorage" and "sessionStorage" items and "indexedDB" databases.
+        created_at (float): Unix time of the snapshot.
+        expires_at (Optional[float]): Unix time after which the snapshot should not be restored (None never expires).
+        id (str): Unique id, used to restore the storages only once per browser.
+        version (int): Format version.
+    """
+    cookies     : List[dict] = field(default_factory=list)
+    origins     : Dict[str, dict] = field(default_factory=dict)
+    created_at  : float = field(default_factory=time)
+    expires_at  : Optional[float] = None
+    id          : str = field(default_factory=lambda: uuid4().hex)
+    version     : int = SNAPSHOT_VERSION
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time() > self.expires_at
+
+    @property
+    def cookies_expire_at(self) -> Optional[float]:
+        """Earliest expiry of the persistent cookies, which usually bounds how long a login stays valid."""
+        expiries = [cookie["expires"] for cookie in self.cookies if cookie.get("expires", -1) > 0]
+        return min(expiries) if expiries else None
+
+    @classmethod
+    def capture(cls, connection: CDPConnection, origins: Optional[Iterable[str]] = None, max_age: Optional[float] = 24 * 3600, include_indexed_db: bool = True, debug: bool = False) -> "SessionSnapshot":
+        """
+        Captures the state of `origins` (default is the origins of all open tabs). Storages are read from an open tab
+        of each origin in one evaluation per origin; origins without an open tab only contribute their cookies.
+        """
+        connection.enable_auto_attach()
+        sessions: Dict[str, str] = {}
+        for target_id, session_id in list(connection.sessions.items()):
+            origin = _origin(connection.targets.get(target_id, {}).get("url", ""))
+            if origin:
+                sessions.setdefault(origin, session_id)
+        origins = [origin.rstrip("/") for origin in origins] if origins else list(sessions)
+        expression = _CAPTURE_SCRIPT.replace("INCLUDE_INDEXED_DB", "true" if include_indexed_db else "false")
+        probes = {
+            origin: connection.send_async("Runtime.evaluate", {"expression": expression, "awaitPromise": True, "returnByValue": True}, sessions[origin])
+            for origin in origins if origin in sessions
+        }
+        states = {}
+        for origin in origins:
+            if origin not in probes:
+                print(f"No open tab on {origin}, only its cookies are captured.") if debug else None
+                continue
+            try:
+                result = probes[origin].result(timeout=connection.timeout)
+            except CDPError as e:
+                print(f"Could not read the storage of {origin}: {e}") if debug else None
+                continue
+            if "exceptionDetails" in result:
+                print(f"Could not read the storage of {origin}: {result['exceptionDetails'].get('text')}") if debug else None
+                continue
+            states[origin] = result["result"]["value"]
+        hosts = {urlsplit(origin).hostname for origin in origins}
+        cookies = [
+            {name: cookie[name] for name in _COOKIE_FIELDS if name in cookie and not (name == "expires" and cookie.get("session"))}
+            for cookie in connection.send("Storage.getCookies").get("cookies", []) if _cookie_matches(cookie, hosts)
+        ]
+        now = time()
+        return cls(cookies=cookies, origins=states, created_at=now, expires_at=now + max_age if max_age is not None else None)
+
+    def apply(self, connection: CDPConnection, allow_expired: bool = False) -> Optional[Callable[[], None]]:
+        """
+        Restores the snapshot into a browser: cookies in one `Network.setCookies` call, storages of tabs already on
+        a snapshotted origin through `DOMStorage`, and everything else by a script that fills the storages at the
+        start of each new document, before the page's own scripts run.
+
+        Returns:
+            Optional[Callable[[], None]]: Removes the document script from every tab, so later documents are no longer
+                filled from this snapshot (None if the snapshot has no storages).
+
+        Raises:
+            ValueError: If the snapshot has expired and `allow_expired` is False.
+        """
+        if self.expired and not allow_expired:
+            raise ValueError(f"Session snapshot expired at {self.expires_at:.0f}; capture a new one.")
+        connection.enable_auto_attach()
+        now = time()
+        cookies = [cookie for cookie in self.cookies if cookie.get("expires", -1) <= 0 or cookie["expires"] > now]
+        sessions = dict(connection.sessions)
+        if cookies:
+            if sessions:
+                connection.send("Network.setCookies", {"cookies": cookies}, session_id=next(iter(sessions.values())))
+            else:
+                connection.send("Storage.setCookies", {"cookies": cookies})
+        if not self.origins:
+            return None
+        source = _RESTORE_SCRIPT.replace("SNAPSHOT", json.dumps({"id": self.id, "origins": self.origins}))
+        scripts: Dict[str, Future] = {}  # session id -> result of adding the script (holds its identifier)
+
+        def add_script(session_id: str, _target_info: dict) -> None:
+            scripts[session_id] = connection.send_async("Page.addScriptToEvaluateOnNewDocument", {"source": source}, session_id=session_id)
+
+        def remove() -> None:
+            connection.off_page_attached(add_script)
+            attached = set(connection.sessions.values())
+            for session_id, added in list(scripts.items()):
+                if session_id in attached:
+                    added.add_done_callback(lambda added, session_id=session_id: _remove_script(connection, session_id, added))
+            scripts.clear()
+
+        connection.on_page_attached(add_script)
+        pending = []
+        for target_id, session_id in sessions.items():
+            origin = _origin(connection.targets.get(target_id, {}).get("url", ""))
+            if origin not in self.origins:
+                continue
+            pending.append(connection.send_async("DOMStorage.enable", session_id=session_id))
+            for is_local, items in ((True, self.origins[origin].get("localStorage", {})), (False, self.origins[origin].get("sessionStorage", {}))):
+                storage_id = {"securityOrigin": origin, "isLocalStorage": is_local}
+                for key, value in items.items():
+                    pending.append(connection.send_async("DOMStorage.setDOMStorageItem", {"storageId": storage_id, "key": key, "value": value}, session_id=session_id))
+        for future in pending:
+            try:
+                future.result(timeout=connection.timeout)
+            except CDPError:
+                pass  # the tab navigated away; the document script covers it
+        return remove
+
+    def to_dict(self) -> dict:
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "version": self.version,
+            "id": self.id,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "cookies": self.cookies,
+            "origins": self.origins,
+        }
+
+    def save(self, path: Union[Path, str]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "SessionSnapshot":
+        """
+        Raises:
+            ValueError: If the file is not a session snapshot or has an unsupported version.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            raise
+        except (OSError, ValueError) as e:
+            raise ValueError(f"{path} is not a session snapshot: {e}")
+        if data.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a session snapshot.")
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported session snapshot version {data.get('version')} (expected {SNAPSHOT_VERSION}).")
+        return cls(
+            cookies=data["cookies"], origins=data["origins"], created_at=data["created_at"],
+            expires_at=data.get("expires_at"), id=data["id"], version=data["version"],
+        )
@@ -0,0 +1,128 @@
+import re
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, List, Literal, Optional
+from urllib.parse import urlsplit
+
+from .cdp import CDPConnection
+
+
+EMPTY_TAB_URLS = ("data:,", "about:blank", "chrome://new-tab-page/", "chrome://newtab/")
+
+
+def compile_matcher(pattern: str, match: Literal["contains", "prefix", "exact", "regex"] = "contains") -> Callable[[str], bool]:
+    """
+    Returns a predicate telling whether a value (URL, host or title) matches `pattern`.
+
+    Raises:
+        ValueError: If `match` is not supported.
+    """
+    if match == "contains":
+        return lambda value: pattern in value
+    if match == "prefix":
+        return lambda value: value.startswith(pattern)
+    if match == "exact":
+        return lambda value: value == pattern
+    if match == "regex":
+        regex = re.compile(pattern)
+        return lambda value: regex.search(value) is not None
+    raise ValueError(f"Unsupported match '{match}'. Choose from 'contains', 'prefix', 'exact' or 'regex'.")
+
+
+@dataclass
+class TabInfo:
+    """A page target as tracked by the tab index. Chromedriver uses the target id as the window handle."""
+    target_id   : str
+    url         : str
+    title       : str
+
+    @property
+    def handle(self) -> str:
+        return self.target_id
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).hostname or ""
+
+    @property
+    def is_empty(self) -> bool:
+        return self.url in EMPTY_TAB_URLS
+
+
+class TabIndex:
+    """
+    An in-memory index of the browser's tabs by URL, host and title.
+
+    Filled by a single `Target.getTargets` call and kept current through `Target.targetCreated`,
+    `Target.targetInfoChanged` and `Target.targetDestroyed` events, so lookups need no WebDriver round trips.
+
+    Args:
+        connection (CDPConnection): Started browser connection.
+    """
+    def __init__(self, connection: CDPConnection):
+        self.connection = connection
+        self._tabs      : Dict[str, TabInfo] = {}
+        self._lock      = Lock()
+
+    def start(self) -> "TabIndex":
+        """Subscribes to target events and loads the current targets."""
+        self.connection.on("Target.targetCreated", self._on_target_info)
+        self.connection.on("Target.targetInfoChanged", self._on_target_info)
+        self.connection.on("Target.targetDestroyed", self._on_target_destroyed)
+        self.connection.send("Target.setDiscoverTargets", {"discover": True})
+        for target_info in self.connection.send("Target.getTargets")["targetInfos"]:
+            self._update(target_info)
+        return self
+
+    def _update(self, target_info: dict) -> None:
+        if target_info.get("type") != "page":
+            return
+        with self._lock:
+            tab = self._tabs.get(target_info["targetId"])
+            if tab:
+                tab.url, tab.title = target_info.get("url", ""), target_info.get("title", "")
+            else:
+                self._tabs[target_info["targetId"]] = TabInfo(target_info["targetId"], target_info.get("url", ""), target_info.get("title", ""))
+
+    def _on_target_info(self, params: dict, _session_id: Optional[str]) -> None:
+        self._update(params["targetInfo"])
+
+    def _on_target_destroyed(self, params: dict, _session_id: Optional[str]) -> None:
+        with self._lock:
+            self._tabs.pop(params["targetId"], None)
+
+    @property
+    def tabs(self) -> List[TabInfo]:
+        """All indexed tabs, in the order they were first seen."""
+        with self._lock:
+            return list(self._tabs.values())
+
+    def get(self, target_id: str) -> Optional[TabInfo]:
+        with self._lock:
+            return self._tabs.get(target_id)
+
+    def find_all(self, pattern: str, field: Literal["url", "host", "title"] = "url", match: Literal["contains", "prefix", "exact", "regex"] = "contains") -> List[TabInfo]:
+        """
+        Finds all tabs whose `field` matches `pattern`.
+
+        Args:
+            pattern (str): Text or regular expression to match.
+            field (Literal["url", "host", "title"]): Tab attribute to match against (default is "url").
+            match (Literal["contains", "prefix", "exact", "regex"]): How to match (default is "contains").
+
+        Returns:
+            List[TabInfo]: Matching tabs, in the order they were first seen.
+        """
+        if field not in ("url", "host", "title"):
+            raise ValueError(f"Unsupported field '{field}'. Choose from 'url', 'host' or 'title'.")
+        matches = compile_matcher(pattern, match)
+        return [tab for tab in self.tabs if matches(getattr(tab, field))]
+
+    def find(self, pattern: str, field: Literal["url", "host", "title"] = "url", match: Literal["contains", "prefix", "exact", "regex"] = "contains") -> Optional[TabInfo]:
+        """Returns the first tab matching `pattern` (see `find_all`), or None."""
+        tabs = self.find_all(pattern, field=field, match=match)
+        return tabs[0] if tabs else None
+
+    def find_empty(self) -> Optional[TabInfo]:
+        """Returns the first empty tab (e.g. a new tab page), or None."""
+        return next((tab for tab in self.tabs if tab.is_empty), None)
@@ -0,0 +1,241 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Dict, List, Literal, Optional
+
+from psutil import AccessDenied, NoSuchProcess, Process
+
+from .cdp import CDPConnection, CDPError
+
+
+Action = Literal["reload", "discard", "recreate"]
+
+_MB = 1024 * 1024
+
+
+class MemoryWatchdog:
+    """
+    A background thread that samples the memory of every tab and acts on tabs that grow too large or sit idle,
+    before the renderer runs out of memory.
+
+    Every `interval` seconds it reads the JS heap of each attached tab with `Runtime.getHeapUsage` (all tabs at
+    once over the shared connection) and the RSS of the browser and renderer processes with psutil. A tab whose
+    heap exceeds `max_heap_mb`, or whose URL and title have not changed for `idle_timeout` seconds, gets `action`.
+    Renderer RSS cannot be attributed to a tab reliably, so when a renderer exceeds `max_renderer_rss_mb` the tab
+    with the largest heap gets the action. Actions:
+
+        "reload": Reloads the page.
+        "discard": Navigates the tab to about:blank, keeping its URL in `discarded` for `restore`.
+        "recreate": Opens the URL in a new tab and closes the old one, like crashed-tab recovery.
+
+    Args:
+        driver: The AdvanceSeleniumChrome instance whose browser is watched.
+        interval (float): Seconds between samples.
+        max_heap_mb (Optional[float]): Per-tab JS heap threshold in MiB.
+        max_renderer_rss_mb (Optional[float]): Per-renderer-process RSS threshold in MiB.
+        idle_timeout (Optional[float]): Seconds without navigation after which a tab counts as idle.
+        action (Action): What to do with a tab over a threshold.
+        idle_action (Action): What to do with an idle tab.
+        protect_current (bool): Whether to leave the tab WebDriver is focused on alone.
+        on_action (Optional[Callable[[str, str, str], None]]): Called with (target id, action, reason) after acting on a tab.
+        debug (bool): Whether to enable debug logging.
+    """
+    def __init__(
+        self,
+        driver,
+        interval            : float                 = 30,
+        max_heap_mb         : Optional[float]       = 512,
+        max_renderer_rss_mb : Optional[float]       = None,
+        idle_timeout        : Optional[float]       = None,
+        action              : Action                = "reload",
+        idle_action         : Action                = "discard",
+        protect_current     : bool                  = True,
+        on_action           : Optional[Callable[[str, str, str], None]] = None,
+        debug               : bool                  = False
+    ):
+        for name, value in (("action", action), ("idle_action", idle_action)):
+            if value not in ("reload", "discard", "recreate"):
+                raise ValueError(f"Unsupported {name} '{value}'. Choose from 'reload', 'discard' or 'recreate'.")
+        self.driver                 = driver
+        self.interval               = interval
+        self.max_heap_mb            = max_heap_mb
+        self.max_renderer_rss_mb    = max_renderer_rss_mb
+        self.idle_timeout           = idle_timeout
+        self.action                 = action
+        self.idle_action            = idle_action
+        self.protect_current        = protect_current
+        self.on_action              = on_action
+        self.debug                  = debug
+        self.tabs                   : Dict[str, dict] = {}  # target id -> latest sample
+        self.processes              : Dict[str, float] = {"browser_rss_mb": 0.0, "renderer_rss_mb": 0.0, "max_renderer_rss_mb": 0.0, "renderers": 0}
+        self.discarded              : Dict[str, str] = {}  # target id -> URL before discarding
+        self.actions                = 0
+        self._activity              : Dict[str, tuple] = {}  # target id -> ((url, title), time it last changed)
+        self._stop                  = Event()
+        self._lock                  = Lock()
+        self._thread                = None
+
+    @property
+    def connection(self) -> CDPConnection:
+        return self.driver.cdp
+
+    def start(self) -> "MemoryWatchdog":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self.connection.enable_auto_attach()
+            self._thread = Thread(target=self._run, name="asc-memory-watchdog", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MemoryWatchdog":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # The browser may be restarting or gone; keep watching
+                print(f"Memory watchdog check failed: {e}") if self.debug else None
+
+    def _browser_processes(self) -> List[Process]:
+        try:
+            if self.driver.browser_pid:
+                root = Process(self.driver.browser_pid)
+            else:
+                root = Process(self.driver.service.process.pid)  # chromedriver, parent of the browser
+            return [root] + root.children(recursive=True)
+        except (AttributeError, NoSuchProcess, AccessDenied):
+            return []
+
+    def _sample_processes(self) -> Dict[str, float]:
+        browser, renderers = 0, []
+        for proc in self._browser_processes():
+            try:
+                rss = proc.memory_info().rss
+                browser += rss
+                if "--type=renderer" in proc.cmdline():
+                    renderers.append(rss)
+            except (NoSuchProcess, AccessDenied):
+                continue
+        return {
+            "browser_rss_mb": browser / _MB,
+            "renderer_rss_mb": sum(renderers) / _MB,
+            "max_renderer_rss_mb": max(renderers, default=0) / _MB,
+            "renderers": len(renderers),
+        }
+
+    def _sample_tabs(self, timeout: float = 5) -> Dict[str, dict]:
+        connection = self.connection
+        probes = {
+            target_id: connection.send_async("Runtime.getHeapUsage", session_id=session_id)
+            for target_id, session_id in list(connection.sessions.items())
+        }
+        now, tabs = monotonic(), {}
+        for target_id, probe in probes.items():
+            try:
+                heap = probe.result(timeout=timeout)
+            except (CDPError, FutureTimeoutError):
+                continue  # crashed tabs are the crash monitor's business; busy tabs are sampled next time
+            info = connection.targets.get(target_id, {})
+            state = (info.get("url", ""), info.get("title", ""))
+            if self._activity.get(target_id, (None,))[0] != state:
+                self._activity[target_id] = (state, now)
+            tabs[target_id] = {
+                "url": state[0],
+                "js_heap_used_mb": heap.get("usedSize", 0) / _MB,
+                "js_heap_total_mb": heap.get("totalSize", 0) / _MB,
+                "idle_seconds": now - self._activity[target_id][1],
+            }
+        for target_id in set(self._activity) - set(probes):
+            del self._activity[target_id]
+        return tabs
+
+    def check(self) -> List[str]:
+        """
+        Samples memory once and acts on tabs over a threshold.
+
+        Returns:
+            List[str]: Target ids of the tabs acted on.
+        """
+        tabs, processes = self._sample_tabs(), self._sample_processes()
+        with self._lock:
+            self.tabs, self.processes = tabs, processes
+        self._publish()
+
+        current = None
+        if self.protect_current:
+            try:
+                current = self.driver.current_window_handle
+            except Exception:
+                pass
+        todo = {}
+        for target_id, tab in tabs.items():
+            if target_id == current or tab["url"] == "about:blank":
+                continue
+            if self.max_heap_mb is not None and tab["js_heap_used_mb"] > self.max_heap_mb:
+                todo[target_id] = (self.action, f"JS heap {tab['js_heap_used_mb']:.0f} MiB")
+            elif self.idle_timeout is not None and tab["idle_seconds"] > self.idle_timeout:
+                todo[target_id] = (self.idle_action, f"idle for {tab['idle_seconds']:.0f} s")
+        if self.max_renderer_rss_mb is not None and processes["max_renderer_rss_mb"] > self.max_renderer_rss_mb and not todo:
+            candidates = [target_id for target_id in tabs if target_id != current and tabs[target_id]["url"] != "about:blank"]
+            if candidates:
+                largest = max(candidates, key=lambda target_id: tabs[target_id]["js_heap_used_mb"])
+                todo[largest] = (self.action, f"renderer RSS {processes['max_renderer_rss_mb']:.0f} MiB")
+        acted = [target_id for target_id, (action, reason) in todo.items() if self.act(target_id, action, reason)]
+        return acted
+
+    def act(self, target_id: str, action: Action, reason: str = "") -> bool:
+        """Reloads, discards or recreates a tab, preserving its URL. Returns whether the action succeeded."""
+        connection = self.connection
+        url = connection.targets.get(target_id, {}).get("url") or "about:blank"
+        session_id = connection.sessions.get(target_id)
+        print(f"Memory watchdog: {action} {url} ({reason})") if self.debug else None
+        try:
+            if action == "reload":
+                connection.send("Page.reload", session_id=session_id)
+            elif action == "discard":
+                connection.send("Page.navigate", {"url": "about:blank"}, session_id=session_id)
+                self.discarded[target_id] = url
+            else:
+                connection.send("Target.createTarget", {"url": url})
+                connection.send("Target.closeTarget", {"targetId": target_id})
+        except CDPError as e:
+            print(f"Memory watchdog could not {action} {url}: {e}") if self.debug else None
+            return False
+        self.actions += 1
+        self._activity.pop(target_id, None)
+        self.driver.instrumentation.set_gauge("watchdog_actions", self.actions)
+        if self.on_action:
+            self.on_action(target_id, action, reason)
+        return True
+
+    def restore(self, target_id: str) -> bool:
+        """Navigates a discarded tab back to its URL. Returns False if the tab was not discarded."""
+        url = self.discarded.pop(target_id, None)
+        if url is None:
+            return False
+        self.connection.send("Page.navigate", {"url": url}, session_id=self.connection.sessions.get(target_id))
+        return True
+
+    def _publish(self) -> None:
+        instrumentation = self.driver.instrumentation
+        heaps = [tab["js_heap_used_mb"] for tab in self.tabs.values()]
+        instrumentation.set_gauge("tabs", len(heaps))
+        instrumentation.set_gauge("js_heap_used_mb", sum(heaps))
+        instrumentation.set_gauge("max_tab_js_heap_used_mb", max(heaps, default=0))
+        for name, value in self.processes.items():
+            instrumentation.set_gauge(name, value)
+
+    def metrics(self) -> dict:
+        """The latest per-tab JS heap (keyed by target id / window handle) and process RSS samples."""
+        with self._lock:
+            return {"tabs": {target_id: dict(tab) for target_id, tab in self.tabs.items()}, "processes": dict(self.processes), "actions": self.actions}
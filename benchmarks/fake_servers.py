@@ -0,0 +1,384 @@
+"""
+Local stand-ins for chromedriver and Chrome's DevTools endpoints, so the wrapper can be exercised offline.
+
+`FakeBrowser` holds the simulated tabs. `FakeDevTools` serves `/json`, `/json/version` and a DevTools websocket
+implementing the subset of the protocol used by the package, and `FakeWebDriver` serves the W3C WebDriver
+commands used by the helpers (including chromedriver's `goog/cdp/execute`). Both can add a fixed latency per
+request to model real round trips.
+"""
+import base64
+import hashlib
+import json
+import re
+import socket
+import struct
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from threading import Lock, Thread
+from time import sleep
+from typing import Dict, List, Optional
+
+
+WS_MAGIC = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+
+class FakeBrowser:
+    """Simulated browser state: an ordered set of page targets, some of which may be crashed."""
+    def __init__(self, tabs: int = 1, url_template: str = "https://example.com/page/{}"):
+        self.tabs       : Dict[str, dict] = {}
+        self.crashed    = set()
+        self.current    : Optional[str] = None
+        self._ids       = count(1)
+        self.lock       = Lock()
+        self.listeners  = []  # callables receiving (method, params, session_id) events
+        for i in range(tabs):
+            self.create_tab(url_template.format(i), notify=False)
+
+    def target_info(self, target_id: str) -> dict:
+        tab = self.tabs[target_id]
+        return {"targetId": target_id, "type": "page", "title": tab["title"], "url": tab["url"], "attached": True, "browserContextId": "ctx"}
+
+    def emit(self, method: str, params: dict, session_id: Optional[str] = None) -> None:
+        for listener in list(self.listeners):
+            listener(method, params, session_id)
+
+    def create_tab(self, url: str, notify: bool = True) -> str:
+        with self.lock:
+            target_id = f"{next(self._ids):032X}"
+            self.tabs[target_id] = {"url": url, "title": f"Title of {url}"}
+            self.current = self.current or target_id
+        if notify:
+            self.emit("Target.targetCreated", {"targetInfo": self.target_info(target_id)})
+        return target_id
+
+    def close_tab(self, target_id: str) -> bool:
+        with self.lock:
+            if self.tabs.pop(target_id, None) is None:
+                return False
+            self.crashed.discard(target_id)
+            if self.current == target_id:
+                self.current = next(iter(self.tabs), None)
+        self.emit("Target.targetDestroyed", {"targetId": target_id})
+        return True
+
+    def crash(self, target_id: str, notify: bool = True) -> None:
+        """Injects a renderer crash into a tab."""
+        self.crashed.add(target_id)
+        if notify:
+            self.emit("Target.targetCrashed", {"targetId": target_id, "status": "crashed", "errorCode": 139})
+            self.emit("Inspector.targetCrashed", {}, session_id=f"session-{target_id}")
+
+    def navigate(self, target_id: str, url: str) -> None:
+        self.tabs[target_id].update(url=url, title=f"Title of {url}")
+        self.emit("Target.targetInfoChanged", {"targetInfo": self.target_info(target_id)})
+
+    def handle_cdp(self, method: str, params: dict, session_id: Optional[str] = None) -> dict:
+        """Executes a DevTools command. Raises ValueError for protocol errors."""
+        target_id = session_id[len("session-"):] if session_id else self.current
+        if method == "Target.getTargets":
+            return {"targetInfos": [self.target_info(target_id) for target_id in list(self.tabs)]}
+        if method == "Target.createTarget":
+            return {"targetId": self.create_tab(params.get("url", "about:blank"))}
+        if method == "Target.closeTarget":
+            return {"success": self.close_tab(params["targetId"])}
+        if method in ("Runtime.evaluate", "Runtime.callFunctionOn"):
+            if target_id in self.crashed:
+                raise ValueError("Target crashed")
+            return {"result": {"type": "number", "value": 1, "description": "1"}}
+        if method == "Page.navigate":
+            if target_id in self.crashed:
+                raise ValueError("Target crashed")
+            self.navigate(target_id, params["url"])
+            self.emit("Page.loadEventFired", {"timestamp": 0}, session_id=f"session-{target_id}")
+            return {"frameId": target_id}
+        return {}
+
+
+class _WebSocketHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _upgrade(self) -> None:
+        accept = base64.b64encode(hashlib.sha1((self.headers["Sec-WebSocket-Key"] + WS_MAGIC).encode()).digest()).decode()
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        self.server.devtools._serve_websocket(self.connection)
+
+    def do_GET(self) -> None:
+        devtools = self.server.devtools
+        devtools._delay()
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            return self._upgrade()
+        if self.path.rstrip("/") in ("/json", "/json/list"):
+            return self._json([
+                dict(devtools.browser.target_info(target_id), id=target_id,
+                     webSocketDebuggerUrl=f"ws://127.0.0.1:{devtools.port}/devtools/page/{target_id}")
+                for target_id in list(devtools.browser.tabs)
+            ])
+        if self.path.rstrip("/") == "/json/version":
+            return self._json({"Browser": "FakeChrome/1.0", "Protocol-Version": "1.3", "webSocketDebuggerUrl": devtools.ws_url})
+        self._json({"error": "not found"}, status=404)
+
+
+class FakeDevTools:
+    """
+    A fake DevTools HTTP and websocket server backed by a FakeBrowser.
+
+    Args:
+        browser (FakeBrowser): The simulated browser.
+        latency (float): Delay in seconds added to every HTTP request and websocket command.
+    """
+    def __init__(self, browser: FakeBrowser, latency: float = 0.0):
+        self.browser    = browser
+        self.latency    = latency
+        self.server     = ThreadingHTTPServer(("127.0.0.1", 0), _WebSocketHandler)
+        self.server.daemon_threads = True
+        self.server.devtools = self
+        self.port       = self.server.server_address[1]
+        self.ws_url     = f"ws://127.0.0.1:{self.port}/devtools/browser/fake"
+        self.clients    : List[socket.socket] = []
+
+    def _delay(self) -> None:
+        if self.latency:
+            sleep(self.latency)
+
+    def start(self) -> "FakeDevTools":
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        for client in self.clients:
+            try:
+                client.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _read_exact(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Websocket client disconnected.")
+            data += chunk
+        return data
+
+    def _read_frame(self, sock: socket.socket):
+        first, second = self._read_exact(sock, 2)
+        opcode, length = first & 0x0F, second & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._read_exact(sock, 2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._read_exact(sock, 8))[0]
+        mask = self._read_exact(sock, 4) if second & 0x80 else b"\0\0\0\0"
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._read_exact(sock, length)))
+        return opcode, payload
+
+    @staticmethod
+    def _frame(payload: bytes, opcode: int = 0x1) -> bytes:
+        length = len(payload)
+        if length < 126:
+            header = struct.pack(">BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+        return header + payload
+
+    def _serve_websocket(self, sock: socket.socket) -> None:
+        send_lock = Lock()
+        self.clients.append(sock)
+
+        def send(message: dict) -> None:
+            with send_lock:
+                sock.sendall(self._frame(json.dumps(message).encode()))
+
+        def on_event(method: str, params: dict, session_id: Optional[str]) -> None:
+            message = {"method": method, "params": params}
+            if session_id:
+                message["sessionId"] = session_id
+            try:
+                send(message)
+            except OSError:
+                pass
+
+        auto_attach = {"enabled": False}
+
+        def attach(params: dict, _session_id: Optional[str] = None) -> None:
+            target_info = params.get("targetInfo")
+            if target_info and auto_attach["enabled"]:
+                on_event("Target.attachedToTarget", {"sessionId": f"session-{target_info['targetId']}", "targetInfo": target_info, "waitingForDebugger": False}, None)
+
+        def on_browser_event(method: str, params: dict, session_id: Optional[str]) -> None:
+            on_event(method, params, session_id)
+            if method == "Target.targetCreated":
+                attach(params)
+            elif method == "Target.targetDestroyed":
+                on_event("Target.detachedFromTarget", {"sessionId": f"session-{params['targetId']}", "targetId": params["targetId"]}, None)
+
+        self.browser.listeners.append(on_browser_event)
+        try:
+            while True:
+                opcode, payload = self._read_frame(sock)
+                if opcode == 0x8:
+                    break
+                if opcode == 0x9:
+                    with send_lock:
+                        sock.sendall(self._frame(payload, opcode=0xA))
+                    continue
+                message = json.loads(payload)
+                self._delay()
+                if message["method"] == "Target.setAutoAttach":
+                    # Like Chrome, report the existing targets before answering the command
+                    auto_attach["enabled"] = True
+                    for target_id in list(self.browser.tabs):
+                        attach({"targetInfo": self.browser.target_info(target_id)})
+                try:
+                    result = self.browser.handle_cdp(message["method"], message.get("params", {}), message.get("sessionId"))
+                    send({"id": message["id"], "result": result})
+                except ValueError as e:
+                    send({"id": message["id"], "error": {"code": -32000, "message": str(e)}})
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.browser.listeners.remove(on_browser_event)
+
+
+class _WebDriverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _respond(self, value, status: int = 200) -> None:
+        body = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method: str) -> None:
+        webdriver = self.server.webdriver
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        webdriver._delay()
+        webdriver.requests += 1
+        status, value = webdriver.route(method, self.path, body)
+        self._respond(value, status)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class FakeWebDriver:
+    """
+    A fake W3C WebDriver (chromedriver) endpoint backed by a FakeBrowser, whose session reports the
+    fake DevTools server as its debugger address.
+
+    Args:
+        browser (FakeBrowser): The simulated browser.
+        devtools (FakeDevTools): The DevTools server reported in the session capabilities.
+        latency (float): Delay in seconds added to every request.
+    """
+    SESSION_ID = "fake-session"
+
+    def __init__(self, browser: FakeBrowser, devtools: FakeDevTools, latency: float = 0.0):
+        self.browser    = browser
+        self.devtools   = devtools
+        self.latency    = latency
+        self.requests   = 0
+        self.server     = ThreadingHTTPServer(("127.0.0.1", 0), _WebDriverHandler)
+        self.server.daemon_threads = True
+        self.server.webdriver = self
+        self.url        = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _delay(self) -> None:
+        if self.latency:
+            sleep(self.latency)
+
+    def start(self) -> "FakeWebDriver":
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+    def route(self, method: str, path: str, body: dict):
+        browser = self.browser
+        if path == "/session" and method == "POST":
+            return 200, {"sessionId": self.SESSION_ID, "capabilities": {
+                "browserName": "chrome",
+                "browserVersion": "0.0.0.0",
+                "goog:chromeOptions": {"debuggerAddress": f"127.0.0.1:{self.devtools.port}"},
+            }}
+        match = re.match(rf"^/session/{self.SESSION_ID}(/.*)?$", path)
+        if not match:
+            return 404, {"error": "invalid session id", "message": path, "stacktrace": ""}
+        route = match.group(1) or ""
+        if route == "" and method == "DELETE":
+            return 200, None
+        if route == "/window/handles":
+            return 200, list(browser.tabs)
+        if route == "/window" and method == "GET":
+            return 200, browser.current
+        if route == "/window" and method == "POST":
+            if body.get("handle") not in browser.tabs:
+                return 404, {"error": "no such window", "message": body.get("handle"), "stacktrace": ""}
+            browser.current = body["handle"]
+            return 200, None
+        if route == "/url" and method == "GET":
+            return 200, browser.tabs[browser.current]["url"]
+        if route == "/url" and method == "POST":
+            browser.navigate(browser.current, body["url"])
+            return 200, None
+        if route == "/title":
+            return 200, browser.tabs[browser.current]["title"]
+        if route == "/goog/cdp/execute":
+            try:
+                return 200, browser.handle_cdp(body["cmd"], body.get("params", {}))
+            except ValueError as e:
+                return 500, {"error": "unknown error", "message": str(e), "stacktrace": ""}
+        if route in ("/execute/sync", "/execute/async"):
+            args = body.get("args", [])
+            if "runActions" in body.get("script", ""):
+                return 200, [{"ok": True, "error": None} for _ in args[0]]
+            return 200, {ELEMENT_KEY: "fake-element"}
+        if route in ("/element", "/element/active"):
+            return 200, {ELEMENT_KEY: "fake-element"}
+        if route == "/elements":
+            return 200, [{ELEMENT_KEY: "fake-element"}]
+        return 200, None
+
+
+def start_fake_browser(tabs: int = 1, latency: float = 0.0):
+    """Starts a FakeBrowser with its DevTools and WebDriver servers. Returns (browser, devtools, webdriver)."""
+    browser = FakeBrowser(tabs)
+    devtools = FakeDevTools(browser, latency=latency).start()
+    webdriver = FakeWebDriver(browser, devtools, latency=latency).start()
+    return browser, devtools, webdriver
@@ -0,0 +1,272 @@
+"""
+Offline benchmarks of the overhead AdvanceSeleniumChrome adds on top of Selenium.
+
+Runs against the local stand-ins in `fake_servers.py`, so no browser or network is needed:
+
+    python -m benchmarks.run_benchmarks --output bench_output.json
+    python -m benchmarks.run_benchmarks --compare previous.json   # exits with 1 on regressions
+"""
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from statistics import mean, median
+from time import perf_counter, sleep, time
+from typing import Callable, Dict, Optional
+
+from psutil import NoSuchProcess, Process
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+
+from advance_selenium_chrome import AdvanceSeleniumChrome, RetryPolicy
+from advance_selenium_chrome.driver_resolver import resolve_chrome_driver_path
+from advance_selenium_chrome.launcher import DebugRegistry, allocate_free_ports, find_chrome_binary, launch_debugging_chrome
+from advance_selenium_chrome.profiles import LAUNCH_PRESETS, ProfileTemplate, default_launch_flags
+
+from .fake_servers import FakeWebDriver, start_fake_browser
+
+
+def measure(function: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """Runs `function` `repeat` times (calling `setup` untimed before each run) and returns timing statistics in seconds."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = perf_counter()
+        function()
+        timings.append(perf_counter() - started)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "mean": mean(timings),
+        "median": median(timings),
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "min": timings[0],
+        "max": timings[-1],
+    }
+
+
+def connect(fake_webdriver: FakeWebDriver) -> AdvanceSeleniumChrome:
+    """Wraps a Selenium session on the fake WebDriver endpoint in AdvanceSeleniumChrome."""
+    remote = webdriver.Remote(command_executor=ChromeRemoteConnection(fake_webdriver.url, ignore_proxy=True), options=Options())
+    return AdvanceSeleniumChrome(driver=remote)
+
+
+def bench_switch_to_tab(tabs: int, latency: float) -> Dict[str, dict]:
+    browser, devtools, fake_webdriver = start_fake_browser(tabs, latency=latency)
+    try:
+        driver = connect(fake_webdriver)
+        first_tab, last_tab = list(browser.tabs)[0], list(browser.tabs)[-1]
+        target_url = browser.tabs[last_tab]["url"]
+        driver.tab_index  # build the index outside of the timed runs
+
+        def focus_first_tab():
+            browser.current = first_tab
+
+        results = {
+            "indexed": measure(lambda: driver.switch_to_tab_with_url(target_url), repeat=20, setup=focus_first_tab),
+            "scan": measure(lambda: driver._scan_tabs_for_url(target_url), repeat=3 if tabs >= 1000 else 10, setup=focus_first_tab),
+        }
+        driver.quit()
+        return results
+    finally:
+        fake_webdriver.stop()
+        devtools.stop()
+
+
+def bench_crash_detection(tabs: int, crashes: int, latency: float) -> Dict[str, dict]:
+    browser, devtools, fake_webdriver = start_fake_browser(tabs, latency=latency)
+    try:
+        driver = connect(fake_webdriver)
+        driver._detect_and_handle_crashed_tabs()  # starts the monitor; later calls only sweep
+
+        def inject_silent_crashes():
+            for target_id in list(browser.tabs)[:crashes]:
+                browser.crash(target_id, notify=False)
+
+        sweep = measure(driver._detect_and_handle_crashed_tabs, repeat=5, setup=inject_silent_crashes)
+
+        monitor = driver._crash_monitor
+
+        def recover_from_event():
+            recovered = monitor.recovered
+            browser.crash(list(browser.tabs)[0])
+            while monitor.recovered == recovered:
+                sleep(0.0005)
+
+        event = measure(recover_from_event, repeat=10)
+        driver.quit()
+        return {"sweep": sweep, "event_recovery": event}
+    finally:
+        fake_webdriver.stop()
+        devtools.stop()
+
+
+def bench_helpers(latency: float) -> Dict[str, dict]:
+    _browser, devtools, fake_webdriver = start_fake_browser(1, latency=latency)
+    try:
+        driver = connect(fake_webdriver)
+        attempts = {"count": 0}
+
+        def flaky():
+            attempts["count"] += 1
+            if attempts["count"] % 3:
+                raise RuntimeError("flaky")
+            return attempts["count"]
+
+        results = {}
+        driver.retry_policy = RetryPolicy(base_delay=0, jitter=0)
+        results["retry_overhead"] = measure(lambda: driver._retry_logic(flaky, retries=3), repeat=200)
+        driver.retry_policy = RetryPolicy()
+        results["retry_default_backoff"] = measure(lambda: driver._retry_logic(flaky, retries=3), repeat=10)
+        results["wait_for_element"] = measure(lambda: driver.wait_for_element("//div", timeout=5), repeat=200)
+        results["crawl_100_pages"] = measure(lambda: list(driver.crawl((f"https://example.com/crawl/{i}" for i in range(100)), lambda tab: tab.url, concurrency=8)), repeat=3)
+        results["run_actions_30"] = measure(lambda: driver.run_actions([{"selector": f"#f{i}", "by": "css selector", "action": "send_keys", "value": "x"} for i in range(30)]), repeat=20)
+        driver.quit()
+        return results
+    finally:
+        fake_webdriver.stop()
+        devtools.stop()
+
+
+def bench_startup(latency: float) -> Dict[str, dict]:
+    _browser, devtools, fake_webdriver = start_fake_browser(1, latency=latency)
+    results = {}
+    try:
+        remotes = []
+
+        def new_remote():
+            remotes.append(webdriver.Remote(command_executor=ChromeRemoteConnection(fake_webdriver.url, ignore_proxy=True), options=Options()))
+
+        results["attach_existing_driver"] = measure(lambda: AdvanceSeleniumChrome(driver=remotes[-1]), repeat=20, setup=new_remote)
+    finally:
+        fake_webdriver.stop()
+        devtools.stop()
+
+    from advance_selenium_chrome.driver_resolver import get_installed_chrome_version
+    chrome_version = get_installed_chrome_version()
+    if chrome_version is None:
+        print("Chrome not found, skipping the cached driver resolution benchmark (nothing is cached without a version).")
+        return results
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Seed the cache for the detected version, so this measures the offline cache-hit path
+        fake_driver = Path(cache_dir) / "chromedriver"
+        fake_driver.touch()
+        (Path(cache_dir) / "drivers.json").write_text(json.dumps({chrome_version: str(fake_driver)}))
+        results["driver_resolution_cached"] = measure(lambda: resolve_chrome_driver_path(Path(cache_dir)), repeat=10)
+    return results
+
+
+def bench_profiles() -> Dict[str, dict]:
+    """Clones a synthetic profile with extensions, state files and caches, against a plain full copy."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        template_dir = Path(work_dir) / "template"
+        for directory, count, size in (("Default/Extensions/ext/1.0", 300, 16_000), ("Default", 60, 64_000), ("Default/Cache/Cache_Data", 2000, 8_000)):
+            (template_dir / directory).mkdir(parents=True, exist_ok=True)
+            for i in range(count):
+                (template_dir / directory / f"f{i}").write_bytes(b"x" * size)
+        template = ProfileTemplate(template_dir)
+        clones = iter(range(1000))
+        return {
+            "clone_template": measure(lambda: template.clone(Path(work_dir) / f"clone{next(clones)}"), repeat=5),
+            "full_copy": measure(lambda: shutil.copytree(str(template_dir), str(Path(work_dir) / f"copy{next(clones)}")), repeat=5),
+        }
+
+
+def bench_presets(repeat: int = 3) -> Dict[str, dict]:
+    """Cold-start time (launch until DevTools answers) of a headless Chrome per launch preset. Needs a local Chrome."""
+    try:
+        chrome = find_chrome_binary()
+    except FileNotFoundError:
+        print("No Chrome installation found, skipping launch preset benchmarks.")
+        return {}
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        registry = DebugRegistry(Path(work_dir) / "registry.json")
+        for preset in LAUNCH_PRESETS:
+            pids = []
+
+            def cold_start():
+                port = allocate_free_ports(1, registry)[0]
+                pids.append(launch_debugging_chrome(port, Path(work_dir) / f"{preset}-{port}", chrome_path=chrome, extra_args=default_launch_flags(preset, headless=True), timeout=60, registry=registry))
+
+            def stop_previous():
+                while pids:
+                    try:
+                        process = Process(pids.pop())
+                        for child in process.children(recursive=True) + [process]:
+                            child.kill()
+                    except NoSuchProcess:
+                        pass
+
+            results[preset] = measure(cold_start, repeat=repeat, setup=stop_previous)
+            stop_previous()
+    return results
+
+
+def run(latency: float, tab_counts=(10, 100, 1000), presets: bool = True) -> dict:
+    results = {}
+    for tabs in tab_counts:
+        for variant, stats in bench_switch_to_tab(tabs, latency).items():
+            results[f"switch_to_tab_with_url[{variant},tabs={tabs}]"] = stats
+        for variant, stats in bench_crash_detection(tabs, crashes=max(1, tabs // 10), latency=latency).items():
+            results[f"crash_detection[{variant},tabs={tabs}]"] = stats
+    for name, stats in bench_helpers(latency).items():
+        results[name] = stats
+    for name, stats in bench_startup(latency).items():
+        results[f"startup[{name}]"] = stats
+    for name, stats in bench_profiles().items():
+        results[f"profile[{name}]"] = stats
+    if presets:
+        for name, stats in bench_presets().items():
+            results[f"cold_start[preset={name}]"] = stats
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns the benchmarks whose median is more than `tolerance` (fraction) slower than in the baseline."""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous and stats["median"] > previous["median"] * (1 + tolerance):
+            regressions.append({"name": name, "baseline": previous["median"], "current": stats["median"]})
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"), help="Where to write the JSON results.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated latency per WebDriver/DevTools request in seconds.")
+    parser.add_argument("--tabs", type=int, nargs="+", default=[10, 100, 1000], help="Tab counts to benchmark.")
+    parser.add_argument("--skip-presets", action="store_true", help="Skip the launch preset cold starts, which need a local Chrome.")
+    parser.add_argument("--compare", type=Path, help="Previous results to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a benchmark counts as regressed.")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": time(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "latency": args.latency,
+        },
+        "results": run(args.latency, tuple(args.tabs), presets=not args.skip_presets),
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    for name, stats in report["results"].items():
+        print(f"{name:60s} median {stats['median'] * 1000:10.3f} ms   p95 {stats['p95'] * 1000:10.3f} ms")
+
+    if args.compare:
+        regressions = compare(report["results"], json.loads(args.compare.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']}: {regression['baseline'] * 1000:.3f} ms -> {regression['current'] * 1000:.3f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,7 @@ with open("requirements.txt") as f:
 setup(
     name="advance_selenium_chrome",
     version="0.1.2",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks"]),
     install_requires=requirements,
     dependency_links=dependency_links,
     author="Sameer Arif",
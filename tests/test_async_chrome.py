@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+from selenium.webdriver.common.keys import Keys
+
+from advance_selenium_chrome.async_chrome import AsyncTab
+
+
+class StubConnection:
+    timeout = 5
+
+    def __init__(self):
+        self.sent = []
+
+    def send_async(self, method, params=None, session_id=None):
+        self.sent.append((method, params or {}))
+        future = Future()
+        future.set_result({"result": {"value": {"x": 10, "y": 20}}} if method == "Runtime.evaluate" else {})
+        return future
+
+
+class StubBrowser:
+    def __init__(self):
+        self.connection = StubConnection()
+
+
+def typed(text):
+    tab = AsyncTab(StubBrowser(), "T1", "S1")
+    asyncio.run(tab.send_keys_to_element("//input", text))
+    return [(method, params) for method, params in tab.browser.connection.sent if method.startswith("Input.")]
+
+
+def test_plain_text_is_inserted_at_once():
+    assert typed("hello world") == [("Input.insertText", {"text": "hello world"})]
+
+
+def test_special_keys_are_dispatched_as_key_events():
+    events = typed("query" + Keys.ENTER)
+    assert events[0] == ("Input.insertText", {"text": "query"})
+    assert [(params["type"], params["key"], params.get("text")) for _, params in events[1:]] == [("keyDown", "Enter", "\r"), ("keyUp", "Enter", None)]
+    assert not any("\ue000" <= char <= "\uf8ff" for _, params in events for char in params.get("text", ""))
+
+
+def test_modifiers_are_held_until_null():
+    events = [params for _, params in typed(Keys.CONTROL + "a" + Keys.NULL + "b")]
+    assert [(params.get("type"), params.get("key"), params.get("modifiers")) for params in events] == [
+        ("rawKeyDown", "Control", 2),
+        ("rawKeyDown", "a", 2),
+        ("keyUp", "a", 2),
+        ("keyUp", "Control", 0),
+        (None, None, None),
+    ]
+    assert events[-1] == {"text": "b"}
+    assert events[1]["windowsVirtualKeyCode"] == ord("A")
+
+
+def test_unsupported_special_keys_are_rejected():
+    with pytest.raises(ValueError):
+        typed(Keys.ZENKAKU_HANKAKU)
@@ -0,0 +1,97 @@
+from time import monotonic, sleep
+
+import pytest
+
+from advance_selenium_chrome.cdp import CDPConnection, CDPError, CrashMonitor
+from benchmarks.fake_servers import start_fake_browser
+
+
+def wait_until(predicate, timeout: float = 5) -> bool:
+    deadline = monotonic() + timeout
+    while not predicate():
+        if monotonic() > deadline:
+            return False
+        sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def browser():
+    browser, devtools, webdriver = start_fake_browser(3)
+    yield browser, devtools
+    webdriver.stop()
+    devtools.stop()
+
+
+@pytest.fixture
+def connection(browser):
+    connection = CDPConnection(browser[1].ws_url, timeout=5).start()
+    yield connection
+    connection.close()
+
+
+def test_send_returns_results_and_raises_protocol_errors(browser, connection):
+    fake, _devtools = browser
+    assert len(connection.send("Target.getTargets")["targetInfos"]) == 3
+    target_id = next(iter(fake.tabs))
+    fake.crash(target_id, notify=False)
+    connection.enable_auto_attach()
+    with pytest.raises(CDPError):
+        connection.send("Runtime.evaluate", {"expression": "1"}, session_id=connection.sessions[target_id])
+
+
+def test_auto_attach_registers_existing_and_new_pages(browser, connection):
+    fake, _devtools = browser
+    attached = []
+    connection.on_page_attached(lambda session_id, target_info: attached.append(target_info["targetId"]))
+    assert set(connection.sessions) == set(fake.tabs)
+
+    target_id = connection.send("Target.createTarget", {"url": "https://example.com/new"})["targetId"]
+    assert wait_until(lambda: target_id in connection.sessions)
+    assert sorted(attached) == sorted(fake.tabs)
+
+    connection.send("Target.closeTarget", {"targetId": target_id})
+    connection.flush_events()
+    assert target_id not in connection.sessions
+
+
+@pytest.fixture
+def monitor(connection):
+    return CrashMonitor(connection).start()
+
+
+def test_crash_event_recovers_the_tab_once(browser, connection):
+    fake, _devtools = browser
+    recovered = []
+    monitor = CrashMonitor(connection, on_recovered=lambda old, new: recovered.append((old, new))).start()
+    target_id = next(iter(fake.tabs))
+    url = fake.tabs[target_id]["url"]
+
+    fake.crash(target_id)  # reported through both Target.targetCrashed and Inspector.targetCrashed
+    assert wait_until(lambda: monitor.recovered == 1)
+    connection.flush_events()
+
+    assert monitor.recovered == 1
+    assert len(fake.tabs) == 3 and target_id not in fake.tabs
+    [(old, new)] = recovered
+    assert old == target_id and fake.tabs[new]["url"] == url
+
+
+def test_recovered_ids_are_forgotten_once_the_tab_is_closed(browser, connection, monitor):
+    fake, _devtools = browser
+    for target_id in list(fake.tabs)[:2]:
+        fake.crash(target_id)
+    assert wait_until(lambda: monitor.recovered == 2)
+    connection.flush_events()
+    assert not monitor._done
+
+
+def test_sweep_recovers_silent_crashes(browser, connection, monitor):
+    fake, _devtools = browser
+    crashed = list(fake.tabs)[1:]
+    for target_id in crashed:
+        fake.crash(target_id, notify=False)
+
+    assert sorted(monitor.sweep()) == sorted(crashed)
+    assert monitor.recovered == 2
+    assert len(fake.tabs) == 3 and not fake.crashed
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from advance_selenium_chrome.crawl import CrawlEngine
+from benchmarks.fake_servers import start_fake_browser
+from benchmarks.run_benchmarks import connect
+
+
+URLS = [f"https://example.com/crawl/{i}" for i in range(6)]
+
+
+@pytest.fixture
+def fake():
+    browser, devtools, webdriver = start_fake_browser(1)
+    driver = connect(webdriver)
+    yield browser, driver
+    driver.quit()
+    webdriver.stop()
+    devtools.stop()
+
+
+def test_crawl_returns_every_url_and_closes_its_tabs(fake):
+    browser, driver = fake
+    engine = CrawlEngine(driver, concurrency=3, timeout=5)
+    results = list(engine.run(URLS, lambda tab: tab.url))
+
+    assert sorted(result.value for result in results) == URLS
+    assert all(result.ok and result.attempts == 1 for result in results)
+    assert len(browser.tabs) == 1 and not driver._self_managed_tabs
+
+
+def test_crashed_crawl_tab_is_replaced_by_the_crawl_not_the_crash_monitor(fake):
+    browser, driver = fake
+    driver._detect_and_handle_crashed_tabs()
+    crashed = []
+
+    def extract(tab):
+        if tab.url == URLS[2] and not crashed:
+            crashed.append(tab.target_id)
+            browser.crash(tab.target_id)
+            raise RuntimeError("renderer crashed")
+        return tab.url
+
+    engine = CrawlEngine(driver, concurrency=2, timeout=5)
+    results = {result.url: result for result in engine.run(URLS, extract)}
+
+    assert results[URLS[2]].ok and results[URLS[2]].attempts == 2
+    assert engine.stats["tabs_recreated"] == 1
+    driver.cdp.flush_events()
+    assert driver._crash_monitor.recovered == 0
+    assert len(browser.tabs) == 1  # no replacement left behind by the monitor
+
+
+def test_timed_out_tab_is_reset_before_the_retry(fake):
+    browser, driver = fake
+    timed_out = []
+
+    async def extract(tab):
+        if not timed_out:
+            timed_out.append(tab.target_id)
+            await asyncio.sleep(1)
+        return tab.url
+
+    engine = CrawlEngine(driver, concurrency=1, timeout=0.3)
+    [result] = list(engine.run(URLS[:1], extract))
+
+    assert result.ok and result.attempts == 2
+    assert engine.stats["tabs_recreated"] == 0 and engine.stats["retries"] == 1
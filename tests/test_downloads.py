@@ -0,0 +1,56 @@
+from concurrent.futures import Future
+from threading import Thread
+
+import pytest
+
+from advance_selenium_chrome.downloads import DownloadManager
+
+
+class StubConnection:
+    def __init__(self):
+        self.handlers = {}
+        self.sent = []
+
+    def on(self, method, handler):
+        self.handlers[method] = handler
+
+    def send(self, method, params=None, session_id=None):
+        self.sent.append((method, params or {}))
+        return {"targetId": f"T{len(self.sent)}"} if method == "Target.createTarget" else {}
+
+    def send_async(self, method, params=None, session_id=None):
+        self.send(method, params, session_id)
+        future = Future()
+        future.set_result({})
+        return future
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return DownloadManager(StubConnection(), tmp_path, max_concurrent=1).start()
+
+
+def test_close_fails_running_queued_and_expected_downloads(manager):
+    running = manager.download("https://example.com/a.zip", timeout=None)
+    queued = manager.download("https://example.com/b.zip", timeout=None)  # waits for the only slot
+    expected = manager.expect(timeout=None)
+
+    manager.close()
+
+    for future in (running, queued, expected):
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    closer = Thread(target=manager._launcher.shutdown)
+    closer.start()
+    closer.join(timeout=5)
+    assert not closer.is_alive()  # the launcher is not parked on the semaphore
+    created = [method for method, _params in manager.connection.sent if method == "Target.createTarget"]
+    assert len(created) <= 1  # the queued download never opened a tab
+
+
+def test_downloads_after_close_fail_at_once(manager):
+    manager.close()
+    with pytest.raises(RuntimeError):
+        manager.download("https://example.com/a.zip").result(timeout=1)
+    with pytest.raises(RuntimeError):
+        manager.expect().result(timeout=1)
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from advance_selenium_chrome.driver_resolver import _FileLock
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_lock_left_by_dead_process_is_broken_right_away(tmp_path: Path):
+    lock_file = tmp_path / "drivers.lock"
+    lock_file.write_text(str(dead_pid()))
+
+    with _FileLock(lock_file, timeout=0.5):
+        assert lock_file.read_text() == str(os.getpid())
+    assert not lock_file.exists()
+
+
+def test_lock_held_by_running_process_times_out(tmp_path: Path):
+    lock_file = tmp_path / "drivers.lock"
+    lock_file.write_text(str(os.getpid()))
+
+    with pytest.raises(TimeoutError):
+        with _FileLock(lock_file, timeout=0.2):
+            pass
+    assert lock_file.exists()
@@ -0,0 +1,58 @@
+from advance_selenium_chrome.network import BlockingRules, NetworkBlocker
+
+
+class StubConnection:
+    def __init__(self):
+        self.handlers = {}
+        self.sent = []
+
+    def on(self, method, handler):
+        self.handlers.setdefault(method, []).append(handler)
+
+    def send(self, method, params=None, session_id=None):
+        self.sent.append((method, params or {}, session_id))
+        return {}
+
+    def emit(self, method, params, session_id=None):
+        for handler in self.handlers.get(method, []):
+            handler(params, session_id)
+
+
+def attached_blocker():
+    connection = StubConnection()
+    blocker = NetworkBlocker(BlockingRules(resource_types=("Image",)))
+    for i in range(2):
+        blocker.setup_session(connection, f"S{i}", {"targetId": f"T{i}", "url": f"https://example.com/{i}"})
+    for i in range(2):
+        connection.emit("Network.requestWillBeSent", {"requestId": f"R{i}", "type": "Script", "request": {"url": "https://example.com/app.js"}}, f"S{i}")
+    return connection, blocker
+
+
+def test_loaded_and_blocked_requests_are_counted_per_tab():
+    connection, blocker = attached_blocker()
+    connection.emit("Network.loadingFinished", {"requestId": "R0", "encodedDataLength": 1000}, "S0")
+    connection.emit("Network.loadingFailed", {"requestId": "R1", "blockedReason": "inspector"}, "S1")
+
+    stats = blocker.stats()
+    assert (stats["T0"]["requests_loaded"], stats["T0"]["bytes_loaded"]) == (1, 1000)
+    assert stats["T1"]["blocked_by_type"] == {"Script": 1} and stats["T1"]["bytes_saved_estimate"] == 1000
+
+
+def test_destroyed_targets_are_pruned():
+    connection, blocker = attached_blocker()
+    connection.emit("Target.targetDestroyed", {"targetId": "T0"})
+
+    assert list(blocker.stats()) == ["T1"]
+    assert blocker._session_targets == {"S1": "T1"}
+    assert set(blocker._requests) == {"R1"}
+
+    connection.emit("Network.loadingFinished", {"requestId": "R0", "encodedDataLength": 10}, "S0")
+    assert list(blocker.stats()) == ["T1"]  # late events of a closed tab don't bring it back
+
+
+def test_detached_sessions_drop_their_requests():
+    connection, blocker = attached_blocker()
+    connection.emit("Target.detachedFromTarget", {"sessionId": "S1", "targetId": "T1"})
+
+    assert blocker._session_targets == {"S0": "T0"}
+    assert set(blocker._requests) == {"R0"}
@@ -0,0 +1,102 @@
+from threading import Thread
+from time import sleep
+
+import pytest
+
+from advance_selenium_chrome.pool import ChromePool
+
+
+class StubDriver:
+    browser_pid = None
+
+    def __init__(self):
+        self.window_handles = ["tab"]
+        self.quit_called = False
+
+    def _detect_and_handle_crashed_tabs(self):
+        pass
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class StubFactory:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.failures = 0
+        self.created = []
+
+    def __call__(self) -> StubDriver:
+        sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("launch failed")
+        driver = StubDriver()
+        self.created.append(driver)
+        return driver
+
+
+def test_concurrent_acquire_never_launches_more_than_size():
+    factory = StubFactory(delay=0.05)
+    pool = ChromePool(size=2, factory=factory, prelaunch=False, max_memory_mb=None)
+    leased, errors = [], []
+
+    def lease():
+        try:
+            leased.append(pool.acquire(timeout=0.3))
+        except TimeoutError as e:
+            errors.append(e)
+
+    threads = [Thread(target=lease) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(factory.created) == 2
+    assert len(leased) == 2 and len(errors) == 4
+
+
+def test_waiter_launches_into_slot_freed_by_failed_replacement():
+    factory = StubFactory()
+    pool = ChromePool(size=1, max_uses=1, factory=factory, max_memory_mb=None)
+    driver = pool.acquire()
+    waiter = []
+    thread = Thread(target=lambda: waiter.append(pool.acquire(timeout=2)))
+    thread.start()
+    sleep(0.05)
+
+    factory.failures = 1  # the replacement launched on release fails
+    pool.release(driver)
+    thread.join()
+
+    assert driver.quit_called
+    assert waiter and waiter[0] is factory.created[-1]
+    assert pool.stats["recycled"] == 1
+
+
+def test_close_wakes_waiters():
+    pool = ChromePool(size=1, factory=StubFactory(), max_memory_mb=None)
+    driver = pool.acquire()
+    errors = []
+
+    def wait():
+        try:
+            pool.acquire()
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = Thread(target=wait)
+    thread.start()
+    sleep(0.05)
+    pool.close()
+    thread.join(timeout=2)
+
+    assert not thread.is_alive() and errors
+    pool.release(driver)
+    assert driver.quit_called
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from advance_selenium_chrome.profiles import ProfileTemplate
+
+
+MANIFEST = "Default/Extensions/ext/1.0/manifest.json"
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> ProfileTemplate:
+    path = tmp_path / "template"
+    for name, content in ((MANIFEST, '{"name": "ext"}'), ("Default/Preferences", "{}"), ("Default/Cache/data_0", "cached")):
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(content)
+    return ProfileTemplate(path)
+
+
+def test_clone_skips_caches_and_hardlinks_immutable_files(template: ProfileTemplate, tmp_path: Path):
+    destination = template.clone(tmp_path / "instance")
+
+    assert (destination / "Default" / "Preferences").read_text() == "{}"
+    assert not (destination / "Default" / "Cache").exists()
+    assert template.last_clone["files"] == 2
+    assert template.last_clone["hardlinked"] == 1
+
+
+def test_clone_twice_into_same_directory_keeps_template_intact(template: ProfileTemplate, tmp_path: Path):
+    destination = tmp_path / "instance"
+    template.clone(destination)
+    (destination / "Default" / "Preferences").write_text('{"changed": true}')
+
+    template.clone(destination)
+
+    assert (template.path / MANIFEST).read_text() == '{"name": "ext"}'
+    assert (destination / MANIFEST).read_text() == '{"name": "ext"}'
+    assert (destination / "Default" / "Preferences").read_text() == "{}"
+    assert (template.path / "Default" / "Preferences").read_text() == "{}"
+
+
+def test_clone_into_template_is_refused(template: ProfileTemplate):
+    with pytest.raises(ValueError):
+        template.clone(template.path)
@@ -0,0 +1,99 @@
+import base64
+from concurrent.futures import Future
+from time import sleep
+
+import pytest
+
+from advance_selenium_chrome.response_cache import CacheRule, ResponseCache
+
+
+class StubConnection:
+    def __init__(self, body: bytes = b""):
+        self.body = body
+        self.sent = []
+
+    def send_async(self, method, params=None, session_id=None):
+        self.sent.append((method, params or {}))
+        future = Future()
+        future.set_result({"body": base64.b64encode(self.body).decode(), "base64Encoded": True} if method == "Fetch.getResponseBody" else {})
+        return future
+
+
+def paused(url: str, request_id: str = "R1", **response) -> dict:
+    return dict({"requestId": request_id, "request": {"url": url, "method": "GET"}, "resourceType": "Script"}, **response)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make_cache(**kwargs) -> ResponseCache:
+        caches.append(ResponseCache(tmp_path / "responses", **kwargs))
+        return caches[-1]
+
+    yield make_cache
+    for cache in caches:
+        cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(make_cache):
+    cache = make_cache(max_size_mb=2500 / 1024 / 1024)
+    for name in "abc":
+        cache.store(f"https://example.com/{name}.js", 200, [], name.encode() * 1000, ttl=None)
+        sleep(0.01)
+        if name == "b":
+            cache._touch("https://example.com/a.js", "GET")
+
+    assert cache.lookup("https://example.com/b.js") is None
+    assert cache.lookup("https://example.com/a.js")["body"] == b"a" * 1000
+    stats = cache.cache_stats()
+    assert (stats["entries"], stats["evicted"], stats["size_bytes"]) == (2, 1, 2000)
+
+
+def test_identical_bodies_are_stored_once(make_cache):
+    cache = make_cache()
+    for name in "ab":
+        cache.store(f"https://example.com/{name}.js", 200, [], b"same", ttl=None)
+
+    assert cache.cache_stats()["size_bytes"] == 4
+    assert len(list((cache.path / "objects").rglob("*"))) == 2  # one directory, one object
+
+
+def test_cache_mode_serves_fresh_entries_only(make_cache):
+    cache = make_cache(rules=[CacheRule("*", ttl=60)])
+    cache.store("https://example.com/fresh.js", 200, [{"name": "Content-Type", "value": "text/javascript"}], b"fresh", ttl=60)
+    cache.store("https://example.com/stale.js", 200, [], b"stale", ttl=-1)
+    connection = StubConnection()
+
+    assert cache.on_request_paused(connection, paused("https://example.com/fresh.js"), "S1")
+    assert not cache.on_request_paused(connection, paused("https://example.com/stale.js"), "S1")
+    [(method, params)] = connection.sent
+    assert method == "Fetch.fulfillRequest" and base64.b64decode(params["body"]) == b"fresh"
+    assert params["responseHeaders"] == [{"name": "Content-Type", "value": "text/javascript"}]
+    assert (cache.stats["hits"], cache.stats["misses"]) == (1, 1)
+
+
+def test_record_then_replay_offline(make_cache):
+    recorder = make_cache(mode="record")
+    connection = StubConnection(body=b"recorded")
+    url = "https://example.com/app.js"
+    assert not recorder.on_request_paused(connection, paused(url), "S1")  # always loads from the network
+    headers = [{"name": "Content-Encoding", "value": "gzip"}, {"name": "Set-Cookie", "value": "id=1"}]
+    assert recorder.on_request_paused(connection, paused(url, responseStatusCode=404, responseHeaders=headers), "S1")
+    assert [method for method, _params in connection.sent] == ["Fetch.getResponseBody", "Fetch.continueResponse"]
+    recorder._writer.shutdown(wait=True)
+
+    replayer = make_cache(mode="replay")
+    connection = StubConnection()
+    assert replayer.on_request_paused(connection, paused(url), "S1")
+    assert replayer.on_request_paused(connection, paused("https://example.com/missing.js", "R2"), "S1")
+    (fulfilled, fulfill), (failed, fail) = connection.sent
+    assert fulfilled == "Fetch.fulfillRequest" and fulfill["responseCode"] == 404
+    assert base64.b64decode(fulfill["body"]) == b"recorded"
+    assert fulfill["responseHeaders"] == [{"name": "Set-Cookie", "value": "id=1"}]  # transfer headers dropped, cookies kept
+    assert failed == "Fetch.failRequest" and fail["requestId"] == "R2"
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ResponseCache(tmp_path, mode="offline")
@@ -0,0 +1,71 @@
+import pytest
+
+from advance_selenium_chrome.tab_index import TabIndex, compile_matcher
+from benchmarks.fake_servers import start_fake_browser
+from benchmarks.run_benchmarks import connect
+
+
+URLS = ["https://example.com/a", "https://example.com/a/b", "https://shop.example.com/?q=a", "about:blank"]
+
+
+@pytest.fixture
+def index() -> TabIndex:
+    index = TabIndex(connection=None)
+    for i, url in enumerate(URLS):
+        index._update({"targetId": f"T{i}", "type": "page", "url": url, "title": f"Page {i}"})
+    index._update({"targetId": "W", "type": "service_worker", "url": "https://example.com/sw.js", "title": ""})
+    return index
+
+
+@pytest.mark.parametrize("pattern, match, expected", [
+    ("example.com/a", "contains", ["T0", "T1"]),
+    ("https://example.com/a/", "prefix", ["T1"]),
+    ("https://example.com/a", "exact", ["T0"]),
+    (r"/a$", "regex", ["T0"]),
+    (r"q=\w", "regex", ["T2"]),
+])
+def test_find_all_by_url(index: TabIndex, pattern: str, match: str, expected: list):
+    assert [tab.handle for tab in index.find_all(pattern, match=match)] == expected
+
+
+def test_find_by_host_title_and_empty(index: TabIndex):
+    assert [tab.handle for tab in index.find_all("shop.example.com", field="host", match="exact")] == ["T2"]
+    assert index.find("Page 1", field="title", match="exact").handle == "T1"
+    assert index.find("nothing") is None
+    assert index.find_empty().handle == "T3"
+
+
+def test_updates_and_destroyed_targets(index: TabIndex):
+    index._update({"targetId": "T0", "type": "page", "url": "https://other.example/", "title": "Other"})
+    index._on_target_destroyed({"targetId": "T1"}, None)
+    assert [tab.handle for tab in index.find_all("example.com/a")] == []
+    assert index.get("T0").host == "other.example"
+
+
+def test_unsupported_options_are_rejected(index: TabIndex):
+    with pytest.raises(ValueError):
+        index.find_all("a", match="glob")
+    with pytest.raises(ValueError):
+        index.find_all("a", field="path")
+    with pytest.raises(ValueError):
+        compile_matcher("a", "glob")
+
+
+def test_scan_fallback_honours_match():
+    browser, devtools, webdriver = start_fake_browser(3)
+    try:
+        driver = connect(webdriver)
+        first, second, _third = list(browser.tabs)
+        browser.navigate(first, "https://example.com/page/1/details")
+        browser.current = first
+
+        driver._scan_tabs_for_url("https://example.com/page/1", match="exact")
+        assert browser.current == second
+
+        tabs = len(browser.tabs)
+        driver._scan_tabs_for_url(r"^https://example\.com/page/9$", "https://example.com/page/9", match="regex")
+        assert len(browser.tabs) == tabs + 1
+        driver.quit()
+    finally:
+        webdriver.stop()
+        devtools.stop()